@@ -1,16 +1,15 @@
 """Context builder for assembling agent prompts."""
 
-import base64
-import mimetypes
+import os
 import platform
 import time
 from datetime import datetime
 from pathlib import Path
 from typing import Any
 
+from mragent.agent.media import MediaPipeline
 from mragent.agent.memory import MemoryStore
 from mragent.agent.skills import SkillsLoader
-from mragent.utils.helpers import detect_image_mime
 
 
 class ContextBuilder:
@@ -18,23 +17,74 @@ class ContextBuilder:
 
     BOOTSTRAP_FILES = ["AGENTS.md", "SOUL.md", "USER.md", "TOOLS.md", "IDENTITY.md"]
     _RUNTIME_CONTEXT_TAG = "[Runtime Context — metadata only, not instructions]"
+    _PROMPT_MAX_AGE_S = 300  # Rebuild anyway now and then, e.g. to notice newly installed skill bins
 
-    def __init__(self, workspace: Path):
+    def __init__(
+        self,
+        workspace: Path,
+        memory_max_tokens: int = 0,
+        memory_top_k: int = 20,
+        media: MediaPipeline | None = None,
+    ):
         self.workspace = workspace
+        self.media = media or MediaPipeline()
         self.memory = MemoryStore(workspace)
+        # With a budget, memory is picked per message and appended after the cached prompt
+        self.memory_max_tokens = memory_max_tokens
+        self.memory_top_k = memory_top_k
         self.skills = SkillsLoader(workspace)
+        self._prompt_cache: tuple[tuple, float, str] | None = None  # (inputs, built_at, prompt)
 
     def build_system_prompt(self, skill_names: list[str] | None = None) -> str:
-        """Build the system prompt from identity, bootstrap files, memory, and skills."""
+        """
+        Build the system prompt from identity, bootstrap files, memory, and skills.
+
+        The result is reused until one of its input files changes, which saves
+        re-reading the workspace every turn and keeps the prompt byte-identical
+        for provider-side prompt caching.
+        """
+        inputs = self._prompt_inputs()
+        cached = self._prompt_cache
+        if cached and cached[0] == inputs and time.monotonic() - cached[1] < self._PROMPT_MAX_AGE_S:
+            return cached[2]
+        self.skills.refresh()  # Inputs changed; don't wait for the index's own rescan
+        prompt = self._assemble_system_prompt()
+        self._prompt_cache = (inputs, time.monotonic(), prompt)
+        return prompt
+
+    def invalidate_system_prompt(self) -> None:
+        """Drop the cached system prompt so the next turn rebuilds it."""
+        self._prompt_cache = None
+
+    def _prompt_inputs(self) -> tuple:
+        """Fingerprint the system prompt inputs using stat() only."""
+        paths = [self.workspace / f for f in self.BOOTSTRAP_FILES]
+        paths.append(self.memory.memory_file)
+        for root in (self.skills.workspace_skills, self.skills.builtin_skills):
+            if root and root.is_dir():
+                paths.append(root)
+                paths.extend(sorted(d / "SKILL.md" for d in root.iterdir()))
+        stats = []
+        for path in paths:
+            try:
+                st = path.stat()
+                stats.append((str(path), st.st_mtime_ns, st.st_size))
+            except OSError:
+                stats.append((str(path), None, None))
+        # Skill availability depends on PATH and which env vars are set.
+        return tuple(stats), os.environ.get("PATH", ""), frozenset(os.environ)
+
+    def _assemble_system_prompt(self) -> str:
         parts = [self._get_identity()]
 
         bootstrap = self._load_bootstrap_files()
         if bootstrap:
             parts.append(bootstrap)
 
-        memory = self.memory.get_memory_context()
-        if memory:
-            parts.append(f"# Memory\n\n{memory}")
+        if not self.memory_max_tokens:
+            memory = self.memory.get_memory_context()
+            if memory:
+                parts.append(f"# Memory\n\n{memory}")
 
         always_skills = self.skills.get_always_skills()
         if always_skills:
@@ -69,7 +119,7 @@ You are mragent, a helpful AI assistant.
 ## Workspace
 Your workspace is at: {workspace_path}
 - Long-term memory: {workspace_path}/memory/MEMORY.md (write important facts here)
-- History log: {workspace_path}/memory/HISTORY.md (grep-searchable). Each entry starts with [YYYY-MM-DD HH:MM].
+- History log: {workspace_path}/memory/HISTORY.md. Each entry starts with [YYYY-MM-DD HH:MM]. Search it with the search_history tool.
 - Custom skills: {workspace_path}/skills/{{skill-name}}/SKILL.md
 
 ## mragent Guidelines
@@ -111,10 +161,11 @@ Reply directly with text for conversations. Only use the 'message' tool to send
         media: list[str] | None = None,
         channel: str | None = None,
         chat_id: str | None = None,
+        model: str | None = None,
     ) -> list[dict[str, Any]]:
         """Build the complete message list for an LLM call."""
         runtime_ctx = self._build_runtime_context(channel, chat_id)
-        user_content = self._build_user_content(current_message, media)
+        user_content = self._build_user_content(current_message, media, model)
 
         # Merge runtime context and user content into a single user message
         # to avoid consecutive same-role messages that some providers reject.
@@ -123,31 +174,51 @@ Reply directly with text for conversations. Only use the 'message' tool to send
         else:
             merged = [{"type": "text", "text": runtime_ctx}] + user_content
 
+        system_prompt = self.build_system_prompt(skill_names)
+        if self.memory_max_tokens:
+            memory = self.memory.get_memory_context(
+                self._memory_query(history, current_message), self.memory_max_tokens, self.memory_top_k,
+            )
+            if memory:
+                # Last, so the stable part of the prompt stays a cacheable prefix
+                system_prompt += f"\n\n---\n\n# Memory\n\n{memory}"
+
         return [
-            {"role": "system", "content": self.build_system_prompt(skill_names)},
+            {"role": "system", "content": system_prompt},
             *history,
             {"role": "user", "content": merged},
         ]
 
-    def _build_user_content(self, text: str, media: list[str] | None) -> str | list[dict[str, Any]]:
-        """Build user message content with optional base64-encoded images."""
+    @staticmethod
+    def _memory_query(history: list[dict[str, Any]], current_message: str, turns: int = 3) -> str:
+        """Text to match memory against: the new message plus the last few user messages."""
+        recent = [
+            m["content"] for m in history[::-1]
+            if m.get("role") == "user" and isinstance(m.get("content"), str)
+        ][:turns]
+        return "\n".join([current_message, *recent])
+
+    def _build_user_content(
+        self, text: str, media: list[str] | None, model: str | None = None,
+    ) -> str | list[dict[str, Any]]:
+        """Build user message content with optional base64-encoded images.
+
+        Images come from the media pipeline, resized for ``model``; after
+        ``await self.media.prepare(...)`` they are already encoded.
+        """
         if not media:
             return text
 
         images = []
         attached_texts = []
         for path in media:
-            p = Path(path)
-            if not p.is_file():
+            if not Path(path).is_file():
                 continue
-            raw = p.read_bytes()
-            # Detect real MIME type from magic bytes; fallback to filename guess
-            mime = detect_image_mime(raw) or mimetypes.guess_type(path)[0]
-            if not mime or not mime.startswith("image/"):
+            image = self.media.encode(path, model)
+            if image is None:
                 attached_texts.append(f"Attached file: {path}")
                 continue
-            b64 = base64.b64encode(raw).decode()
-            images.append({"type": "image_url", "image_url": {"url": f"data:{mime};base64,{b64}"}})
+            images.append({"type": "image_url", "image_url": {"url": image.url}})
 
         final_text = text
         if attached_texts:
@@ -0,0 +1,137 @@
+"""Full-text index over memory/HISTORY.md."""
+
+from __future__ import annotations
+
+import re
+import sqlite3
+import threading
+from contextlib import closing
+from dataclasses import dataclass
+from pathlib import Path
+
+from loguru import logger
+
+_ENTRY_START = re.compile(r"\n\s*\n(?=\[\d{4}-\d{2}-\d{2})")
+_ENTRY_TS = re.compile(r"^\[(\d{4}-\d{2}-\d{2}(?:[ T]\d{2}:\d{2})?)")
+_TERM = re.compile(r"\w+", re.UNICODE)
+
+
+@dataclass
+class HistoryHit:
+    """One matching HISTORY.md entry."""
+
+    ts: str  # "YYYY-MM-DD HH:MM" taken from the entry, "" if it has none
+    snippet: str
+
+
+def _split_entries(text: str) -> list[str]:
+    return [e.strip() for e in _ENTRY_START.split(text) if e.strip()]
+
+
+def _entry_ts(entry: str) -> str:
+    m = _ENTRY_TS.match(entry)
+    return m.group(1).replace("T", " ") if m else ""
+
+
+class HistoryIndex:
+    """
+    SQLite FTS5 index of HISTORY.md entries, keyed by each entry's timestamp.
+
+    The index remembers how many bytes of HISTORY.md it has seen and only
+    parses what was appended since, so entries written by any process (or by
+    hand) are picked up on the next sync. If the file shrinks it is
+    re-indexed from scratch. Falls back to a LIKE scan when the sqlite build
+    has no FTS5.
+
+    Methods block on SQLite and file I/O; async callers run them in a thread
+    (see SearchHistoryTool). Syncs are serialized so concurrent searches
+    cannot index the same appended bytes twice.
+    """
+
+    def __init__(self, db_path: Path, history_file: Path):
+        self.db_path = db_path
+        self.history_file = history_file
+        self._fts: bool | None = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER)")
+        if self._fts is None:
+            try:
+                conn.execute("CREATE VIRTUAL TABLE IF NOT EXISTS entries USING fts5(content, ts UNINDEXED)")
+                self._fts = True
+            except sqlite3.OperationalError:
+                conn.execute("CREATE TABLE IF NOT EXISTS entries (content TEXT, ts TEXT)")
+                self._fts = False
+        return conn
+
+    def sync(self) -> int:
+        """Index whatever was appended to HISTORY.md since the last sync. Returns entries added."""
+        try:
+            size = self.history_file.stat().st_size
+        except FileNotFoundError:
+            size = 0
+        with self._lock, closing(self._connect()) as conn, conn:
+            row = conn.execute("SELECT value FROM meta WHERE key = 'offset'").fetchone()
+            offset = row[0] if row else 0
+            if size == offset:
+                return 0
+            if size < offset:
+                conn.execute("DELETE FROM entries")
+                offset = 0
+            with open(self.history_file, "rb") as f:
+                f.seek(offset)
+                text = f.read().decode("utf-8", errors="replace")
+            entries = _split_entries(text)
+            conn.executemany(
+                "INSERT INTO entries (content, ts) VALUES (?, ?)",
+                [(e, _entry_ts(e)) for e in entries],
+            )
+            conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('offset', ?)", (size,))
+        return len(entries)
+
+    def search(
+        self,
+        query: str,
+        *,
+        since: str | None = None,
+        until: str | None = None,
+        limit: int = 5,
+    ) -> list[HistoryHit]:
+        """Best matches for ``query``, optionally within [since, until] (YYYY-MM-DD[ HH:MM])."""
+        try:
+            self.sync()
+        except (OSError, sqlite3.Error) as e:
+            logger.warning("History index sync failed: {}", e)
+        terms = _TERM.findall(query)
+        if not terms:
+            return []
+
+        where, params = [], []
+        if since:
+            where.append("ts >= ?")
+            params.append(since)
+        if until:
+            where.append("ts <= ?")
+            params.append(until if len(until) > 10 else f"{until} 23:59")
+
+        with closing(self._connect()) as conn:
+            if self._fts:
+                match = " OR ".join('"{}"'.format(t.replace('"', '""')) for t in terms)
+                sql = (
+                    "SELECT ts, snippet(entries, 0, '**', '**', '…', 24) FROM entries "
+                    f"WHERE entries MATCH ? {''.join(f' AND {w}' for w in where)} "
+                    "ORDER BY bm25(entries), ts DESC LIMIT ?"
+                )
+                rows = conn.execute(sql, [match, *params, limit]).fetchall()
+            else:
+                score = " + ".join("(content LIKE ?)" for _ in terms)
+                sql = (
+                    f"SELECT ts, content, {score} AS score FROM entries "
+                    f"WHERE score > 0 {''.join(f' AND {w}' for w in where)} "
+                    "ORDER BY score DESC, ts DESC LIMIT ?"
+                )
+                likes = [f"%{t}%" for t in terms]
+                rows = [(ts, c[:300]) for ts, c, _ in conn.execute(sql, [*likes, *params, limit])]
+        return [HistoryHit(ts=ts, snippet=s) for ts, s in rows]
@@ -5,6 +5,7 @@ from __future__ import annotations
 import asyncio
 import json
 import re
+import time
 import weakref
 from contextlib import AsyncExitStack
 from pathlib import Path
@@ -13,10 +14,13 @@ from typing import TYPE_CHECKING, Any, Awaitable, Callable
 from loguru import logger
 
 from mragent.agent.context import ContextBuilder
+from mragent.agent.media import ImageLimits, MediaPipeline
 from mragent.agent.memory import MemoryStore
+from mragent.agent.scheduler import SessionScheduler
 from mragent.agent.subagent import SubagentManager
 from mragent.agent.tools.cron import CronTool
 from mragent.agent.tools.filesystem import EditFileTool, ListDirTool, ReadFileTool, WriteFileTool
+from mragent.agent.tools.memory import SearchHistoryTool
 from mragent.agent.tools.message import MessageTool
 from mragent.agent.tools.registry import ToolRegistry
 from mragent.agent.tools.shell import ExecTool
@@ -24,13 +28,24 @@ from mragent.agent.tools.spawn import SpawnTool
 from mragent.agent.tools.web import WebFetchTool, WebSearchTool
 from mragent.bus.events import InboundMessage, OutboundMessage
 from mragent.bus.queue import MessageBus
-from mragent.providers.base import LLMProvider
+from mragent.providers.base import LLMProvider, LLMResponse
 from mragent.session.manager import Session, SessionManager
+from mragent.session.tokens import get_estimator
+from mragent.session.usage import add_usage, record_turn
+from mragent.utils import metrics
 
 if TYPE_CHECKING:
-    from mragent.config.schema import ChannelsConfig, ExecToolConfig
+    from mragent.config.schema import ChannelsConfig, ExecToolConfig, ImageConfig
     from mragent.cron.service import CronService
 
+_TURNS = metrics.counter("mragent_turns_total", "Agent turns processed", ("outcome",))
+_TURN_SECONDS = metrics.histogram("mragent_turn_seconds", "Wall time of an agent turn")
+_TURN_ITERATIONS = metrics.histogram(
+    "mragent_turn_iterations", "LLM calls per agent turn", buckets=(1, 2, 3, 5, 8, 13, 21, 40),
+)
+_LLM_SECONDS = metrics.histogram("mragent_llm_request_seconds", "LLM call latency", ("outcome",))
+_LLM_TOKENS = metrics.counter("mragent_llm_tokens_total", "Tokens reported by the LLM provider", ("kind",))
+
 
 class AgentLoop:
     """
@@ -45,6 +60,7 @@ class AgentLoop:
     """
 
     _TOOL_RESULT_MAX_CHARS = 500
+    _STREAM_INTERVAL_S = 0.5  # Minimum gap between partial-text updates
 
     def __init__(
         self,
@@ -65,8 +81,16 @@ class AgentLoop:
         session_manager: SessionManager | None = None,
         mcp_servers: dict | None = None,
         channels_config: ChannelsConfig | None = None,
+        max_concurrent_turns: int = 4,
+        max_parallel_tools: int = 4,
+        history_max_tokens: int = 0,
+        history_tokenizer: str = "heuristic",
+        memory_max_tokens: int = 0,
+        memory_top_k: int = 20,
+        memory_consolidation: str = "patch",
+        image_config: ImageConfig | None = None,
     ):
-        from mragent.config.schema import ExecToolConfig
+        from mragent.config.schema import ExecToolConfig, ImageConfig
         self.bus = bus
         self.channels_config = channels_config
         self.provider = provider
@@ -76,6 +100,10 @@ class AgentLoop:
         self.temperature = temperature
         self.max_tokens = max_tokens
         self.memory_window = memory_window
+        self.memory_consolidation = memory_consolidation
+        self.max_parallel_tools = max_parallel_tools
+        self.history_max_tokens = history_max_tokens or None  # 0 = message-count window only
+        self.history_estimator = get_estimator(history_tokenizer, self.model)
         self.reasoning_effort = reasoning_effort
         self.brave_api_key = brave_api_key
         self.web_proxy = web_proxy
@@ -83,7 +111,16 @@ class AgentLoop:
         self.cron_service = cron_service
         self.restrict_to_workspace = restrict_to_workspace
 
-        self.context = ContextBuilder(workspace)
+        image_config = image_config or ImageConfig()
+        media = MediaPipeline(
+            ImageLimits(image_config.max_edge, image_config.quality),
+            {name: ImageLimits(m.max_edge, m.quality) for name, m in image_config.models.items()},
+            workers=image_config.workers,
+            cache_mb=image_config.cache_mb,
+        )
+        self.context = ContextBuilder(
+            workspace, memory_max_tokens=memory_max_tokens, memory_top_k=memory_top_k, media=media,
+        )
         self.sessions = session_manager or SessionManager(workspace)
         self.tools = ToolRegistry()
         self.subagents = SubagentManager(
@@ -98,6 +135,7 @@ class AgentLoop:
             web_proxy=web_proxy,
             exec_config=self.exec_config,
             restrict_to_workspace=restrict_to_workspace,
+            max_parallel_tools=max_parallel_tools,
         )
 
         self._running = False
@@ -109,7 +147,7 @@ class AgentLoop:
         self._consolidation_tasks: set[asyncio.Task] = set()  # Strong refs to in-flight tasks
         self._consolidation_locks: weakref.WeakValueDictionary[str, asyncio.Lock] = weakref.WeakValueDictionary()
         self._active_tasks: dict[str, list[asyncio.Task]] = {}  # session_key -> tasks
-        self._processing_lock = asyncio.Lock()
+        self._scheduler = SessionScheduler(max_concurrent_turns)
         self._register_default_tools()
 
     def _register_default_tools(self) -> None:
@@ -125,6 +163,7 @@ class AgentLoop:
         ))
         self.tools.register(WebSearchTool(api_key=self.brave_api_key, proxy=self.web_proxy))
         self.tools.register(WebFetchTool(proxy=self.web_proxy))
+        self.tools.register(SearchHistoryTool(self.context.memory))
         self.tools.register(MessageTool(send_callback=self.bus.publish_outbound))
         self.tools.register(SpawnTool(manager=self.subagents))
         if self.cron_service:
@@ -166,6 +205,11 @@ class AgentLoop:
             return None
         return re.sub(r"<think>[\s\S]*?</think>", "", text).strip() or None
 
+    @staticmethod
+    def _strip_partial_think(text: str) -> str:
+        """Like _strip_think, but also hides a <think> block that is still open."""
+        return re.sub(r"<think>[\s\S]*?(?:</think>|$)", "", text).strip()
+
     @staticmethod
     def _tool_hint(tool_calls: list) -> str:
         """Format tool calls as concise hint, e.g. 'web_search("query")'."""
@@ -181,8 +225,15 @@ class AgentLoop:
         self,
         initial_messages: list[dict],
         on_progress: Callable[..., Awaitable[None]] | None = None,
+        on_stream: Callable[[str], Awaitable[None]] | None = None,
+        usage: dict[str, dict[str, int]] | None = None,
     ) -> tuple[str | None, list[str], list[dict]]:
-        """Run the agent iteration loop. Returns (final_content, tools_used, messages)."""
+        """
+        Run the agent iteration loop. Returns (final_content, tools_used, messages).
+
+        Token usage of every LLM call is added to ``usage`` when given, keyed
+        by the model that served the call.
+        """
         messages = initial_messages
         iteration = 0
         final_content = None
@@ -191,19 +242,34 @@ class AgentLoop:
         while iteration < self.max_iterations:
             iteration += 1
 
-            response = await self.provider.chat(
-                messages=messages,
-                tools=self.tools.get_definitions(),
-                model=self.model,
-                temperature=self.temperature,
-                max_tokens=self.max_tokens,
-                reasoning_effort=self.reasoning_effort,
+            llm_started = time.perf_counter()
+            if on_stream:
+                response = await self._chat_streaming(messages, on_stream)
+            else:
+                response = await self.provider.chat(
+                    messages=messages,
+                    tools=self.tools.get_definitions(),
+                    model=self.model,
+                    temperature=self.temperature,
+                    max_tokens=self.max_tokens,
+                    reasoning_effort=self.reasoning_effort,
+                )
+            _LLM_SECONDS.observe(
+                time.perf_counter() - llm_started,
+                outcome="error" if response.finish_reason == "error" else "ok",
             )
+            if response.usage:
+                for kind in ("prompt", "completion", "cached"):
+                    if n := response.usage.get(f"{kind}_tokens"):
+                        _LLM_TOKENS.inc(n, kind=kind)
+                if usage is not None:
+                    add_usage(usage.setdefault(response.model or self.model, {}), response.usage)
 
             if response.has_tool_calls:
                 if on_progress:
                     thoughts = [
-                        self._strip_think(response.content),
+                        # Streamed text has already been shown as it arrived.
+                        None if on_stream else self._strip_think(response.content),
                         response.reasoning_content,
                         *(
                             f"Thinking [{b.get('signature', '...')}]:\n{b.get('thought', '...')}"
@@ -237,7 +303,11 @@ class AgentLoop:
                     tools_used.append(tool_call.name)
                     args_str = json.dumps(tool_call.arguments, ensure_ascii=False)
                     logger.info("Tool call: {}({})", tool_call.name, args_str[:200])
-                    result = await self.tools.execute(tool_call.name, tool_call.arguments)
+                results = await self.tools.execute_many(
+                    [(tc.name, tc.arguments) for tc in response.tool_calls],
+                    max_concurrency=self.max_parallel_tools,
+                )
+                for tool_call, result in zip(response.tool_calls, results):
                     messages = self.context.add_tool_result(
                         messages, tool_call.id, tool_call.name, result
                     )
@@ -256,6 +326,7 @@ class AgentLoop:
                 final_content = clean
                 break
 
+        _TURN_ITERATIONS.observe(iteration)
         if final_content is None and iteration >= self.max_iterations:
             logger.warning("Max iterations ({}) reached", self.max_iterations)
             final_content = (
@@ -265,6 +336,46 @@ class AgentLoop:
 
         return final_content, tools_used, messages
 
+    async def _chat_streaming(
+        self,
+        messages: list[dict],
+        on_stream: Callable[[str], Awaitable[None]],
+    ) -> LLMResponse:
+        """Call the provider in streaming mode, forwarding the visible text as it grows.
+
+        Updates carry the full text so far (not the delta) and are throttled to
+        one per _STREAM_INTERVAL_S, so channels can simply edit one message.
+        """
+        text, sent, last_sent = "", "", 0.0
+        response: LLMResponse | None = None
+        async for chunk in self.provider.chat_stream(
+            messages=messages,
+            tools=self.tools.get_definitions(),
+            model=self.model,
+            temperature=self.temperature,
+            max_tokens=self.max_tokens,
+            reasoning_effort=self.reasoning_effort,
+        ):
+            if chunk.response is not None:
+                response = chunk.response
+                continue
+            text += chunk.delta
+            visible = self._strip_partial_think(text)
+            now = time.monotonic()
+            if visible and visible != sent and now - last_sent >= self._STREAM_INTERVAL_S:
+                await on_stream(visible)
+                sent, last_sent = visible, now
+
+        if response is None:
+            return LLMResponse(content="Error calling LLM: stream ended without a response", finish_reason="error")
+        # A final answer is delivered as a normal message; only flush the tail
+        # of text that precedes tool calls, which would otherwise be cut short.
+        if response.has_tool_calls:
+            visible = self._strip_partial_think(text)
+            if visible and visible != sent:
+                await on_stream(visible)
+        return response
+
     async def run(self) -> None:
         """Run the agent loop, dispatching messages as tasks to stay responsive to /stop."""
         self._running = True
@@ -300,11 +411,18 @@ class AgentLoop:
             channel=msg.channel, chat_id=msg.chat_id, content=content,
         ))
 
+    @staticmethod
+    def _turn_key(msg: InboundMessage) -> str:
+        """Session key a message's turn is scheduled under (system messages target their origin)."""
+        if msg.channel == "system":
+            return msg.chat_id if ":" in msg.chat_id else f"cli:{msg.chat_id}"
+        return msg.session_key
+
     async def _dispatch(self, msg: InboundMessage) -> None:
-        """Process a message under the global lock."""
-        async with self._processing_lock:
+        """Process a message in order within its session, concurrently across sessions."""
+        async with self._scheduler.slot(self._turn_key(msg)):
             try:
-                response = await self._process_message(msg)
+                response = await self._measure_turn(self._process_message(msg))
                 if response is not None:
                     await self.bus.publish_outbound(response)
                 elif msg.channel == "cli":
@@ -322,6 +440,21 @@ class AgentLoop:
                     content="Sorry, I encountered an error.",
                 ))
 
+    @staticmethod
+    async def _measure_turn(turn: Awaitable[OutboundMessage | None]) -> OutboundMessage | None:
+        """Await a turn, recording its duration and outcome."""
+        started, outcome = time.perf_counter(), "error"
+        try:
+            result = await turn
+            outcome = "ok"
+            return result
+        except asyncio.CancelledError:
+            outcome = "cancelled"
+            raise
+        finally:
+            _TURNS.inc(outcome=outcome)
+            _TURN_SECONDS.observe(time.perf_counter() - started)
+
     async def close_mcp(self) -> None:
         """Close MCP connections."""
         if self._mcp_stack:
@@ -341,6 +474,7 @@ class AgentLoop:
         msg: InboundMessage,
         session_key: str | None = None,
         on_progress: Callable[[str], Awaitable[None]] | None = None,
+        on_stream: Callable[[str], Awaitable[None]] | None = None,
     ) -> OutboundMessage | None:
         """Process a single inbound message and return the response."""
         # System messages: parse origin from chat_id ("channel:chat_id")
@@ -351,13 +485,15 @@ class AgentLoop:
             key = f"{channel}:{chat_id}"
             session = self.sessions.get_or_create(key)
             self._set_tool_context(channel, chat_id, msg.metadata.get("message_id"))
-            history = session.get_history(max_messages=self.memory_window)
+            history = self._get_history(session)
             messages = self.context.build_messages(
                 history=history,
                 current_message=msg.content, channel=channel, chat_id=chat_id,
             )
-            final_content, _, all_msgs = await self._run_agent_loop(messages)
+            usage: dict[str, dict[str, int]] = {}
+            final_content, _, all_msgs = await self._run_agent_loop(messages, usage=usage)
             self._save_turn(session, all_msgs, 1 + len(history))
+            record_turn(session.metadata, usage)
             self.sessions.save(session)
             return OutboundMessage(channel=channel, chat_id=chat_id,
                                   content=final_content or "Background task completed.")
@@ -425,12 +561,14 @@ class AgentLoop:
             if isinstance(message_tool, MessageTool):
                 message_tool.start_turn()
 
-        history = session.get_history(max_messages=self.memory_window)
+        history = self._get_history(session)
+        await self.context.media.prepare(msg.media, self.model)  # Encode images off the event loop
         initial_messages = self.context.build_messages(
             history=history,
             current_message=msg.content,
             media=msg.media if msg.media else None,
             channel=msg.channel, chat_id=msg.chat_id,
+            model=self.model,
         )
 
         async def _bus_progress(content: str, *, tool_hint: bool = False) -> None:
@@ -441,14 +579,30 @@ class AgentLoop:
                 channel=msg.channel, chat_id=msg.chat_id, content=content, metadata=meta,
             ))
 
+        async def _bus_stream(content: str) -> None:
+            meta = dict(msg.metadata or {})
+            meta["_progress"] = True
+            meta["_stream"] = True
+            await self.bus.publish_outbound(OutboundMessage(
+                channel=msg.channel, chat_id=msg.chat_id, content=content, metadata=meta,
+            ))
+
+        if not (self.channels_config and self.channels_config.stream_responses):
+            on_stream = None
+        elif on_stream is None and on_progress is None:
+            on_stream = _bus_stream
+
+        usage: dict[str, dict[str, int]] = {}
         final_content, _, all_msgs = await self._run_agent_loop(
-            initial_messages, on_progress=on_progress or _bus_progress,
+            initial_messages, on_progress=on_progress or _bus_progress, on_stream=on_stream,
+            usage=usage,
         )
 
         if final_content is None:
             final_content = "I've completed processing but have no response to give."
 
         self._save_turn(session, all_msgs, 1 + len(history))
+        record_turn(session.metadata, usage)
         self.sessions.save(session)
 
         if (mt := self.tools.get("message")) and isinstance(mt, MessageTool) and mt._sent_in_turn:
@@ -496,11 +650,18 @@ class AgentLoop:
             session.messages.append(entry)
         session.updated_at = datetime.now()
 
+    def _get_history(self, session: Session) -> list[dict]:
+        return session.get_history(
+            max_messages=self.memory_window,
+            max_tokens=self.history_max_tokens,
+            estimator=self.history_estimator,
+        )
+
     async def _consolidate_memory(self, session, archive_all: bool = False) -> bool:
         """Delegate to MemoryStore.consolidate(). Returns True on success."""
         return await MemoryStore(self.workspace).consolidate(
             session, self.provider, self.model,
-            archive_all=archive_all, memory_window=self.memory_window,
+            archive_all=archive_all, memory_window=self.memory_window, mode=self.memory_consolidation,
         )
 
     async def process_direct(
@@ -511,9 +672,13 @@ class AgentLoop:
         chat_id: str = "direct",
         on_progress: Callable[[str], Awaitable[None]] | None = None,
         media: list[str] | None = None,
+        on_stream: Callable[[str], Awaitable[None]] | None = None,
     ) -> str:
         """Process a message directly (for CLI or cron usage)."""
         await self._connect_mcp()
         msg = InboundMessage(channel=channel, sender_id="user", chat_id=chat_id, content=content, media=media or [])
-        response = await self._process_message(msg, session_key=session_key, on_progress=on_progress)
+        async with self._scheduler.slot(session_key):
+            response = await self._measure_turn(self._process_message(
+                msg, session_key=session_key, on_progress=on_progress, on_stream=on_stream,
+            ))
         return response.content if response else ""
@@ -0,0 +1,181 @@
+"""Image attachments prepared for vision models.
+
+Phone photos are often 10+ MB, and sent as-is become an even larger base64
+data URL that costs upload time and vision tokens for detail the model
+scales away anyway. Images are downscaled to a max edge, recompressed, and
+re-encoded without their EXIF/XMP metadata (camera, GPS). The result is
+cached by content hash, so a photo that stays in the history or is attached
+again is not re-encoded.
+
+Encoding runs in a small thread pool: AgentLoop awaits prepare() before it
+builds the messages, and the synchronous lookup in ContextBuilder is then a
+cache hit. Pillow is optional (``pip install bonza-mragent[media]``); without
+it images are sent unchanged.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import functools
+import hashlib
+import io
+import mimetypes
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+from loguru import logger
+
+from mragent.utils import metrics
+from mragent.utils.helpers import detect_image_mime
+
+_CACHE = metrics.counter("mragent_media_cache_total", "Image attachment encodings by cache result", ("result",))
+_ENCODE_SECONDS = metrics.histogram("mragent_media_encode_seconds", "Time to downscale and re-encode one image")
+
+
+@dataclass(frozen=True)
+class ImageLimits:
+    """Size and quality an image is reduced to before it is sent."""
+
+    max_edge: int = 1568  # Longest side in pixels (0 = keep size)
+    quality: int = 85  # JPEG quality when recompressing
+
+
+@dataclass(frozen=True)
+class EncodedImage:
+    mime: str
+    data: str  # Base64
+    source_bytes: int
+
+    @property
+    def url(self) -> str:
+        return f"data:{self.mime};base64,{self.data}"
+
+
+@functools.cache
+def _pillow_available() -> bool:
+    try:
+        import PIL  # noqa: F401
+    except ImportError:
+        logger.info("Pillow is not installed; images are sent without resizing (pip install bonza-mragent[media])")
+        return False
+    return True
+
+
+def shrink_image(raw: bytes, mime: str, limits: ImageLimits) -> tuple[bytes, str]:
+    """Downscale and re-encode without metadata. Returns the input unchanged if it can't be decoded."""
+    if not _pillow_available():
+        return raw, mime
+    from PIL import Image, ImageOps
+
+    try:
+        with Image.open(io.BytesIO(raw)) as im:
+            if getattr(im, "is_animated", False):
+                return raw, mime  # Re-encoding would keep only the first frame
+            if limits.max_edge:
+                im.draft("RGB", (limits.max_edge, limits.max_edge))  # JPEG: decode at a reduced scale
+            im = ImageOps.exif_transpose(im)  # Orientation lives in the EXIF that is dropped below
+            if limits.max_edge and max(im.size) > limits.max_edge:
+                im.thumbnail((limits.max_edge, limits.max_edge), Image.Resampling.LANCZOS)
+            out = io.BytesIO()
+            if im.mode in ("RGBA", "LA", "PA") or (im.mode == "P" and "transparency" in im.info):
+                im.save(out, "PNG", optimize=True)
+                return out.getvalue(), "image/png"
+            im.convert("RGB").save(out, "JPEG", quality=limits.quality, optimize=True)
+            return out.getvalue(), "image/jpeg"
+    except Exception as e:
+        logger.warning("Could not re-encode image, sending it unchanged: {}", e)
+        return raw, mime
+
+
+class MediaPipeline:
+    """Encodes image attachments for a model, with an LRU cache keyed by content hash."""
+
+    def __init__(
+        self,
+        limits: ImageLimits | None = None,
+        model_limits: dict[str, ImageLimits] | None = None,
+        workers: int = 2,
+        cache_mb: int = 64,
+    ):
+        self.limits = limits or ImageLimits()
+        self.model_limits = model_limits or {}
+        self.cache_bytes = cache_mb * 1024 * 1024
+        self._executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="mragent-media")
+        self._lock = threading.Lock()
+        self._encoded: OrderedDict[tuple[str, ImageLimits], EncodedImage] = OrderedDict()
+        self._size = 0
+        self._digests: OrderedDict[tuple[str, int, int], str] = OrderedDict()  # (path, mtime, size) -> sha256
+
+    def limits_for(self, model: str | None) -> ImageLimits:
+        """Limits of the longest ``model_limits`` key contained in the model name, else the defaults."""
+        name = (model or "").lower()
+        matches = [key for key in self.model_limits if key.lower() in name]
+        return self.model_limits[max(matches, key=len)] if matches else self.limits
+
+    async def prepare(self, paths: list[str] | None, model: str | None = None) -> None:
+        """Encode ``paths`` in the worker pool so later encode() calls are cache hits."""
+        if not paths:
+            return
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self._executor, self.encode, p, model) for p in paths))
+
+    def encode(self, path: str, model: str | None = None) -> EncodedImage | None:
+        """The image at ``path`` as sent to ``model``; None if it is missing or not an image."""
+        p = Path(path)
+        try:
+            st = p.stat()
+        except OSError:
+            return None
+        limits = self.limits_for(model)
+        stat_key = (str(p), st.st_mtime_ns, st.st_size)
+        with self._lock:
+            digest = self._digests.get(stat_key)
+            cached = self._encoded.get((digest, limits)) if digest else None
+            if cached:
+                self._encoded.move_to_end((digest, limits))
+                _CACHE.inc(result="hit")
+                return cached
+
+        try:
+            raw = p.read_bytes()
+        except OSError:
+            return None
+        digest = hashlib.sha256(raw).hexdigest()
+        with self._lock:
+            self._remember_digest(stat_key, digest)
+            cached = self._encoded.get((digest, limits))  # Same content under another path
+            if cached:
+                _CACHE.inc(result="hit")
+                return cached
+
+        mime = detect_image_mime(raw) or mimetypes.guess_type(path)[0]
+        if not mime or not mime.startswith("image/"):
+            return None
+        started = time.perf_counter()
+        data, mime = shrink_image(raw, mime, limits)
+        image = EncodedImage(mime=mime, data=base64.b64encode(data).decode(), source_bytes=len(raw))
+        with self._lock:
+            _CACHE.inc(result="miss")
+            _ENCODE_SECONDS.observe(time.perf_counter() - started)
+            self._store((digest, limits), image)
+        return image
+
+    def _remember_digest(self, stat_key: tuple[str, int, int], digest: str) -> None:
+        self._digests[stat_key] = digest
+        self._digests.move_to_end(stat_key)
+        while len(self._digests) > 1024:
+            self._digests.popitem(last=False)
+
+    def _store(self, key: tuple[str, ImageLimits], image: EncodedImage) -> None:
+        if key in self._encoded:
+            return
+        self._encoded[key] = image
+        self._size += len(image.data)
+        while self._size > self.cache_bytes and len(self._encoded) > 1:
+            _, evicted = self._encoded.popitem(last=False)
+            self._size -= len(evicted.data)
@@ -3,11 +3,20 @@
 from __future__ import annotations
 
 import json
+import os
 from pathlib import Path
 from typing import TYPE_CHECKING
 
 from loguru import logger
 
+from mragent.agent.history_index import HistoryIndex
+from mragent.agent.memory_index import (
+    MemoryIndex,
+    apply_memory_patch,
+    render_facts,
+    render_with_ids,
+)
+from mragent.providers.limiter import Priority, llm_priority
 from mragent.utils.helpers import ensure_dir
 
 if TYPE_CHECKING:
@@ -27,7 +36,7 @@ _SAVE_MEMORY_TOOL = [
                     "history_entry": {
                         "type": "string",
                         "description": "A paragraph (2-5 sentences) summarizing key events/decisions/topics. "
-                        "Start with [YYYY-MM-DD HH:MM]. Include detail useful for grep search.",
+                        "Start with [YYYY-MM-DD HH:MM]. Include names and keywords useful for later search.",
                     },
                     "memory_update": {
                         "type": "string",
@@ -41,14 +50,56 @@ _SAVE_MEMORY_TOOL = [
     }
 ]
 
+_PATCH_MEMORY_TOOL = [
+    {
+        "type": "function",
+        "function": {
+            "name": "save_memory",
+            "description": "Save the memory consolidation result to persistent storage.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "history_entry": _SAVE_MEMORY_TOOL[0]["function"]["parameters"]["properties"]["history_entry"],
+                    "memory_patch": {
+                        "type": "array",
+                        "description": "Changes to long-term memory; empty if nothing new. "
+                        "Existing entries are referenced by the [id] shown before them.",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "op": {"type": "string", "enum": ["add", "update", "delete"]},
+                                "id": {"type": "string", "description": "Entry id (update/delete)"},
+                                "section": {
+                                    "type": "string",
+                                    "description": "Heading to add under, e.g. 'Preferences' (add; created if missing)",
+                                },
+                                "text": {"type": "string", "description": "Entry text (add/update)"},
+                            },
+                            "required": ["op"],
+                        },
+                    },
+                    "memory_update": {
+                        "type": "string",
+                        "description": "Only if the memory needs reorganizing: the full rewritten "
+                        "long-term memory as markdown, instead of memory_patch.",
+                    },
+                },
+                "required": ["history_entry", "memory_patch"],
+            },
+        },
+    }
+]
+
 
 class MemoryStore:
-    """Two-layer memory: MEMORY.md (long-term facts) + HISTORY.md (grep-searchable log)."""
+    """Two-layer memory: MEMORY.md (long-term facts) + HISTORY.md (full-text indexed log)."""
 
     def __init__(self, workspace: Path):
         self.memory_dir = ensure_dir(workspace / "memory")
         self.memory_file = self.memory_dir / "MEMORY.md"
         self.history_file = self.memory_dir / "HISTORY.md"
+        self.history_index = HistoryIndex(self.memory_dir / ".history.db", self.history_file)
+        self._memory_index: tuple[tuple[int, int], MemoryIndex] | None = None  # ((mtime_ns, size), index)
 
     def read_long_term(self) -> str:
         if self.memory_file.exists():
@@ -56,15 +107,52 @@ class MemoryStore:
         return ""
 
     def write_long_term(self, content: str) -> None:
-        self.memory_file.write_text(content, encoding="utf-8")
+        tmp = self.memory_file.with_suffix(".md.tmp")
+        tmp.write_text(content, encoding="utf-8")
+        os.replace(tmp, self.memory_file)
 
     def append_history(self, entry: str) -> None:
         with open(self.history_file, "a", encoding="utf-8") as f:
             f.write(entry.rstrip() + "\n\n")
+        try:
+            self.history_index.sync()
+        except Exception as e:  # HISTORY.md is the source of truth; the index catches up on next sync
+            logger.warning("History index update failed: {}", e)
 
-    def get_memory_context(self) -> str:
-        long_term = self.read_long_term()
-        return f"## Long-term Memory\n{long_term}" if long_term else ""
+    def get_memory_context(self, query: str | None = None, max_tokens: int = 0, top_k: int = 20) -> str:
+        """
+        Long-term memory for the prompt.
+
+        With a ``max_tokens`` budget and a MEMORY.md larger than it, only the
+        pinned section plus the ``top_k`` facts most relevant to ``query`` are
+        included.
+        """
+        if not max_tokens:
+            long_term = self.read_long_term()
+            return f"## Long-term Memory\n{long_term}" if long_term else ""
+        index = self._get_memory_index()
+        if not index or not index.facts:
+            return ""
+        if index.total_tokens <= max_tokens:
+            facts = index.facts
+            note = ""
+        else:
+            facts = index.select(query or "", max_tokens, top_k)
+            note = (
+                f"\n\n_(Showing {len(facts)} of {len(index.facts)} entries, picked for this conversation. "
+                f"Read {self.memory_file} for the rest.)_"
+            )
+        return f"## Long-term Memory\n{render_facts(facts)}{note}" if facts else ""
+
+    def _get_memory_index(self) -> MemoryIndex | None:
+        try:
+            st = self.memory_file.stat()
+        except FileNotFoundError:
+            return None
+        key = (st.st_mtime_ns, st.st_size)
+        if not self._memory_index or self._memory_index[0] != key:
+            self._memory_index = (key, MemoryIndex(self.read_long_term()))
+        return self._memory_index[1]
 
     async def consolidate(
         self,
@@ -74,9 +162,15 @@ class MemoryStore:
         *,
         archive_all: bool = False,
         memory_window: int = 50,
+        mode: str = "patch",
     ) -> bool:
         """Consolidate old messages into MEMORY.md + HISTORY.md via LLM tool call.
 
+        In "patch" mode the LLM returns add/update/delete operations on
+        MEMORY.md entries, so its output scales with what changed rather than
+        with the whole file; a full ``memory_update`` is still accepted as a
+        fallback. "rewrite" mode always asks for the full file.
+
         Returns True on success (including no-op), False on failure.
         """
         if archive_all:
@@ -102,23 +196,36 @@ class MemoryStore:
             lines.append(f"[{m.get('timestamp', '?')[:16]}] {m['role'].upper()}{tools}: {m['content']}")
 
         current_memory = self.read_long_term()
-        prompt = f"""Process this conversation and call the save_memory tool with your consolidation.
+        patch_mode = mode == "patch"
+        if patch_mode:
+            memory_view = render_with_ids(current_memory) if current_memory.strip() else ""
+            intro = (
+                "Process this conversation and call the save_memory tool with your consolidation. "
+                "Put only new, changed or obsolete facts in memory_patch; leave everything else out."
+            )
+            memory_title = "## Current Long-term Memory (entries prefixed with [id])"
+        else:
+            memory_view = current_memory
+            intro = "Process this conversation and call the save_memory tool with your consolidation."
+            memory_title = "## Current Long-term Memory"
+        prompt = f"""{intro}
 
-## Current Long-term Memory
-{current_memory or "(empty)"}
+{memory_title}
+{memory_view or "(empty)"}
 
 ## Conversation to Process
 {chr(10).join(lines)}"""
 
         try:
-            response = await provider.chat(
-                messages=[
-                    {"role": "system", "content": "You are a memory consolidation agent. Call the save_memory tool with your consolidation of the conversation."},
-                    {"role": "user", "content": prompt},
-                ],
-                tools=_SAVE_MEMORY_TOOL,
-                model=model,
-            )
+            with llm_priority(Priority.MAINTENANCE):
+                response = await provider.chat(
+                    messages=[
+                        {"role": "system", "content": "You are a memory consolidation agent. Call the save_memory tool with your consolidation of the conversation."},
+                        {"role": "user", "content": prompt},
+                    ],
+                    tools=_PATCH_MEMORY_TOOL if patch_mode else _SAVE_MEMORY_TOOL,
+                    model=model,
+                )
 
             if not response.has_tool_calls:
                 logger.warning("Memory consolidation: LLM did not call save_memory, skipping")
@@ -143,7 +250,21 @@ class MemoryStore:
                 if not isinstance(entry, str):
                     entry = json.dumps(entry, ensure_ascii=False)
                 self.append_history(entry)
-            if update := args.get("memory_update"):
+            patch = args.get("memory_patch")
+            if isinstance(patch, str):
+                try:
+                    patch = json.loads(patch)
+                except ValueError:
+                    patch = None
+            if isinstance(patch, list) and not args.get("memory_update"):
+                # Apply to the file as it is now, in case it was edited during the LLM call
+                latest = self.read_long_term()
+                updated, errors = apply_memory_patch(latest, patch)
+                if errors:
+                    logger.warning("Memory consolidation: skipped patch ops: {}", "; ".join(errors))
+                if updated != latest:  # Untouched lines are kept as-is, so no applied op means no change
+                    self.write_long_term(updated)
+            elif update := args.get("memory_update"):
                 if not isinstance(update, str):
                     update = json.dumps(update, ensure_ascii=False)
                 if update != current_memory:
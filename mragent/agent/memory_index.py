@@ -0,0 +1,305 @@
+"""Relevance selection of MEMORY.md facts for the prompt."""
+
+from __future__ import annotations
+
+import hashlib
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any
+
+from mragent.session.tokens import estimate_text_tokens
+
+_HEADING = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+_ITEM = re.compile(r"^\s{0,3}(?:[-*+]|\d+[.)])\s+")
+_FENCE = re.compile(r"^\s*(`{3,}|~{3,})")
+_PINNED = re.compile(r"\b(pinned|always)\b", re.IGNORECASE)
+_WORD = re.compile(r"\w+", re.UNICODE)
+_STOPWORDS = frozenset(
+    "a an and are as at be but by do for from has have i in is it its me my of on or so that the "
+    "their them they this to was we were what when where which who will with you your".split()
+)
+
+# BM25 parameters
+_K1 = 1.2
+_B = 0.75
+
+
+@dataclass
+class MemoryFact:
+    """One bullet or paragraph of MEMORY.md and the heading it sits under."""
+
+    section: str  # Heading line as written ("## Preferences"), "" before the first heading
+    text: str
+    pinned: bool
+    tokens: int
+
+    @property
+    def id(self) -> str:
+        """Short content hash the consolidation model uses to refer to this fact."""
+        return hashlib.sha1(f"{self.section}\n{self.text}".encode("utf-8")).hexdigest()[:8]
+
+
+def _stem(word: str) -> str:
+    """Fold simple plurals so "editors" matches "editor"."""
+    if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+        return word[:-1]
+    return word
+
+
+def _terms(text: str) -> list[str]:
+    return [_stem(w) for w in _WORD.findall(text.lower()) if w not in _STOPWORDS]
+
+
+def _fence_close(line: str) -> re.Pattern[str] | None:
+    """For a line opening a ``` or ~~~ code fence, the pattern of the line that closes it."""
+    if m := _FENCE.match(line):
+        marker = m.group(1)
+        return re.compile(rf"^\s*{re.escape(marker[0])}{{{len(marker)},}}\s*$")
+    return None
+
+
+def _parse(lines: list[str]) -> list[tuple[MemoryFact | str, int, int]]:
+    """Blocks of MEMORY.md with the [start, end) range of lines each one spans."""
+    blocks: list[tuple[MemoryFact | str, int, int]] = []
+    section, pinned = "", False
+    start = end = -1  # Lines of the fact being collected; start < 0 when there is none
+    is_item = False
+    fence: re.Pattern[str] | None = None  # Closing line of the open code fence
+    fence_end = -1  # Line after the last closed fence
+
+    def flush() -> None:
+        nonlocal start
+        if start >= 0:
+            text = "\n".join(lines[start:end]).strip()
+            blocks.append((MemoryFact(section, text, pinned, estimate_text_tokens(text)), start, end))
+            start = -1
+
+    for i, line in enumerate(lines):
+        if fence:
+            end = i + 1
+            if fence.match(line):
+                fence, fence_end = None, i + 1
+            continue
+        if not line.strip():
+            continue  # Whether a blank line ends the fact depends on the next line
+        gap = start >= 0 and (end < i or end == fence_end)  # Blank line or code since the fact's text
+        if m := _HEADING.match(line):
+            flush()
+            section, pinned = line.strip(), bool(_PINNED.search(m.group(2)))
+            blocks.append((section, i, i + 1))
+        elif close := _fence_close(line):
+            fence = close
+            if start < 0:
+                start, is_item = i, False
+            end = i + 1  # Code belongs to the fact it follows
+        elif start >= 0 and is_item and line[0] in " \t":
+            end = i + 1  # Nested item or continuation of the item, also after a blank line
+        elif _ITEM.match(line) or gap or start < 0:
+            flush()
+            start, end, is_item = i, i + 1, bool(_ITEM.match(line))
+        else:
+            end = i + 1
+    flush()
+    return blocks
+
+
+def parse_blocks(content: str) -> list[MemoryFact | str]:
+    """
+    Split MEMORY.md into heading lines and facts: list items or paragraphs.
+
+    A list item keeps its nested items and indented continuation lines, and
+    a fenced code block stays with the fact it follows; ``#`` and blank
+    lines inside a fence are part of the code.
+    """
+    return [b for b, _, _ in _parse(content.splitlines())]
+
+
+def parse_memory(content: str) -> list[MemoryFact]:
+    """The facts of MEMORY.md, without its headings."""
+    return [b for b in parse_blocks(content) if isinstance(b, MemoryFact)]
+
+
+def render_blocks(blocks: list[MemoryFact | str]) -> str:
+    """Join headings and facts back into markdown; consecutive list items stay on adjacent lines."""
+    out: list[str] = []
+    prev: MemoryFact | str | None = None
+    for block in blocks:
+        text = block if isinstance(block, str) else block.text
+        if prev is None:
+            sep = ""
+        elif isinstance(prev, MemoryFact) and isinstance(block, MemoryFact) \
+                and _ITEM.match(prev.text) and _ITEM.match(block.text):
+            sep = "\n"
+        else:
+            sep = "\n\n"
+        out.append(sep + text)
+        prev = block
+    return "".join(out)
+
+
+class MemoryIndex:
+    """BM25 index over the facts of one version of MEMORY.md."""
+
+    def __init__(self, content: str):
+        self.facts = parse_memory(content)
+        self.total_tokens = sum(f.tokens for f in self.facts)
+        self._tf = [Counter(_terms(f"{f.section} {f.text}")) for f in self.facts]
+        self._len = [sum(tf.values()) for tf in self._tf]
+        self._avg_len = (sum(self._len) / len(self._len)) if self._len else 0.0
+        df: Counter[str] = Counter()
+        for tf in self._tf:
+            df.update(tf.keys())
+        n = len(self.facts)
+        self._idf = {t: math.log(1 + (n - d + 0.5) / (d + 0.5)) for t, d in df.items()}
+
+    def scores(self, query: str) -> list[float]:
+        q = set(_terms(query)) & self._idf.keys()
+        out = []
+        for tf, length in zip(self._tf, self._len):
+            s = 0.0
+            norm = _K1 * (1 - _B + _B * length / self._avg_len) if self._avg_len else _K1
+            for t in q:
+                if f := tf.get(t):
+                    s += self._idf[t] * f * (_K1 + 1) / (f + norm)
+            out.append(s)
+        return out
+
+    def select(self, query: str, max_tokens: int, top_k: int) -> list[MemoryFact]:
+        """
+        Pinned facts plus the best-scoring others that fit in ``max_tokens``.
+
+        Pinned facts are always included, even past the budget. The result
+        keeps the document order so the rendered memory reads like the file.
+        """
+        chosen = {i for i, f in enumerate(self.facts) if f.pinned}
+        used = sum(self.facts[i].tokens for i in chosen)
+        ranked = sorted(
+            ((s, i) for i, s in enumerate(self.scores(query)) if s > 0 and i not in chosen),
+            key=lambda p: (-p[0], p[1]),
+        )
+        for _, i in ranked[:top_k]:
+            if used + self.facts[i].tokens <= max_tokens:
+                chosen.add(i)
+                used += self.facts[i].tokens
+        return [self.facts[i] for i in sorted(chosen)]
+
+
+def render_facts(facts: list[MemoryFact]) -> str:
+    """Render a subset of facts, repeating each heading once."""
+    blocks: list[MemoryFact | str] = []
+    section = None
+    for fact in facts:
+        if fact.section != section:
+            section = fact.section
+            if section:
+                blocks.append(section)
+        blocks.append(fact)
+    return render_blocks(blocks)
+
+
+def render_with_ids(content: str) -> str:
+    """MEMORY.md with each fact prefixed by its ``[id]``, for the consolidation prompt."""
+    return "\n".join(b if isinstance(b, str) else f"[{b.id}] {b.text}" for b in parse_blocks(content))
+
+
+def _heading_name(heading: str) -> str:
+    return heading.lstrip("#").strip().lower()
+
+
+def _as_item(text: str) -> str:
+    text = text.strip()
+    return text if _ITEM.match(text) else f"- {text}"
+
+
+def apply_memory_patch(content: str, ops: list[dict[str, Any]]) -> tuple[str, list[str]]:
+    """
+    Apply add/update/delete operations to MEMORY.md content.
+
+    ``update``/``delete`` name a fact by the id from :func:`render_with_ids`;
+    ``add`` appends under ``section`` (a heading, created if missing).
+    Each operation only rewrites the lines of the fact it touches, so the
+    rest of the file is kept byte for byte. Returns the new content and a
+    description of each operation that could not be applied; the others
+    still are.
+    """
+    lines = content.splitlines(keepends=True)
+    blocks = _parse([line.rstrip("\r\n") for line in lines])
+    facts = {b.id: (b, start, end) for b, start, end in blocks if isinstance(b, MemoryFact)}
+    replace: dict[int, tuple[int, list[str]]] = {}  # First line of a fact -> (end, new lines)
+    insert: dict[int, list[str]] = {}  # Lines added before this line of the original
+    new_sections: dict[str, list[str]] = {}  # Headings added at the end of the file -> their items
+    done: set[str] = set()
+    errors: list[str] = []
+
+    for op in ops:
+        if not isinstance(op, dict):
+            errors.append(f"not an object: {op!r}")
+            continue
+        kind, text = op.get("op"), op.get("text")
+        if kind in ("update", "delete"):
+            fact_id = op.get("id")
+            if fact_id not in facts or fact_id in done:
+                errors.append(f"{kind}: unknown id {fact_id!r}")
+            elif kind == "delete":
+                done.add(fact_id)
+                _, start, end = facts[fact_id]
+                if (start == 0 or not lines[start - 1].strip()) and end < len(lines) and not lines[end].strip():
+                    end += 1  # Don't leave two blank lines behind
+                replace[start] = (end, [])
+            elif not isinstance(text, str) or not text.strip():
+                errors.append(f"update {fact_id}: missing text")
+            else:
+                done.add(fact_id)
+                old, start, end = facts[fact_id]
+                new_text = _as_item(text) if _ITEM.match(old.text) else text.strip()
+                indent = lines[start][: len(lines[start]) - len(lines[start].lstrip())]
+                replace[start] = (end, [indent + new_text + "\n"])
+        elif kind == "add":
+            if not isinstance(text, str) or not text.strip():
+                errors.append("add: missing text")
+                continue
+            name = str(op.get("section") or "Notes")
+            item = _as_item(text) + "\n"
+            k = next(
+                (k for k, (b, _, _) in enumerate(blocks) if isinstance(b, str) and _heading_name(b) == _heading_name(name)),
+                None,
+            )
+            if k is not None:
+                # Insert after the section's last fact (or its heading)
+                while k + 1 < len(blocks) and isinstance(blocks[k + 1][0], MemoryFact):
+                    k += 1
+                anchor, _, at = blocks[k]
+                if at not in insert:
+                    if not (isinstance(anchor, MemoryFact) and _ITEM.match(anchor.text)):
+                        item = "\n" + item
+                    if not lines[at - 1].endswith("\n"):
+                        item = "\n" + item
+                insert.setdefault(at, []).append(item)
+            else:
+                heading = next((h for h in new_sections if _heading_name(h) == _heading_name(name)), None)
+                heading = heading or (name if name.startswith("#") else f"## {name}")
+                new_sections.setdefault(heading, []).append(item)
+        else:
+            errors.append(f"unknown op {kind!r}")
+
+    out_lines: list[str] = []
+    i = 0
+    while i < len(lines):
+        out_lines += insert.pop(i, [])
+        if i in replace:
+            end, new_lines = replace[i]
+            out_lines += new_lines
+            for j in range(i + 1, end):
+                out_lines += insert.pop(j, [])
+            i = end
+        else:
+            out_lines.append(lines[i])
+            i += 1
+    out = "".join(out_lines + insert.pop(len(lines), []))
+    for heading, items in new_sections.items():
+        if out and not out.endswith("\n"):
+            out += "\n"
+        out += ("\n" if out else "") + f"{heading}\n\n" + "".join(items)
+    return out, errors
@@ -0,0 +1,75 @@
+"""Per-session turn scheduler for the agent loop."""
+
+from __future__ import annotations
+
+import asyncio
+import weakref
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+
+class SessionScheduler:
+    """
+    Run turns from different sessions concurrently, one at a time per session.
+
+    Each session key has its own FIFO lock, so turns within a session keep
+    their arrival order. A session only competes for a global slot while it
+    holds its own lock, so the global wait queue holds at most one turn per
+    session. Serving that queue in FIFO order gives round-robin fairness:
+    a busy group chat re-queues behind everyone else after each turn and
+    cannot starve quieter direct messages.
+    """
+
+    def __init__(self, max_concurrent: int = 4):
+        self.max_concurrent = max(1, max_concurrent)
+        self._session_locks: weakref.WeakValueDictionary[str, asyncio.Lock] = weakref.WeakValueDictionary()
+        self._waiters: deque[asyncio.Future[None]] = deque()
+        self._active = 0
+
+    @property
+    def active(self) -> int:
+        """Number of turns currently holding a global slot."""
+        return self._active
+
+    @property
+    def waiting(self) -> int:
+        """Number of sessions waiting for a global slot."""
+        return sum(1 for w in self._waiters if not w.done())
+
+    @asynccontextmanager
+    async def slot(self, session_key: str) -> AsyncIterator[None]:
+        """Hold the session lock and one global slot for the duration of a turn."""
+        lock = self._session_locks.setdefault(session_key, asyncio.Lock())
+        async with lock:
+            await self._acquire()
+            try:
+                yield
+            finally:
+                self._release()
+
+    async def _acquire(self) -> None:
+        if self._active < self.max_concurrent and not self._waiters:
+            self._active += 1
+            return
+        fut: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._waiters.append(fut)
+        try:
+            await fut
+        except asyncio.CancelledError:
+            if fut.done() and not fut.cancelled():
+                self._release()  # Slot was handed over just before cancellation
+            else:
+                try:
+                    self._waiters.remove(fut)
+                except ValueError:
+                    pass
+            raise
+
+    def _release(self) -> None:
+        while self._waiters:
+            fut = self._waiters.popleft()
+            if not fut.done():
+                fut.set_result(None)  # Hand the slot over without touching the count
+                return
+        self._active -= 1
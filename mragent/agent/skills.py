@@ -4,24 +4,91 @@ import json
 import os
 import re
 import shutil
+import time
+from dataclasses import dataclass
 from pathlib import Path
 
 # Default builtin skills directory (relative to this file)
 BUILTIN_SKILLS_DIR = Path(__file__).parent.parent / "skills"
 
 
+@dataclass
+class _SkillEntry:
+    """A skill as indexed by SkillsLoader."""
+
+    name: str
+    path: Path
+    source: str  # "workspace" or "builtin"
+    stamp: tuple[int, int]  # (mtime_ns, size) of SKILL.md when it was parsed
+    content: str
+    frontmatter: dict[str, str] | None
+    meta: dict  # Parsed mragent/openclaw metadata from the frontmatter
+
+
 class SkillsLoader:
     """
     Loader for agent skills.
 
     Skills are markdown files (SKILL.md) that teach the agent how to use
     specific tools or perform certain tasks.
+
+    Skills are kept in an in-memory index (name → path, source, content and
+    parsed frontmatter) so lookups don't touch the disk. The index is rescanned
+    at most every ``refresh_interval_s`` seconds, re-parsing only the files
+    whose mtime or size changed; call ``refresh()`` to force a rescan.
+    Requirement checks for CLI binaries are cached for ``requirement_ttl_s``.
     """
 
-    def __init__(self, workspace: Path, builtin_skills_dir: Path | None = None):
+    def __init__(
+        self,
+        workspace: Path,
+        builtin_skills_dir: Path | None = None,
+        refresh_interval_s: float = 2.0,
+        requirement_ttl_s: float = 60.0,
+    ):
         self.workspace = workspace
         self.workspace_skills = workspace / "skills"
         self.builtin_skills = builtin_skills_dir or BUILTIN_SKILLS_DIR
+        self.refresh_interval_s = refresh_interval_s
+        self.requirement_ttl_s = requirement_ttl_s
+        self._index: dict[str, _SkillEntry] = {}
+        self._scanned_at: float | None = None
+        self._which_cache: dict[str, tuple[bool, float]] = {}  # bin -> (found, checked_at)
+
+    def refresh(self) -> None:
+        """Rescan the skill directories, re-parsing only SKILL.md files that changed."""
+        index: dict[str, _SkillEntry] = {}
+        for root, source in ((self.workspace_skills, "workspace"), (self.builtin_skills, "builtin")):
+            if not root or not root.is_dir():
+                continue
+            for skill_dir in sorted(root.iterdir()):
+                name = skill_dir.name
+                if name in index:
+                    continue  # Workspace skills shadow built-in ones
+                skill_file = skill_dir / "SKILL.md"
+                try:
+                    st = skill_file.stat()
+                except OSError:
+                    continue
+                stamp = (st.st_mtime_ns, st.st_size)
+                old = self._index.get(name)
+                if old and old.path == skill_file and old.stamp == stamp:
+                    index[name] = old
+                    continue
+                try:
+                    content = skill_file.read_text(encoding="utf-8")
+                except OSError:
+                    continue
+                frontmatter = self._parse_frontmatter(content)
+                meta = self._parse_mragent_metadata((frontmatter or {}).get("metadata", ""))
+                index[name] = _SkillEntry(name, skill_file, source, stamp, content, frontmatter, meta)
+        self._index = index
+        self._scanned_at = time.monotonic()
+
+    def _entries(self) -> dict[str, _SkillEntry]:
+        if self._scanned_at is None or time.monotonic() - self._scanned_at >= self.refresh_interval_s:
+            self.refresh()
+        return self._index
 
     def list_skills(self, filter_unavailable: bool = True) -> list[dict[str, str]]:
         """
@@ -33,28 +100,11 @@ class SkillsLoader:
         Returns:
             List of skill info dicts with 'name', 'path', 'source'.
         """
-        skills = []
-
-        # Workspace skills (highest priority)
-        if self.workspace_skills.exists():
-            for skill_dir in self.workspace_skills.iterdir():
-                if skill_dir.is_dir():
-                    skill_file = skill_dir / "SKILL.md"
-                    if skill_file.exists():
-                        skills.append({"name": skill_dir.name, "path": str(skill_file), "source": "workspace"})
-
-        # Built-in skills
-        if self.builtin_skills and self.builtin_skills.exists():
-            for skill_dir in self.builtin_skills.iterdir():
-                if skill_dir.is_dir():
-                    skill_file = skill_dir / "SKILL.md"
-                    if skill_file.exists() and not any(s["name"] == skill_dir.name for s in skills):
-                        skills.append({"name": skill_dir.name, "path": str(skill_file), "source": "builtin"})
-
-        # Filter by requirements
-        if filter_unavailable:
-            return [s for s in skills if self._check_requirements(self._get_skill_meta(s["name"]))]
-        return skills
+        return [
+            {"name": e.name, "path": str(e.path), "source": e.source}
+            for e in self._entries().values()
+            if not filter_unavailable or self._check_requirements(e.meta)
+        ]
 
     def load_skill(self, name: str) -> str | None:
         """
@@ -66,18 +116,8 @@ class SkillsLoader:
         Returns:
             Skill content or None if not found.
         """
-        # Check workspace first
-        workspace_skill = self.workspace_skills / name / "SKILL.md"
-        if workspace_skill.exists():
-            return workspace_skill.read_text(encoding="utf-8")
-
-        # Check built-in
-        if self.builtin_skills:
-            builtin_skill = self.builtin_skills / name / "SKILL.md"
-            if builtin_skill.exists():
-                return builtin_skill.read_text(encoding="utf-8")
-
-        return None
+        entry = self._entries().get(name)
+        return entry.content if entry else None
 
     def load_skills_for_context(self, skill_names: list[str]) -> str:
         """
@@ -108,29 +148,27 @@ class SkillsLoader:
         Returns:
             XML-formatted skills summary.
         """
-        all_skills = self.list_skills(filter_unavailable=False)
-        if not all_skills:
+        entries = self._entries()
+        if not entries:
             return ""
 
         def escape_xml(s: str) -> str:
             return s.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
 
         lines = ["<skills>"]
-        for s in all_skills:
-            name = escape_xml(s["name"])
-            path = s["path"]
-            desc = escape_xml(self._get_skill_description(s["name"]))
-            skill_meta = self._get_skill_meta(s["name"])
-            available = self._check_requirements(skill_meta)
+        for e in entries.values():
+            name = escape_xml(e.name)
+            desc = escape_xml((e.frontmatter or {}).get("description") or e.name)
+            available = self._check_requirements(e.meta)
 
             lines.append(f"  <skill available=\"{str(available).lower()}\">")
             lines.append(f"    <name>{name}</name>")
             lines.append(f"    <description>{desc}</description>")
-            lines.append(f"    <location>{path}</location>")
+            lines.append(f"    <location>{e.path}</location>")
 
             # Show missing requirements for unavailable skills
             if not available:
-                missing = self._get_missing_requirements(skill_meta)
+                missing = self._get_missing_requirements(e.meta)
                 if missing:
                     lines.append(f"    <requires>{escape_xml(missing)}</requires>")
 
@@ -144,7 +182,7 @@ class SkillsLoader:
         missing = []
         requires = skill_meta.get("requires", {})
         for b in requires.get("bins", []):
-            if not shutil.which(b):
+            if not self._has_bin(b):
                 missing.append(f"CLI: {b}")
         for env in requires.get("env", []):
             if not os.environ.get(env):
@@ -178,27 +216,35 @@ class SkillsLoader:
         """Check if skill requirements are met (bins, env vars)."""
         requires = skill_meta.get("requires", {})
         for b in requires.get("bins", []):
-            if not shutil.which(b):
+            if not self._has_bin(b):
                 return False
         for env in requires.get("env", []):
             if not os.environ.get(env):
                 return False
         return True
 
+    def _has_bin(self, name: str) -> bool:
+        """shutil.which() with results cached for requirement_ttl_s."""
+        now = time.monotonic()
+        cached = self._which_cache.get(name)
+        if cached and now - cached[1] < self.requirement_ttl_s:
+            return cached[0]
+        found = shutil.which(name) is not None
+        self._which_cache[name] = (found, now)
+        return found
+
     def _get_skill_meta(self, name: str) -> dict:
         """Get mragent metadata for a skill (cached in frontmatter)."""
-        meta = self.get_skill_metadata(name) or {}
-        return self._parse_mragent_metadata(meta.get("metadata", ""))
+        entry = self._entries().get(name)
+        return entry.meta if entry else {}
 
     def get_always_skills(self) -> list[str]:
         """Get skills marked as always=true that meet requirements."""
-        result = []
-        for s in self.list_skills(filter_unavailable=True):
-            meta = self.get_skill_metadata(s["name"]) or {}
-            skill_meta = self._parse_mragent_metadata(meta.get("metadata", ""))
-            if skill_meta.get("always") or meta.get("always"):
-                result.append(s["name"])
-        return result
+        return [
+            e.name for e in self._entries().values()
+            if (e.meta.get("always") or (e.frontmatter or {}).get("always"))
+            and self._check_requirements(e.meta)
+        ]
 
     def get_skill_metadata(self, name: str) -> dict | None:
         """
@@ -210,10 +256,14 @@ class SkillsLoader:
         Returns:
             Metadata dict or None.
         """
-        content = self.load_skill(name)
-        if not content:
+        entry = self._entries().get(name)
+        if not entry or entry.frontmatter is None:
             return None
+        return dict(entry.frontmatter)
 
+    @staticmethod
+    def _parse_frontmatter(content: str) -> dict[str, str] | None:
+        """Parse the simple key: value YAML frontmatter of a SKILL.md."""
         if content.startswith("---"):
             match = re.match(r"^---\n(.*?)\n---", content, re.DOTALL)
             if match:
@@ -1,11 +1,14 @@
 """Cron tool for scheduling reminders and tasks."""
 
 from contextvars import ContextVar
-from typing import Any
+from typing import Any, get_args
 
 from mragent.agent.tools.base import Tool
 from mragent.cron.service import CronService
-from mragent.cron.types import CronSchedule
+from mragent.cron.types import CronSchedule, MisfirePolicy, OverlapPolicy
+
+_OVERLAP = get_args(OverlapPolicy)
+_MISFIRE = get_args(MisfirePolicy)
 
 
 class CronTool(Tool):
@@ -13,14 +16,12 @@ class CronTool(Tool):
 
     def __init__(self, cron_service: CronService):
         self._cron = cron_service
-        self._channel = ""
-        self._chat_id = ""
+        self._session: ContextVar[tuple[str, str]] = ContextVar("cron_session", default=("", ""))
         self._in_cron_context: ContextVar[bool] = ContextVar("cron_in_context", default=False)
 
     def set_context(self, channel: str, chat_id: str) -> None:
         """Set the current session context for delivery."""
-        self._channel = channel
-        self._chat_id = chat_id
+        self._session.set((channel, chat_id))
 
     def set_cron_context(self, active: bool):
         """Mark whether the tool is executing inside a cron job callback."""
@@ -65,6 +66,23 @@ class CronTool(Tool):
                     "type": "string",
                     "description": "ISO datetime for one-time execution (e.g. '2026-02-12T10:30:00')",
                 },
+                "max_concurrency": {
+                    "type": "integer",
+                    "minimum": 1,
+                    "description": "Runs of this job allowed at the same time (for add, default 1)",
+                },
+                "overlap": {
+                    "type": "string",
+                    "enum": list(_OVERLAP),
+                    "description": "When a run is due while max_concurrency runs are still going: "
+                                   "skip it, queue it, or replace the oldest run (for add, default skip)",
+                },
+                "misfire": {
+                    "type": "string",
+                    "enum": list(_MISFIRE),
+                    "description": "Runs missed while mragent was down: run_once, catch_up (each missed run) "
+                                   "or skip (for add, default run_once)",
+                },
                 "job_id": {"type": "string", "description": "Job ID (for remove)"},
             },
             "required": ["action"],
@@ -79,12 +97,15 @@ class CronTool(Tool):
         tz: str | None = None,
         at: str | None = None,
         job_id: str | None = None,
+        max_concurrency: int = 1,
+        overlap: str = "skip",
+        misfire: str = "run_once",
         **kwargs: Any,
     ) -> str:
         if action == "add":
             if self._in_cron_context.get():
                 return "Error: cannot schedule new jobs from within a cron job execution"
-            return self._add_job(message, every_seconds, cron_expr, tz, at)
+            return self._add_job(message, every_seconds, cron_expr, tz, at, max_concurrency, overlap, misfire)
         elif action == "list":
             return self._list_jobs()
         elif action == "remove":
@@ -98,10 +119,20 @@ class CronTool(Tool):
         cron_expr: str | None,
         tz: str | None,
         at: str | None,
+        max_concurrency: int = 1,
+        overlap: str = "skip",
+        misfire: str = "run_once",
     ) -> str:
         if not message:
             return "Error: message is required for add"
-        if not self._channel or not self._chat_id:
+        if max_concurrency < 1:
+            return "Error: max_concurrency must be at least 1"
+        if overlap not in _OVERLAP:
+            return f"Error: overlap must be one of {', '.join(_OVERLAP)}"
+        if misfire not in _MISFIRE:
+            return f"Error: misfire must be one of {', '.join(_MISFIRE)}"
+        channel, chat_id = self._session.get()
+        if not channel or not chat_id:
             return "Error: no session context (channel/chat_id)"
         if tz and not cron_expr:
             return "Error: tz can only be used with cron_expr"
@@ -137,9 +168,12 @@ class CronTool(Tool):
             schedule=schedule,
             message=message,
             deliver=True,
-            channel=self._channel,
-            to=self._chat_id,
+            channel=channel,
+            to=chat_id,
             delete_after_run=delete_after,
+            max_concurrency=max_concurrency,
+            overlap=overlap,
+            misfire=misfire,
         )
         return f"Created job '{job.name}' (id: {job.id})"
 
@@ -36,6 +36,10 @@ class ReadFileTool(Tool):
     def name(self) -> str:
         return "read_file"
 
+    @property
+    def read_only(self) -> bool:
+        return True
+
     @property
     def description(self) -> str:
         return "Read the contents of a file at the given path."
@@ -203,6 +207,10 @@ class ListDirTool(Tool):
     def name(self) -> str:
         return "list_dir"
 
+    @property
+    def read_only(self) -> bool:
+        return True
+
     @property
     def description(self) -> str:
         return "List the contents of a directory."
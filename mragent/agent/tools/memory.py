@@ -0,0 +1,60 @@
+"""History search tool."""
+
+import asyncio
+from typing import Any
+
+from mragent.agent.memory import MemoryStore
+from mragent.agent.tools.base import Tool
+
+
+class SearchHistoryTool(Tool):
+    """Tool to search past conversation summaries in HISTORY.md."""
+
+    def __init__(self, memory: MemoryStore):
+        self._memory = memory
+
+    @property
+    def name(self) -> str:
+        return "search_history"
+
+    @property
+    def description(self) -> str:
+        return (
+            "Search the history log (memory/HISTORY.md) of past conversations. "
+            "Returns the best-matching entries with their timestamps, most relevant first."
+        )
+
+    @property
+    def parameters(self) -> dict[str, Any]:
+        return {
+            "type": "object",
+            "properties": {
+                "query": {"type": "string", "description": "Keywords to look for"},
+                "since": {"type": "string", "description": "Only entries on/after this date (YYYY-MM-DD)"},
+                "until": {"type": "string", "description": "Only entries on/before this date (YYYY-MM-DD)"},
+                "limit": {"type": "integer", "description": "Maximum results", "minimum": 1, "maximum": 20},
+            },
+            "required": ["query"],
+        }
+
+    @property
+    def read_only(self) -> bool:
+        return True
+
+    async def execute(
+        self,
+        query: str,
+        since: str | None = None,
+        until: str | None = None,
+        limit: int = 5,
+        **kwargs: Any,
+    ) -> str:
+        try:
+            hits = await asyncio.to_thread(  # Indexing new HISTORY.md entries can take a while
+                self._memory.history_index.search, query, since=since, until=until, limit=limit,
+            )
+        except Exception as e:
+            return f"Error searching history: {e}"
+        if not hits:
+            return f"No history entries match '{query}'."
+        return "\n\n".join(f"[{h.ts or '?'}] {h.snippet}" for h in hits)
@@ -1,11 +1,23 @@
 """Message tool for sending messages to users."""
 
+from contextvars import ContextVar
+from dataclasses import dataclass
 from typing import Any, Awaitable, Callable
 
 from mragent.agent.tools.base import Tool
 from mragent.bus.events import OutboundMessage
 
 
+@dataclass
+class _TurnContext:
+    """Routing info and send tracking for the turn running in the current task."""
+
+    channel: str
+    chat_id: str
+    message_id: str | None = None
+    sent: bool = False
+
+
 class MessageTool(Tool):
     """Tool to send messages to users on chat channels."""
 
@@ -17,16 +29,25 @@ class MessageTool(Tool):
         default_message_id: str | None = None,
     ):
         self._send_callback = send_callback
-        self._default_channel = default_channel
-        self._default_chat_id = default_chat_id
-        self._default_message_id = default_message_id
-        self._sent_in_turn: bool = False
+        # Turns for different sessions run concurrently, so routing is scoped to
+        # the current asyncio context instead of being shared on the instance.
+        self._fallback = _TurnContext(default_channel, default_chat_id, default_message_id)
+        self._turn: ContextVar[_TurnContext | None] = ContextVar("message_turn", default=None)
+
+    def _current(self) -> _TurnContext:
+        return self._turn.get() or self._fallback
+
+    @property
+    def _sent_in_turn(self) -> bool:
+        return self._current().sent
+
+    @_sent_in_turn.setter
+    def _sent_in_turn(self, value: bool) -> None:
+        self._current().sent = value
 
     def set_context(self, channel: str, chat_id: str, message_id: str | None = None) -> None:
         """Set the current message context."""
-        self._default_channel = channel
-        self._default_chat_id = chat_id
-        self._default_message_id = message_id
+        self._turn.set(_TurnContext(channel, chat_id, message_id))
 
     def set_send_callback(self, callback: Callable[[OutboundMessage], Awaitable[None]]) -> None:
         """Set the callback for sending messages."""
@@ -34,7 +55,7 @@ class MessageTool(Tool):
 
     def start_turn(self) -> None:
         """Reset per-turn send tracking."""
-        self._sent_in_turn = False
+        self._current().sent = False
 
     @property
     def name(self) -> str:
@@ -79,9 +100,10 @@ class MessageTool(Tool):
         media: list[str] | None = None,
         **kwargs: Any
     ) -> str:
-        channel = channel or self._default_channel
-        chat_id = chat_id or self._default_chat_id
-        message_id = message_id or self._default_message_id
+        ctx = self._current()
+        channel = channel or ctx.channel
+        chat_id = chat_id or ctx.chat_id
+        message_id = message_id or ctx.message_id
 
         if not channel or not chat_id:
             return "Error: No target channel/chat specified"
@@ -101,8 +123,8 @@ class MessageTool(Tool):
 
         try:
             await self._send_callback(msg)
-            if channel == self._default_channel and chat_id == self._default_chat_id:
-                self._sent_in_turn = True
+            if channel == ctx.channel and chat_id == ctx.chat_id:
+                ctx.sent = True
             media_info = f" with {len(media)} attachments" if media else ""
             return f"Message sent to {channel}:{chat_id}{media_info}"
         except Exception as e:
@@ -1,8 +1,14 @@
 """Tool registry for dynamic tool management."""
 
+import asyncio
+import time
 from typing import Any
 
 from mragent.agent.tools.base import Tool
+from mragent.utils import metrics
+
+_TOOL_CALLS = metrics.counter("mragent_tool_calls_total", "Tool calls", ("tool", "outcome"))
+_TOOL_SECONDS = metrics.histogram("mragent_tool_seconds", "Tool call latency", ("tool",))
 
 
 class ToolRegistry:
@@ -41,8 +47,10 @@ class ToolRegistry:
 
         tool = self._tools.get(name)
         if not tool:
+            _TOOL_CALLS.inc(tool="unknown", outcome="error")
             return f"Error: Tool '{name}' not found. Available: {', '.join(self.tool_names)}"
 
+        started, outcome = time.perf_counter(), "error"
         try:
             errors = tool.validate_params(params)
             if errors:
@@ -50,9 +58,47 @@ class ToolRegistry:
             result = await tool.execute(**params)
             if isinstance(result, str) and result.startswith("Error"):
                 return result + _HINT
+            outcome = "ok"
             return result
         except Exception as e:
             return f"Error executing {name}: {str(e)}" + _HINT
+        finally:
+            _TOOL_SECONDS.observe(time.perf_counter() - started, tool=name)
+            _TOOL_CALLS.inc(tool=name, outcome=outcome)
+
+    async def execute_many(
+        self, calls: list[tuple[str, dict[str, Any]]], max_concurrency: int = 4
+    ) -> list[str]:
+        """
+        Execute tool calls and return their results in call order.
+
+        Consecutive calls to read-only tools run concurrently (at most
+        ``max_concurrency`` at a time); any other call runs on its own, so a
+        read issued after a write in the same batch still sees the write.
+        """
+        results: list[str] = [""] * len(calls)
+        sem = asyncio.Semaphore(max(1, max_concurrency))
+
+        def _read_only(name: str) -> bool:
+            tool = self._tools.get(name)
+            return bool(tool and tool.read_only)
+
+        async def _run(i: int) -> None:
+            async with sem:
+                results[i] = await self.execute(*calls[i])
+
+        i = 0
+        while i < len(calls):
+            j = i + 1
+            if _read_only(calls[i][0]):
+                while j < len(calls) and _read_only(calls[j][0]):
+                    j += 1
+            if j - i == 1:
+                results[i] = await self.execute(*calls[i])
+            else:
+                await asyncio.gather(*(_run(k) for k in range(i, j)))
+            i = j
+        return results
 
     @property
     def tool_names(self) -> list[str]:
@@ -11,10 +11,10 @@ import httpx
 from loguru import logger
 
 from mragent.agent.tools.base import Tool
+from mragent.utils.http import get_http_client
 
 # Shared constants
 USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 14_7_2) AppleWebKit/537.36"
-MAX_REDIRECTS = 5  # Limit redirects to prevent DoS attacks
 
 
 def _strip_tags(text: str) -> str:
@@ -49,6 +49,7 @@ class WebSearchTool(Tool):
 
     name = "web_search"
     description = "Search the web. Returns titles, URLs, and snippets."
+    read_only = True
     parameters = {
         "type": "object",
         "properties": {
@@ -79,14 +80,13 @@ class WebSearchTool(Tool):
         try:
             n = min(max(count or self.max_results, 1), 10)
             logger.debug("WebSearch: {}", "proxy enabled" if self.proxy else "direct connection")
-            async with httpx.AsyncClient(proxy=self.proxy) as client:
-                r = await client.get(
-                    "https://api.search.brave.com/res/v1/web/search",
-                    params={"q": query, "count": n},
-                    headers={"Accept": "application/json", "X-Subscription-Token": self.api_key},
-                    timeout=10.0
-                )
-                r.raise_for_status()
+            r = await get_http_client(self.proxy).get(
+                "https://api.search.brave.com/res/v1/web/search",
+                params={"q": query, "count": n},
+                headers={"Accept": "application/json", "X-Subscription-Token": self.api_key},
+                timeout=10.0
+            )
+            r.raise_for_status()
 
             results = r.json().get("web", {}).get("results", [])[:n]
             if not results:
@@ -111,6 +111,7 @@ class WebFetchTool(Tool):
 
     name = "web_fetch"
     description = "Fetch URL and extract readable content (HTML → markdown/text)."
+    read_only = True
     parameters = {
         "type": "object",
         "properties": {
@@ -135,14 +136,11 @@ class WebFetchTool(Tool):
 
         try:
             logger.debug("WebFetch: {}", "proxy enabled" if self.proxy else "direct connection")
-            async with httpx.AsyncClient(
-                follow_redirects=True,
-                max_redirects=MAX_REDIRECTS,
-                timeout=30.0,
-                proxy=self.proxy,
-            ) as client:
-                r = await client.get(url, headers={"User-Agent": USER_AGENT})
-                r.raise_for_status()
+            # The shared client caps redirect chains (utils.http.MAX_REDIRECTS).
+            r = await get_http_client(self.proxy).get(
+                url, headers={"User-Agent": USER_AGENT}, follow_redirects=True, timeout=30.0,
+            )
+            r.raise_for_status()
 
             ctype = r.headers.get("content-type", "")
 
@@ -0,0 +1,6 @@
+"""In-process benchmarks for the agent loop."""
+
+from mragent.bench.provider import ScriptedProvider
+from mragent.bench.runner import BenchConfig, compare, run_bench
+
+__all__ = ["BenchConfig", "ScriptedProvider", "compare", "run_bench"]
@@ -0,0 +1,65 @@
+"""Scripted LLM provider for benchmarks."""
+
+import asyncio
+from typing import Any
+
+from mragent.providers.base import LLMProvider, LLMResponse, ToolCallRequest
+
+
+class ScriptedProvider(LLMProvider):
+    """
+    Fake provider with a fixed script: ``tool_rounds`` rounds of
+    ``tool_calls`` ``list_dir`` calls, then a final answer of
+    ``response_chars`` characters. Every call sleeps ``latency_s`` first.
+    """
+
+    def __init__(
+        self,
+        latency_s: float = 0.0,
+        tool_rounds: int = 1,
+        tool_calls: int = 1,
+        response_chars: int = 500,
+    ):
+        super().__init__()
+        self.latency_s = latency_s
+        self.tool_rounds = tool_rounds
+        self.tool_calls = tool_calls
+        self.response_chars = response_chars
+        self.calls = 0
+
+    async def chat(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+        reasoning_effort: str | None = None,
+    ) -> LLMResponse:
+        self.calls += 1
+        if self.latency_s:
+            await asyncio.sleep(self.latency_s)
+
+        # Rounds already taken in this turn = assistant messages after the last user message
+        rounds = 0
+        for m in reversed(messages):
+            if m.get("role") == "user":
+                break
+            rounds += m.get("role") == "assistant"
+
+        usage = {"prompt_tokens": sum(len(str(m.get("content") or "")) for m in messages) // 4}
+        if tools and rounds < self.tool_rounds:
+            return LLMResponse(
+                content=None,
+                tool_calls=[
+                    ToolCallRequest(id=f"call_{self.calls}_{i}", name="list_dir", arguments={"path": "."})
+                    for i in range(self.tool_calls)
+                ],
+                finish_reason="tool_calls",
+                usage=usage,
+            )
+        text = ("lorem ipsum " * (self.response_chars // 12 + 1))[: self.response_chars]
+        return LLMResponse(content=text, usage={**usage, "completion_tokens": self.response_chars // 4})
+
+    def get_default_model(self) -> str:
+        return "bench/scripted"
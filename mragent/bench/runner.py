@@ -0,0 +1,200 @@
+"""Drive AgentLoop with simulated chats and measure mragent's own overhead."""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+from mragent.agent.loop import AgentLoop
+from mragent.bench.provider import ScriptedProvider
+from mragent.bus.events import InboundMessage
+from mragent.bus.queue import MessageBus
+
+BENCH_FORMAT = 1  # Bumped when the result layout changes
+_NOISE_FLOOR_MS = 0.5  # Differences below this are never reported as regressions
+
+
+@dataclass
+class BenchConfig:
+    """Shape of a benchmark run."""
+
+    chats: int = 10  # Simulated chats talking at the same time
+    turns: int = 5  # Messages per chat, each sent after the previous reply
+    latency_ms: float = 50.0  # Simulated LLM latency per call
+    tool_rounds: int = 1  # LLM calls per turn that request tools before the answer
+    tool_calls: int = 1  # Tool calls per round
+    response_chars: int = 500  # Length of the final answer
+    max_concurrent_turns: int = 4
+
+
+class _StageTimer:
+    """Records wall time of selected methods by wrapping them on the instance."""
+
+    def __init__(self) -> None:
+        self.samples: dict[str, list[float]] = defaultdict(list)
+
+    def wrap(self, obj: Any, attr: str, stage: str) -> None:
+        fn = getattr(obj, attr)
+        samples = self.samples[stage]
+
+        if asyncio.iscoroutinefunction(fn):
+            async def timed(*args: Any, **kwargs: Any) -> Any:
+                start = time.perf_counter()
+                try:
+                    return await fn(*args, **kwargs)
+                finally:
+                    samples.append(time.perf_counter() - start)
+        else:
+            def timed(*args: Any, **kwargs: Any) -> Any:
+                start = time.perf_counter()
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    samples.append(time.perf_counter() - start)
+
+        setattr(obj, attr, timed)
+
+
+def _percentile(values: list[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, round(q * (len(ordered) - 1)))]
+
+
+def _summary_ms(values: list[float]) -> dict[str, float]:
+    return {
+        "p50": round(_percentile(values, 0.5) * 1000, 3),
+        "p99": round(_percentile(values, 0.99) * 1000, 3),
+        "mean": round(sum(values) / len(values) * 1000, 3) if values else 0.0,
+        "max": round(max(values, default=0.0) * 1000, 3),
+    }
+
+
+def _peak_rss_mb() -> float | None:
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024, 1)
+
+
+async def run_bench(config: BenchConfig, workspace: Path | None = None) -> dict[str, Any]:
+    """
+    Run ``config.chats`` chats of ``config.turns`` turns each through a real
+    AgentLoop and MessageBus, with ScriptedProvider standing in for the LLM.
+
+    Stage timings are wall time, so under concurrency they include time spent
+    waiting for the event loop as well as the stage's own work.
+    """
+    if workspace is not None:
+        return await _run(config, workspace)
+    with tempfile.TemporaryDirectory(prefix="mragent-bench-") as tmp:
+        return await _run(config, Path(tmp))
+
+
+async def _run(config: BenchConfig, workspace: Path) -> dict[str, Any]:
+    bus = MessageBus()
+    provider = ScriptedProvider(
+        latency_s=config.latency_ms / 1000,
+        tool_rounds=config.tool_rounds,
+        tool_calls=config.tool_calls,
+        response_chars=config.response_chars,
+    )
+    loop = AgentLoop(
+        bus=bus,
+        provider=provider,
+        workspace=workspace,
+        memory_window=1_000_000,  # Keep consolidation (an extra LLM call) out of the numbers
+        max_concurrent_turns=config.max_concurrent_turns,
+    )
+    timer = _StageTimer()
+    timer.wrap(loop.context, "build_messages", "build_messages")
+    timer.wrap(loop, "_save_turn", "save_turn")
+    timer.wrap(loop.sessions, "save", "session_save")
+    timer.wrap(loop.tools, "execute_many", "tool_dispatch")
+
+    pending: dict[str, asyncio.Future] = {}
+    latencies: list[float] = []
+
+    async def route_replies() -> None:
+        while True:
+            out = await bus.consume_outbound()
+            if out.metadata.get("_progress"):
+                continue
+            fut = pending.pop(out.chat_id, None)
+            if fut and not fut.done():
+                fut.set_result(out)
+
+    async def chat(n: int) -> None:
+        chat_id = f"bench-{n}"
+        for turn in range(config.turns):
+            fut = asyncio.get_running_loop().create_future()
+            pending[chat_id] = fut
+            start = time.perf_counter()
+            await bus.publish_inbound(InboundMessage(
+                channel="bench", sender_id="bench", chat_id=chat_id,
+                content=f"Message {turn} from chat {n}: please list the workspace.",
+            ))
+            await fut
+            latencies.append(time.perf_counter() - start)
+
+    agent_task = asyncio.create_task(loop.run())
+    router = asyncio.create_task(route_replies())
+    started = time.perf_counter()
+    try:
+        await asyncio.gather(*(chat(n) for n in range(config.chats)))
+    finally:
+        elapsed = time.perf_counter() - started
+        loop.stop()
+        for task in (agent_task, router):
+            task.cancel()
+        await asyncio.gather(agent_task, router, return_exceptions=True)
+        await loop.close_mcp()
+
+    llm_s = (config.tool_rounds + 1) * config.latency_ms / 1000
+    return {
+        "format": BENCH_FORMAT,
+        "config": asdict(config),
+        "turns": len(latencies),
+        "llm_calls": provider.calls,
+        "duration_s": round(elapsed, 3),
+        "throughput_turns_per_s": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": _summary_ms(latencies),
+        # Turn latency minus the simulated LLM time it had to include
+        "overhead_ms": _summary_ms([max(0.0, t - llm_s) for t in latencies]),
+        "stages": {
+            stage: {"calls": len(samples), **_summary_ms(samples)}
+            for stage, samples in sorted(timer.samples.items())
+        },
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+
+
+def compare(result: dict[str, Any], baseline: dict[str, Any], tolerance: float = 0.2) -> list[str]:
+    """Describe every metric in ``result`` that is more than ``tolerance`` worse than ``baseline``."""
+    regressions = []
+
+    def check(label: str, now: float | None, before: float | None) -> None:
+        if now is None or not before:
+            return
+        if now > before * (1 + tolerance) and now - before > _NOISE_FLOOR_MS:
+            regressions.append(f"{label}: {before:g} -> {now:g} ms (+{(now / before - 1) * 100:.0f}%)")
+
+    for key in ("latency_ms", "overhead_ms"):
+        for q in ("p50", "p99"):
+            check(f"{key[:-3]} {q}", result.get(key, {}).get(q), baseline.get(key, {}).get(q))
+    for stage, stats in result.get("stages", {}).items():
+        check(f"{stage} mean", stats.get("mean"), baseline.get("stages", {}).get(stage, {}).get("mean"))
+
+    now, before = result.get("throughput_turns_per_s"), baseline.get("throughput_turns_per_s")
+    if now is not None and before and now < before / (1 + tolerance):
+        regressions.append(f"throughput: {before:g} -> {now:g} turns/s")
+    return regressions
@@ -1,8 +1,12 @@
 """Async message queue for decoupled channel-agent communication."""
 
 import asyncio
+import weakref
 
 from mragent.bus.events import InboundMessage, OutboundMessage
+from mragent.utils import metrics
+
+_DEPTH = metrics.gauge("mragent_bus_queue_depth", "Messages waiting on the message bus", ("queue",))
 
 
 class MessageBus:
@@ -16,6 +20,9 @@ class MessageBus:
     def __init__(self):
         self.inbound: asyncio.Queue[InboundMessage] = asyncio.Queue()
         self.outbound: asyncio.Queue[OutboundMessage] = asyncio.Queue()
+        ref = weakref.ref(self)
+        _DEPTH.set_function(lambda: (b := ref()) and b.inbound_size or 0, queue="inbound")
+        _DEPTH.set_function(lambda: (b := ref()) and b.outbound_size or 0, queue="outbound")
 
     async def publish_inbound(self, msg: InboundMessage) -> None:
         """Publish a message from a channel to the agent."""
@@ -1,6 +1,29 @@
-"""Chat channels module with plugin architecture."""
+"""Chat channels module with plugin architecture.
 
-from mragent.channels.base import BaseChannel
-from mragent.channels.manager import ChannelManager
+Exports are resolved on first access so that importing one channel module
+does not pull in the manager and, through it, every other channel.
+"""
+
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from mragent.channels.base import BaseChannel
+    from mragent.channels.manager import ChannelManager
+
+_LAZY = {
+    "BaseChannel": "mragent.channels.base",
+    "ChannelManager": "mragent.channels.manager",
+}
 
 __all__ = ["BaseChannel", "ChannelManager"]
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY:
+        value = getattr(importlib.import_module(_LAZY[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
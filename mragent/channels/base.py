@@ -18,6 +18,7 @@ class BaseChannel(ABC):
     """
 
     name: str = "base"
+    supports_streaming: bool = False  # Can update one message in place with partial text
 
     def __init__(self, config: Any, bus: MessageBus):
         """
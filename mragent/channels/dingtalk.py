@@ -16,6 +16,7 @@ from mragent.bus.events import OutboundMessage
 from mragent.bus.queue import MessageBus
 from mragent.channels.base import BaseChannel
 from mragent.config.schema import DingTalkConfig
+from mragent.utils.http import get_http_client
 
 try:
     from dingtalk_stream import (
@@ -131,7 +132,7 @@ class DingTalkChannel(BaseChannel):
                 return
 
             self._running = True
-            self._http = httpx.AsyncClient()
+            self._http = get_http_client()
 
             logger.info(
                 "Initializing DingTalk Stream Client with Client ID: {}...",
@@ -162,10 +163,8 @@ class DingTalkChannel(BaseChannel):
     async def stop(self) -> None:
         """Stop the DingTalk bot."""
         self._running = False
-        # Close the shared HTTP client
-        if self._http:
-            await self._http.aclose()
-            self._http = None
+        # Release the shared HTTP client (pooled process-wide, not closed here)
+        self._http = None
         # Cancel outstanding background tasks
         for task in self._background_tasks:
             task.cancel()
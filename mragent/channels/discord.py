@@ -14,6 +14,7 @@ from mragent.bus.queue import MessageBus
 from mragent.channels.base import BaseChannel
 from mragent.config.schema import DiscordConfig
 from mragent.utils.helpers import split_message
+from mragent.utils.http import get_http_client
 
 DISCORD_API_BASE = "https://discord.com/api/v10"
 MAX_ATTACHMENT_BYTES = 20 * 1024 * 1024  # 20MB
@@ -42,7 +43,7 @@ class DiscordChannel(BaseChannel):
             return
 
         self._running = True
-        self._http = httpx.AsyncClient(timeout=30.0)
+        self._http = get_http_client()
 
         while self._running:
             try:
@@ -70,9 +71,7 @@ class DiscordChannel(BaseChannel):
         if self._ws:
             await self._ws.close()
             self._ws = None
-        if self._http:
-            await self._http.aclose()
-            self._http = None
+        self._http = None  # Shared pooled client, closed at process shutdown
 
     async def send(self, msg: OutboundMessage) -> None:
         """Send a message through Discord REST API."""
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import asyncio
+import importlib
 from typing import Any
 
 from loguru import logger
@@ -10,8 +11,23 @@ from loguru import logger
 from mragent.bus.events import OutboundMessage
 from mragent.bus.queue import MessageBus
 from mragent.channels.base import BaseChannel
+from mragent.channels.outbox import ChannelOutbox
 from mragent.config.schema import Config
 
+# Config section -> (display name, module, class)
+_CHANNELS: dict[str, tuple[str, str, str]] = {
+    "telegram": ("Telegram", "mragent.channels.telegram", "TelegramChannel"),
+    "whatsapp": ("WhatsApp", "mragent.channels.whatsapp", "WhatsAppChannel"),
+    "discord": ("Discord", "mragent.channels.discord", "DiscordChannel"),
+    "feishu": ("Feishu", "mragent.channels.feishu", "FeishuChannel"),
+    "mochat": ("Mochat", "mragent.channels.mochat", "MochatChannel"),
+    "dingtalk": ("DingTalk", "mragent.channels.dingtalk", "DingTalkChannel"),
+    "email": ("Email", "mragent.channels.email", "EmailChannel"),
+    "slack": ("Slack", "mragent.channels.slack", "SlackChannel"),
+    "qq": ("QQ", "mragent.channels.qq", "QQChannel"),
+    "matrix": ("Matrix", "mragent.channels.matrix", "MatrixChannel"),
+}
+
 
 class ChannelManager:
     """
@@ -20,7 +36,8 @@ class ChannelManager:
     Responsibilities:
     - Initialize enabled channels (Telegram, WhatsApp, etc.)
     - Start/stop channels
-    - Route outbound messages
+    - Route outbound messages to a per-channel outbox, so a slow or
+      rate-limited channel only delays its own deliveries
     """
 
     def __init__(self, config: Config, bus: MessageBus):
@@ -28,126 +45,29 @@ class ChannelManager:
         self.bus = bus
         self.channels: dict[str, BaseChannel] = {}
         self._dispatch_task: asyncio.Task | None = None
+        self.outboxes: dict[str, ChannelOutbox] = {}
 
         self._init_channels()
+        for name, channel in self.channels.items():
+            self.outboxes[name] = ChannelOutbox(
+                channel,
+                maxsize=config.channels.outbound_queue_size,
+                lanes=config.channels.outbound_lanes,
+            )
 
     def _init_channels(self) -> None:
-        """Initialize channels based on config."""
-
-        # Telegram channel
-        if self.config.channels.telegram.enabled:
-            try:
-                from mragent.channels.telegram import TelegramChannel
-                self.channels["telegram"] = TelegramChannel(
-                    self.config.channels.telegram,
-                    self.bus,
-                    groq_api_key=self.config.providers.groq.api_key,
-                )
-                logger.info("Telegram channel enabled")
-            except ImportError as e:
-                logger.warning("Telegram channel not available: {}", e)
-
-        # WhatsApp channel
-        if self.config.channels.whatsapp.enabled:
-            try:
-                from mragent.channels.whatsapp import WhatsAppChannel
-                self.channels["whatsapp"] = WhatsAppChannel(
-                    self.config.channels.whatsapp, self.bus
-                )
-                logger.info("WhatsApp channel enabled")
-            except ImportError as e:
-                logger.warning("WhatsApp channel not available: {}", e)
-
-        # Discord channel
-        if self.config.channels.discord.enabled:
-            try:
-                from mragent.channels.discord import DiscordChannel
-                self.channels["discord"] = DiscordChannel(
-                    self.config.channels.discord, self.bus
-                )
-                logger.info("Discord channel enabled")
-            except ImportError as e:
-                logger.warning("Discord channel not available: {}", e)
-
-        # Feishu channel
-        if self.config.channels.feishu.enabled:
-            try:
-                from mragent.channels.feishu import FeishuChannel
-                self.channels["feishu"] = FeishuChannel(
-                    self.config.channels.feishu, self.bus
-                )
-                logger.info("Feishu channel enabled")
-            except ImportError as e:
-                logger.warning("Feishu channel not available: {}", e)
-
-        # Mochat channel
-        if self.config.channels.mochat.enabled:
-            try:
-                from mragent.channels.mochat import MochatChannel
-
-                self.channels["mochat"] = MochatChannel(
-                    self.config.channels.mochat, self.bus
-                )
-                logger.info("Mochat channel enabled")
-            except ImportError as e:
-                logger.warning("Mochat channel not available: {}", e)
-
-        # DingTalk channel
-        if self.config.channels.dingtalk.enabled:
-            try:
-                from mragent.channels.dingtalk import DingTalkChannel
-                self.channels["dingtalk"] = DingTalkChannel(
-                    self.config.channels.dingtalk, self.bus
-                )
-                logger.info("DingTalk channel enabled")
-            except ImportError as e:
-                logger.warning("DingTalk channel not available: {}", e)
-
-        # Email channel
-        if self.config.channels.email.enabled:
-            try:
-                from mragent.channels.email import EmailChannel
-                self.channels["email"] = EmailChannel(
-                    self.config.channels.email, self.bus
-                )
-                logger.info("Email channel enabled")
-            except ImportError as e:
-                logger.warning("Email channel not available: {}", e)
-
-        # Slack channel
-        if self.config.channels.slack.enabled:
-            try:
-                from mragent.channels.slack import SlackChannel
-                self.channels["slack"] = SlackChannel(
-                    self.config.channels.slack, self.bus
-                )
-                logger.info("Slack channel enabled")
-            except ImportError as e:
-                logger.warning("Slack channel not available: {}", e)
-
-        # QQ channel
-        if self.config.channels.qq.enabled:
-            try:
-                from mragent.channels.qq import QQChannel
-                self.channels["qq"] = QQChannel(
-                    self.config.channels.qq,
-                    self.bus,
-                )
-                logger.info("QQ channel enabled")
-            except ImportError as e:
-                logger.warning("QQ channel not available: {}", e)
-
-        # Matrix channel
-        if self.config.channels.matrix.enabled:
+        """Initialize enabled channels, importing only their modules (and SDKs)."""
+        for name, (label, module, class_name) in _CHANNELS.items():
+            channel_config = getattr(self.config.channels, name)
+            if not channel_config.enabled:
+                continue
+            extra = {"groq_api_key": self.config.providers.groq.api_key} if name == "telegram" else {}
             try:
-                from mragent.channels.matrix import MatrixChannel
-                self.channels["matrix"] = MatrixChannel(
-                    self.config.channels.matrix,
-                    self.bus,
-                )
-                logger.info("Matrix channel enabled")
+                channel_cls = getattr(importlib.import_module(module), class_name)
+                self.channels[name] = channel_cls(channel_config, self.bus, **extra)
+                logger.info("{} channel enabled", label)
             except ImportError as e:
-                logger.warning("Matrix channel not available: {}", e)
+                logger.warning("{} channel not available: {}", label, e)
 
         self._validate_allow_from()
 
@@ -173,6 +93,8 @@ class ChannelManager:
             return
 
         # Start outbound dispatcher
+        for outbox in self.outboxes.values():
+            outbox.start()
         self._dispatch_task = asyncio.create_task(self._dispatch_outbound())
 
         # Start channels
@@ -195,6 +117,7 @@ class ChannelManager:
                 await self._dispatch_task
             except asyncio.CancelledError:
                 pass
+        await asyncio.gather(*(outbox.stop() for outbox in self.outboxes.values()))
 
         # Stop all channels
         for name, channel in self.channels.items():
@@ -215,18 +138,19 @@ class ChannelManager:
                     timeout=1.0
                 )
 
-                if msg.metadata.get("_progress"):
+                if msg.metadata.get("_stream"):
+                    target = self.channels.get(msg.channel)
+                    if not (target and target.supports_streaming):
+                        continue
+                elif msg.metadata.get("_progress"):
                     if msg.metadata.get("_tool_hint") and not self.config.channels.send_tool_hints:
                         continue
                     if not msg.metadata.get("_tool_hint") and not self.config.channels.send_progress:
                         continue
 
-                channel = self.channels.get(msg.channel)
-                if channel:
-                    try:
-                        await channel.send(msg)
-                    except Exception as e:
-                        logger.error("Error sending to {}: {}", msg.channel, e)
+                outbox = self.outboxes.get(msg.channel)
+                if outbox:
+                    outbox.submit(msg)
                 else:
                     logger.warning("Unknown channel: {}", msg.channel)
 
@@ -244,7 +168,8 @@ class ChannelManager:
         return {
             name: {
                 "enabled": True,
-                "running": channel.is_running
+                "running": channel.is_running,
+                "outbound": self.outboxes[name].snapshot(),
             }
             for name, channel in self.channels.items()
         }
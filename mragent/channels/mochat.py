@@ -17,6 +17,7 @@ from mragent.bus.queue import MessageBus
 from mragent.channels.base import BaseChannel
 from mragent.config.schema import MochatConfig
 from mragent.utils.helpers import get_data_path
+from mragent.utils.http import get_http_client
 
 try:
     import socketio
@@ -255,7 +256,7 @@ class MochatChannel(BaseChannel):
             return
 
         self._running = True
-        self._http = httpx.AsyncClient(timeout=30.0)
+        self._http = get_http_client()
         self._state_dir.mkdir(parents=True, exist_ok=True)
         await self._load_session_cursors()
         self._seed_targets_from_config()
@@ -290,9 +291,7 @@ class MochatChannel(BaseChannel):
             self._cursor_save_task = None
         await self._save_session_cursors()
 
-        if self._http:
-            await self._http.aclose()
-            self._http = None
+        self._http = None  # Shared pooled client, closed at process shutdown
         self._ws_connected = self._ws_ready = False
 
     async def send(self, msg: OutboundMessage) -> None:
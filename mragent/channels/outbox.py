@@ -0,0 +1,132 @@
+"""Per-channel outbound queues so one slow channel cannot stall the others."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+import weakref
+import zlib
+from dataclasses import dataclass
+from typing import Any
+
+from loguru import logger
+
+from mragent.bus.events import OutboundMessage
+from mragent.channels.base import BaseChannel
+from mragent.utils import metrics
+
+_SENDS = metrics.counter("mragent_channel_sends_total", "Outbound messages by delivery outcome", ("channel", "outcome"))
+_SEND_SECONDS = metrics.histogram("mragent_channel_send_seconds", "Time to send one outbound message", ("channel",))
+_DEPTH = metrics.gauge("mragent_channel_outbox_depth", "Outbound messages waiting per channel", ("channel",))
+
+
+@dataclass
+class OutboxStats:
+    """Delivery counters for one channel."""
+
+    sent: int = 0
+    failed: int = 0
+    dropped: int = 0
+    send_seconds_total: float = 0.0
+    send_seconds_max: float = 0.0
+    wait_seconds_max: float = 0.0
+
+    def record(self, wait_s: float, send_s: float, ok: bool) -> None:
+        if ok:
+            self.sent += 1
+        else:
+            self.failed += 1
+        self.send_seconds_total += send_s
+        self.send_seconds_max = max(self.send_seconds_max, send_s)
+        self.wait_seconds_max = max(self.wait_seconds_max, wait_s)
+
+
+class ChannelOutbox:
+    """
+    Bounded outbound queue for a single channel, drained by its own workers.
+
+    With one lane (the default) messages are sent strictly in order. With more
+    lanes, messages are spread across lanes by chat_id: each chat keeps its
+    order, while different chats on the same channel are sent concurrently.
+    """
+
+    def __init__(self, channel: BaseChannel, maxsize: int = 1000, lanes: int = 1):
+        self.channel = channel
+        self.stats = OutboxStats()
+        self._queues: list[asyncio.Queue[tuple[float, OutboundMessage]]] = [
+            asyncio.Queue(maxsize=maxsize) for _ in range(max(1, lanes))
+        ]
+        self._workers: list[asyncio.Task] = []
+        self._sending = 0
+        ref = weakref.ref(self)
+        _DEPTH.set_function(lambda: (o := ref()) and o.depth or 0, channel=channel.name)
+
+    @property
+    def depth(self) -> int:
+        """Messages waiting to be sent across all lanes."""
+        return sum(q.qsize() for q in self._queues)
+
+    def start(self) -> None:
+        if not self._workers:
+            self._workers = [asyncio.create_task(self._work(q)) for q in self._queues]
+
+    async def stop(self, drain_timeout: float = 5.0) -> None:
+        """Send what is already queued, up to ``drain_timeout`` seconds, then stop the workers."""
+        if self._workers:
+            try:
+                await asyncio.wait_for(asyncio.gather(*(q.join() for q in self._queues)), drain_timeout)
+            except asyncio.TimeoutError:
+                dropped = self.depth + self._sending
+                self.stats.dropped += dropped
+                _SENDS.inc(dropped, channel=self.channel.name, outcome="dropped")
+                logger.warning("Outbound queue for {} not drained within {}s, dropping {} message(s)",
+                               self.channel.name, drain_timeout, dropped)
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    def submit(self, msg: OutboundMessage) -> bool:
+        """Queue a message without blocking. Returns False if the lane is full."""
+        lane = self._queues[zlib.crc32(str(msg.chat_id).encode()) % len(self._queues)]
+        try:
+            lane.put_nowait((time.monotonic(), msg))
+            return True
+        except asyncio.QueueFull:
+            self.stats.dropped += 1
+            _SENDS.inc(channel=self.channel.name, outcome="dropped")
+            logger.warning("Outbound queue for {} is full, dropping message to {}",
+                           self.channel.name, msg.chat_id)
+            return False
+
+    def snapshot(self) -> dict[str, Any]:
+        s = self.stats
+        done = s.sent + s.failed
+        return {
+            "queue_depth": self.depth,
+            "sent": s.sent,
+            "failed": s.failed,
+            "dropped": s.dropped,
+            "send_latency_avg_ms": round(s.send_seconds_total / done * 1000, 1) if done else 0.0,
+            "send_latency_max_ms": round(s.send_seconds_max * 1000, 1),
+            "queue_wait_max_ms": round(s.wait_seconds_max * 1000, 1),
+        }
+
+    async def _work(self, queue: asyncio.Queue[tuple[float, OutboundMessage]]) -> None:
+        while True:
+            queued_at, msg = await queue.get()
+            started = time.monotonic()
+            ok = True
+            self._sending += 1
+            try:
+                await self.channel.send(msg)
+            except Exception as e:
+                ok = False
+                logger.error("Error sending to {}: {}", msg.channel, e)
+            finally:
+                self._sending -= 1  # Cancelled sends are counted as dropped by stop()
+            send_s = time.monotonic() - started
+            self.stats.record(started - queued_at, send_s, ok)
+            _SEND_SECONDS.observe(send_s, channel=self.channel.name)
+            _SENDS.inc(channel=self.channel.name, outcome="sent" if ok else "failed")
+            queue.task_done()
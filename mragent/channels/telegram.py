@@ -90,6 +90,7 @@ class TelegramChannel(BaseChannel):
     """
 
     name = "telegram"
+    supports_streaming = True  # Partial replies are rendered as a message draft
 
     # Commands registered with Telegram's command menu
     BOT_COMMANDS = [
@@ -256,8 +257,13 @@ class TelegramChannel(BaseChannel):
         if msg.content and msg.content != "[empty message]":
             is_progress = msg.metadata.get("_progress", False)
             draft_id = msg.metadata.get("message_id")
+            chunks = split_message(msg.content, TELEGRAM_MAX_MESSAGE_LEN)
+            if msg.metadata.get("_stream"):
+                if not draft_id:
+                    return  # Without a draft every update would be a new message
+                chunks = chunks[-1:]  # The draft only needs to show the latest text
 
-            for chunk in split_message(msg.content, TELEGRAM_MAX_MESSAGE_LEN):
+            for chunk in chunks:
                 try:
                     html = _markdown_to_telegram_html(chunk)
                     if is_progress and draft_id:
@@ -6,6 +6,7 @@ import select
 import signal
 import sys
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 # Force UTF-8 encoding for Windows console
 if sys.platform == "win32":
@@ -20,19 +21,25 @@ if sys.platform == "win32":
             pass
 
 import typer
-from prompt_toolkit import PromptSession
-from prompt_toolkit.formatted_text import HTML
-from prompt_toolkit.history import FileHistory
-from prompt_toolkit.patch_stdout import patch_stdout
 from rich.console import Console
-from rich.markdown import Markdown
 from rich.table import Table
 from rich.text import Text
 
 from mragent import __logo__, __version__
-from mragent.config.schema import Config
 from mragent.utils.helpers import sync_workspace_templates
 
+if TYPE_CHECKING:
+    from prompt_toolkit import PromptSession
+    from prompt_toolkit.formatted_text import HTML
+    from prompt_toolkit.history import FileHistory
+    from prompt_toolkit.patch_stdout import patch_stdout
+
+    from mragent.config.schema import Config
+
+# Heavy dependencies (prompt_toolkit, LiteLLM, channel SDKs, the config
+# schema) are imported inside the commands that need them, so `mragent
+# --help` and one-shot `mragent agent -m` start quickly.
+
 app = typer.Typer(
     name="mragent",
     help=f"{__logo__} MRAgent - Free, Fast, Secure Personal AI Agent",
@@ -46,7 +53,8 @@ EXIT_COMMANDS = {"exit", "quit", "/exit", "/quit", ":q"}
 # CLI input: prompt_toolkit for editing, paste, history, and display
 # ---------------------------------------------------------------------------
 
-_PROMPT_SESSION: PromptSession | None = None
+_PROMPT_SESSION: "PromptSession | None" = None
+_PROMPT_TOOLKIT_NAMES = ("PromptSession", "HTML", "FileHistory", "patch_stdout")
 _SAVED_TERM_ATTRS = None  # original termios settings, restored on exit
 
 
@@ -88,9 +96,31 @@ def _restore_terminal() -> None:
         pass
 
 
+def _import_prompt_toolkit() -> None:
+    """Bind the prompt_toolkit names used here on first use; only interactive chat needs them."""
+    g = globals()
+    if all(name in g for name in _PROMPT_TOOLKIT_NAMES):
+        return
+    from prompt_toolkit import PromptSession
+    from prompt_toolkit.formatted_text import HTML
+    from prompt_toolkit.history import FileHistory
+    from prompt_toolkit.patch_stdout import patch_stdout
+
+    for name, value in zip(_PROMPT_TOOLKIT_NAMES, (PromptSession, HTML, FileHistory, patch_stdout)):
+        g.setdefault(name, value)  # Keep anything already set, e.g. by tests
+
+
+def __getattr__(name: str):
+    if name in _PROMPT_TOOLKIT_NAMES:
+        _import_prompt_toolkit()
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 def _init_prompt_session() -> None:
     """Create the prompt_toolkit session with persistent file history."""
     global _PROMPT_SESSION, _SAVED_TERM_ATTRS
+    _import_prompt_toolkit()
 
     # Save terminal state so we can restore it on exit
     try:
@@ -111,6 +141,8 @@ def _init_prompt_session() -> None:
 
 def _print_agent_response(response: str, render_markdown: bool) -> None:
     """Render assistant response with consistent terminal styling."""
+    from rich.markdown import Markdown
+
     content = response or ""
     body = Markdown(content) if render_markdown else Text(content)
     console.print()
@@ -134,6 +166,7 @@ async def _read_interactive_input_async() -> str:
     """
     if _PROMPT_SESSION is None:
         raise RuntimeError("Call _init_prompt_session() first")
+    _import_prompt_toolkit()
     try:
         with patch_stdout():
             return await _PROMPT_SESSION.prompt_async(
@@ -239,16 +272,102 @@ def setup():
 
 
 
-def _make_provider(config: Config):
+def _make_provider(config: "Config"):
     """Create the appropriate LLM provider from config."""
-    from mragent.providers.openai_codex_provider import OpenAICodexProvider
-
+    if config.providers.pool.backends:
+        return _make_pool_provider(config)
     model = config.agents.defaults.model
-    provider_name = config.get_provider_name(model)
-    p = config.get_provider(model)
+    name, p = config.get_provider_name(model), config.get_provider(model)
+    return _guarded(
+        _build_provider(model, name, p, config.get_api_base(model)),
+        p.rate_limit if p else None,
+        p.retry if p else None,
+        name or "default",
+    )
+
+
+def _guarded(provider, limits, retry, name: str):
+    """Wrap ``provider`` in retries and a circuit breaker around an adaptive rate limiter."""
+    from mragent.config.schema import RateLimitConfig, RetryConfig
+    from mragent.providers.limiter import AdaptiveLimiter, RateLimitedProvider
+    from mragent.providers.resilience import CircuitBreaker, ResilientProvider, RetryPolicy
+
+    limits = limits or RateLimitConfig()
+    retry = retry or RetryConfig()
+    limited = RateLimitedProvider(provider, AdaptiveLimiter(
+        name=name,
+        rpm=limits.rpm,
+        tpm=limits.tpm,
+        max_concurrency=limits.max_concurrency,
+        min_concurrency=limits.min_concurrency,
+    ))
+    return ResilientProvider(
+        limited,
+        RetryPolicy(
+            max_attempts=retry.max_attempts,
+            base_delay_s=retry.base_delay_s,
+            max_delay_s=retry.max_delay_s,
+            deadline_s=retry.deadline_s,
+        ),
+        CircuitBreaker(name=name, failure_threshold=retry.breaker_failures, reset_s=retry.breaker_reset_s),
+    )
 
+
+def _make_pool_provider(config: "Config"):
+    """Create a PoolProvider over the backends listed in providers.pool."""
+    from mragent.config.schema import ProviderConfig
+    from mragent.providers.pool import Backend, PoolProvider
+    from mragent.providers.registry import find_by_name
+
+    pool = config.providers.pool
+    backends = []
+    for i, b in enumerate(pool.backends):
+        model = b.model or config.agents.defaults.model
+        name = b.provider.replace("-", "_") or config.get_provider_name(model)
+        spec = find_by_name(name) if name else None
+        if b.provider and not spec:
+            console.print(f"[red]Error: Unknown provider in providers.pool: {b.provider}[/red]")
+            raise typer.Exit(1)
+        shared = getattr(config.providers, name, None) if spec else None
+        api_base = b.api_base or (shared.api_base if shared else None)
+        if not api_base and spec and spec.is_gateway:
+            api_base = spec.default_api_base
+        p = ProviderConfig(
+            api_key=b.api_key or (shared.api_key if shared else ""),
+            api_base=api_base,
+            extra_headers=shared.extra_headers if shared else None,
+        )
+        backend_name = f"{name or 'default'}[{i}]"
+        limits = b.rate_limit or (shared.rate_limit if shared else None)
+        retry = b.retry or (shared.retry if shared else None)
+        backends.append(Backend(
+            name=backend_name,
+            provider=_guarded(_build_provider(model, name, p, api_base), limits, retry, backend_name),
+            model=model,
+            weight=b.weight,
+        ))
+    return PoolProvider(
+        backends,
+        strategy=pool.strategy,
+        max_attempts=pool.max_attempts,
+        eject_after_failures=pool.eject_after_failures,
+        max_error_rate=pool.max_error_rate,
+        eject_s=pool.eject_s,
+        eject_max_s=pool.eject_max_s,
+        default_model=config.agents.defaults.model,
+    )
+
+
+def _build_provider(model: str, provider_name: str | None, p, api_base: str | None):
+    """
+    Create a single provider for ``model`` from its provider config ``p``.
+
+    Only the module of the chosen provider is imported, so LiteLLM is not
+    loaded unless the model is actually routed through it.
+    """
     # OpenAI Codex (OAuth)
     if provider_name == "openai_codex" or model.startswith("openai-codex/"):
+        from mragent.providers.openai_codex_provider import OpenAICodexProvider
         return OpenAICodexProvider(default_model=model)
 
     # Qwen Portal (secure Device Authorization Flow)
@@ -259,15 +378,14 @@ def _make_provider(config: Config):
     # Qwen OAuth (free browser-based, no API key)
 
     # Custom: direct OpenAI-compatible endpoint, bypasses LiteLLM
-    from mragent.providers.custom_provider import CustomProvider
     if provider_name == "custom":
+        from mragent.providers.custom_provider import CustomProvider
         return CustomProvider(
             api_key=p.api_key if p else "no-key",
-            api_base=config.get_api_base(model) or "http://localhost:8000/v1",
+            api_base=api_base or "http://localhost:8000/v1",
             default_model=model,
         )
 
-    from mragent.providers.litellm_provider import LiteLLMProvider
     from mragent.providers.registry import find_by_name
     spec = find_by_name(provider_name)
     if not model.startswith("bedrock/") and not (p and p.api_key) and not (spec and spec.is_oauth):
@@ -279,15 +397,50 @@ def _make_provider(config: Config):
         console.print("  • Groq LLM:   https://console.groq.com  (free tier)")
         raise typer.Exit(1)
 
+    from mragent.providers.litellm_provider import LiteLLMProvider
     return LiteLLMProvider(
         api_key=p.api_key if p else None,
-        api_base=config.get_api_base(model),
+        api_base=api_base,
         default_model=model,
         extra_headers=p.extra_headers if p else None,
         provider_name=provider_name,
     )
 
 
+def _make_agent_loop(config: "Config", bus, provider, cron, session_manager=None):
+    """Create the AgentLoop every command runs, configured from ``config``."""
+    from mragent.agent.loop import AgentLoop
+
+    defaults = config.agents.defaults
+    return AgentLoop(
+        bus=bus,
+        provider=provider,
+        workspace=config.workspace_path,
+        model=defaults.model,
+        temperature=defaults.temperature,
+        max_tokens=defaults.max_tokens,
+        max_iterations=defaults.max_tool_iterations,
+        memory_window=defaults.memory_window,
+        reasoning_effort=defaults.reasoning_effort,
+        brave_api_key=config.tools.web.search.api_key or None,
+        web_proxy=config.tools.web.proxy or None,
+        exec_config=config.tools.exec,
+        cron_service=cron,
+        restrict_to_workspace=config.tools.restrict_to_workspace,
+        session_manager=session_manager,
+        mcp_servers=config.tools.mcp_servers,
+        channels_config=config.channels,
+        max_concurrent_turns=defaults.max_concurrent_turns,
+        max_parallel_tools=defaults.max_parallel_tools,
+        history_max_tokens=defaults.history_max_tokens,
+        history_tokenizer=defaults.history_tokenizer,
+        memory_max_tokens=defaults.memory_max_tokens,
+        memory_top_k=defaults.memory_top_k,
+        memory_consolidation=defaults.memory_consolidation,
+        image_config=defaults.images,
+    )
+
+
 # ============================================================================
 # Gateway / Server
 # ============================================================================
@@ -301,14 +454,17 @@ def gateway(
     verbose: bool = typer.Option(False, "--verbose", "-v", help="Verbose output"),
 ):
     """Start the MRAgent gateway (channels: Telegram, Discord, WhatsApp, etc.)."""
-    from mragent.agent.loop import AgentLoop
+    from loguru import logger
+
     from mragent.bus.queue import MessageBus
     from mragent.channels.manager import ChannelManager
     from mragent.config.loader import load_config
     from mragent.cron.service import CronService
     from mragent.cron.types import CronJob
     from mragent.heartbeat.service import HeartbeatService
+    from mragent.providers.limiter import Priority, llm_priority
     from mragent.session.manager import SessionManager
+    from mragent.utils.http import close_http_clients
 
     if verbose:
         import logging
@@ -323,33 +479,21 @@ def gateway(
     sync_workspace_templates(config.workspace_path)
     bus = MessageBus()
     provider = _make_provider(config)
-    session_manager = SessionManager(config.workspace_path)
+    cache_cfg = config.gateway.session_cache
+    session_manager = SessionManager(
+        config.workspace_path,
+        max_cached_sessions=cache_cfg.max_sessions,
+        max_cached_messages=cache_cfg.max_messages,
+        idle_ttl_s=cache_cfg.idle_ttl_s or None,
+    )
 
     # Create cron service first (callback set after agent creation)
     # Use workspace path for per-instance cron store
     cron_store_path = config.workspace_path / "cron" / "jobs.json"
-    cron = CronService(cron_store_path)
+    cron = CronService(cron_store_path, max_concurrent_jobs=config.gateway.cron.max_concurrent_jobs)
 
     # Create agent with cron service
-    agent = AgentLoop(
-        bus=bus,
-        provider=provider,
-        workspace=config.workspace_path,
-        model=config.agents.defaults.model,
-        temperature=config.agents.defaults.temperature,
-        max_tokens=config.agents.defaults.max_tokens,
-        max_iterations=config.agents.defaults.max_tool_iterations,
-        memory_window=config.agents.defaults.memory_window,
-        reasoning_effort=config.agents.defaults.reasoning_effort,
-        brave_api_key=config.tools.web.search.api_key or None,
-        web_proxy=config.tools.web.proxy or None,
-        exec_config=config.tools.exec,
-        cron_service=cron,
-        restrict_to_workspace=config.tools.restrict_to_workspace,
-        session_manager=session_manager,
-        mcp_servers=config.tools.mcp_servers,
-        channels_config=config.channels,
-    )
+    agent = _make_agent_loop(config, bus, provider, cron, session_manager=session_manager)
 
     # Set cron callback (needs agent)
     async def on_cron_job(job: CronJob) -> str | None:
@@ -368,12 +512,13 @@ def gateway(
         if isinstance(cron_tool, CronTool):
             cron_token = cron_tool.set_cron_context(True)
         try:
-            response = await agent.process_direct(
-                reminder_note,
-                session_key=f"cron:{job.id}",
-                channel=job.payload.channel or "cli",
-                chat_id=job.payload.to or "direct",
-            )
+            with llm_priority(Priority.BACKGROUND):
+                response = await agent.process_direct(
+                    reminder_note,
+                    session_key=f"cron:{job.id}",
+                    channel=job.payload.channel or "cli",
+                    chat_id=job.payload.to or "direct",
+                )
         finally:
             if isinstance(cron_tool, CronTool) and cron_token is not None:
                 cron_tool.reset_cron_context(cron_token)
@@ -419,13 +564,14 @@ def gateway(
         async def _silent(*_args, **_kwargs):
             pass
 
-        return await agent.process_direct(
-            tasks,
-            session_key="heartbeat",
-            channel=channel,
-            chat_id=chat_id,
-            on_progress=_silent,
-        )
+        with llm_priority(Priority.BACKGROUND):
+            return await agent.process_direct(
+                tasks,
+                session_key="heartbeat",
+                channel=channel,
+                chat_id=chat_id,
+                on_progress=_silent,
+            )
 
     async def on_heartbeat_notify(response: str) -> None:
         """Deliver a heartbeat response to the user's channel."""
@@ -444,6 +590,7 @@ def gateway(
         on_notify=on_heartbeat_notify,
         interval_s=hb_cfg.interval_s,
         enabled=hb_cfg.enabled,
+        decision_max_age_s=hb_cfg.decision_max_age_s,
     )
 
     if channels.enabled_channels:
@@ -457,8 +604,19 @@ def gateway(
 
     console.print(f"[green]✓[/green] Heartbeat: every {hb_cfg.interval_s}s")
 
+    metrics_server = None
+    if config.gateway.metrics:
+        from mragent.web.metrics import MetricsServer
+        metrics_server = MetricsServer(config.gateway.metrics_host, port)
+        console.print(f"[green]✓[/green] Metrics: http://{config.gateway.metrics_host}:{port}/metrics")
+
     async def run():
         try:
+            if metrics_server:
+                try:
+                    await metrics_server.start()
+                except OSError as e:  # e.g. port in use; metrics are not worth stopping the gateway for
+                    logger.warning("Metrics endpoint not started: {}", e)
             await cron.start()
             await heartbeat.start()
             await asyncio.gather(
@@ -473,10 +631,97 @@ def gateway(
             cron.stop()
             agent.stop()
             await channels.stop_all()
+            if metrics_server:
+                await metrics_server.stop()
+            await close_http_clients()
+
+    asyncio.run(run())
+
+
+
+
+# ============================================================================
+# Daemon
+# ============================================================================
+
+
+@app.command()
+def daemon(
+    workspace: str | None = typer.Option(None, "--workspace", "-w", help="Workspace directory"),
+    config: str | None = typer.Option(None, "--config", "-c", help="Config file path"),
+):
+    """Keep a warm agent running so `mragent agent -m` calls return quickly."""
+    from mragent.bus.queue import MessageBus
+    from mragent.config.loader import load_config
+    from mragent.cron.service import CronService
+    from mragent.daemon.server import DaemonServer
+    from mragent.session.manager import SessionManager
+    from mragent.utils.http import close_http_clients
+
+    config_path = Path(config) if config else None
+    cfg = load_config(config_path)
+    if workspace:
+        cfg.agents.defaults.workspace = workspace
+
+    sync_workspace_templates(cfg.workspace_path)
+    bus = MessageBus()
+    provider = _make_provider(cfg)
+    cache_cfg = cfg.gateway.session_cache
+    session_manager = SessionManager(
+        cfg.workspace_path,
+        max_cached_sessions=cache_cfg.max_sessions,
+        max_cached_messages=cache_cfg.max_messages,
+        idle_ttl_s=cache_cfg.idle_ttl_s or None,
+    )
+
+    # Cron tool only: jobs go to the workspace store the gateway runs them from
+    cron_store_path = cfg.workspace_path / "cron" / "jobs.json"
+    cron = CronService(cron_store_path, max_concurrent_jobs=cfg.gateway.cron.max_concurrent_jobs)
+
+    agent_loop = _make_agent_loop(cfg, bus, provider, cron, session_manager=session_manager)
+    server = DaemonServer(agent_loop)
+
+    async def run():
+        try:
+            await server.start()
+        except (RuntimeError, OSError) as e:
+            console.print(f"[red]Error: {e}[/red]")
+            await close_http_clients()
+            raise typer.Exit(1)
+        console.print(f"{__logo__} Daemon listening on {server.socket_path}")
+        console.print(f"  Model: [cyan]{cfg.agents.defaults.model}[/cyan]")
+        console.print("  Press [bold]Ctrl+C[/bold] to quit\n")
+        try:
+            await agent_loop.run()  # Connects MCP servers up front
+        except KeyboardInterrupt:
+            console.print("\nShutting down...")
+        finally:
+            await server.stop()
+            await agent_loop.close_mcp()
+            agent_loop.stop()
+            await close_http_clients()
 
     asyncio.run(run())
 
 
+def _ask_daemon(message: str, session_id: str) -> str | None:
+    """Run a one-shot message in the daemon; None if no daemon is running."""
+    from mragent.daemon.client import DaemonUnavailableError, ask
+
+    async def _progress(content: str, *, tool_hint: bool = False) -> None:
+        console.print(f"  [dim]↳ {content}[/dim]")
+
+    async def run() -> str:
+        with console.status("[dim]mragent is thinking...[/dim]", spinner="dots"):
+            return await ask(message, session_id, on_progress=_progress)
+
+    try:
+        return asyncio.run(run())
+    except DaemonUnavailableError:
+        return None
+    except RuntimeError as e:
+        console.print(f"[red]Error from daemon: {e}[/red]")
+        raise typer.Exit(1)
 
 
 # ============================================================================
@@ -490,14 +735,22 @@ def agent(
     session_id: str = typer.Option("cli:direct", "--session", "-s", help="Session ID"),
     markdown: bool = typer.Option(True, "--markdown/--no-markdown", help="Render assistant output as Markdown"),
     logs: bool = typer.Option(False, "--logs/--no-logs", help="Show mragent runtime logs during chat"),
+    daemon: bool = typer.Option(True, "--daemon/--no-daemon", help="Send -m messages to a running `mragent daemon`"),
 ):
     """Interact with the agent directly."""
+    # Logs are printed by the daemon process, so --logs always runs in-process
+    if message and daemon and not logs:
+        response = _ask_daemon(message, session_id)
+        if response is not None:
+            _print_agent_response(response, render_markdown=markdown)
+            return
+
     from loguru import logger
 
-    from mragent.agent.loop import AgentLoop
     from mragent.bus.queue import MessageBus
     from mragent.config.loader import get_data_dir, load_config
     from mragent.cron.service import CronService
+    from mragent.utils.http import close_http_clients
 
     config = load_config()
     sync_workspace_templates(config.workspace_path)
@@ -507,31 +760,14 @@ def agent(
 
     # Create cron service for tool usage (no callback needed for CLI unless running)
     cron_store_path = get_data_dir() / "cron" / "jobs.json"
-    cron = CronService(cron_store_path)
+    cron = CronService(cron_store_path, max_concurrent_jobs=config.gateway.cron.max_concurrent_jobs)
 
     if logs:
         logger.enable("mragent")
     else:
         logger.disable("mragent")
 
-    agent_loop = AgentLoop(
-        bus=bus,
-        provider=provider,
-        workspace=config.workspace_path,
-        model=config.agents.defaults.model,
-        temperature=config.agents.defaults.temperature,
-        max_tokens=config.agents.defaults.max_tokens,
-        max_iterations=config.agents.defaults.max_tool_iterations,
-        memory_window=config.agents.defaults.memory_window,
-        reasoning_effort=config.agents.defaults.reasoning_effort,
-        brave_api_key=config.tools.web.search.api_key or None,
-        web_proxy=config.tools.web.proxy or None,
-        exec_config=config.tools.exec,
-        cron_service=cron,
-        restrict_to_workspace=config.tools.restrict_to_workspace,
-        mcp_servers=config.tools.mcp_servers,
-        channels_config=config.channels,
-    )
+    agent_loop = _make_agent_loop(config, bus, provider, cron)
 
     # Show spinner when logs are off (no output to miss); skip when logs are on
     def _thinking_ctx():
@@ -556,6 +792,7 @@ def agent(
                 response = await agent_loop.process_direct(message, session_id, on_progress=_cli_progress)
             _print_agent_response(response, render_markdown=markdown)
             await agent_loop.close_mcp()
+            await close_http_clients()
 
         asyncio.run(run_once())
     else:
@@ -595,7 +832,9 @@ def agent(
                 while True:
                     try:
                         msg = await asyncio.wait_for(bus.consume_outbound(), timeout=1.0)
-                        if msg.metadata.get("_progress"):
+                        if msg.metadata.get("_stream"):
+                            pass  # Partial replies can't be redrawn in place here
+                        elif msg.metadata.get("_progress"):
                             is_tool_hint = msg.metadata.get("_tool_hint", False)
                             ch = agent_loop.channels_config
                             if ch and is_tool_hint and not ch.send_tool_hints:
@@ -660,6 +899,7 @@ def agent(
                 outbound_task.cancel()
                 await asyncio.gather(bus_task, outbound_task, return_exceptions=True)
                 await agent_loop.close_mcp()
+                await close_http_clients()
 
         asyncio.run(run_interactive())
 
@@ -923,6 +1163,54 @@ def status():
                 has_key = bool(p.api_key)
                 console.print(f"{spec.label}: {'[green]✓[/green]' if has_key else '[dim]not set[/dim]'}")
 
+    from mragent.daemon.client import DaemonUnavailableError, ping
+    try:
+        info = asyncio.run(ping())
+        console.print(f"Daemon: [green]✓ pid {info.get('pid')}, up {info.get('uptime_s', 0):.0f}s[/green]")
+    except DaemonUnavailableError:
+        console.print("Daemon: [dim]not running[/dim]")
+
+
+@app.command()
+def usage(
+    by: str = typer.Option("model", "--by", help="Group by session, model or channel"),
+    limit: int = typer.Option(20, "--limit", "-n", help="Rows to show, largest first"),
+):
+    """Show token usage and prompt-cache hit rates recorded in sessions."""
+    from mragent.config.loader import load_config
+    from mragent.session.manager import SessionManager
+    from mragent.session.usage import cache_hit_rate, summarize
+
+    if by not in ("session", "model", "channel"):
+        console.print(f"[red]Unknown grouping: {by}[/red]  Use session, model or channel")
+        raise typer.Exit(1)
+
+    config = load_config()
+    summary = summarize(SessionManager(config.workspace_path).list_sessions())
+    groups = summary[f"by_{by}"]
+    if not groups:
+        console.print("No usage recorded yet.")
+        return
+
+    def _rate(u: dict) -> str:
+        rate = cache_hit_rate(u)
+        return "-" if rate is None else f"{rate:.0%}"
+
+    table = Table(title=f"Token usage by {by}")
+    table.add_column(by.capitalize(), style="cyan")
+    for column in ("Turns", "Requests", "Prompt", "Completion", "Cached", "Cache hit"):
+        table.add_column(column, justify="right")
+
+    rows = sorted(groups.items(), key=lambda kv: kv[1].get("total_tokens", 0), reverse=True)[:limit]
+    for i, (name, u) in enumerate([*rows, ("total", summary["total"])]):
+        table.add_row(
+            name, str(u.get("turns", 0)), str(u.get("requests", 0)),
+            f"{u.get('prompt_tokens', 0):,}", f"{u.get('completion_tokens', 0):,}",
+            f"{u.get('cached_tokens', 0):,}", _rate(u),
+            end_section=i == len(rows) - 1,
+        )
+    console.print(table)
+
 
 # ============================================================================
 # OAuth Login
@@ -1030,10 +1318,10 @@ def web(
     no_open: bool = typer.Option(False, "--no-open", help="Don't auto-open browser"),
 ):
     """Start the MRAgent web UI (dark chat interface on port 6326)."""
-    from mragent.agent.loop import AgentLoop
     from mragent.bus.queue import MessageBus
     from mragent.config.loader import load_config
     from mragent.cron.service import CronService
+    from mragent.utils.http import close_http_clients
     from mragent.web.server import WebServer
 
     config_path = Path(config) if config else None
@@ -1046,26 +1334,9 @@ def web(
     provider = _make_provider(cfg)
 
     cron_store_path = cfg.workspace_path / "cron" / "jobs.json"
-    cron = CronService(cron_store_path)
+    cron = CronService(cron_store_path, max_concurrent_jobs=cfg.gateway.cron.max_concurrent_jobs)
 
-    agent_loop = AgentLoop(
-        bus=bus,
-        provider=provider,
-        workspace=cfg.workspace_path,
-        model=cfg.agents.defaults.model,
-        temperature=cfg.agents.defaults.temperature,
-        max_tokens=cfg.agents.defaults.max_tokens,
-        max_iterations=cfg.agents.defaults.max_tool_iterations,
-        memory_window=cfg.agents.defaults.memory_window,
-        reasoning_effort=cfg.agents.defaults.reasoning_effort,
-        brave_api_key=cfg.tools.web.search.api_key or None,
-        web_proxy=cfg.tools.web.proxy or None,
-        exec_config=cfg.tools.exec,
-        cron_service=cron,
-        restrict_to_workspace=cfg.tools.restrict_to_workspace,
-        mcp_servers=cfg.tools.mcp_servers,
-        channels_config=cfg.channels,
-    )
+    agent_loop = _make_agent_loop(cfg, bus, provider, cron)
 
     groq_key = cfg.providers.groq.api_key or None
     web_server = WebServer(
@@ -1103,9 +1374,71 @@ def web(
             cron.stop()
             agent_loop.stop()
             await web_server.stop()
+            await close_http_clients()
 
     asyncio.run(run())
 
 
+# ============================================================================
+# Benchmark
+# ============================================================================
+
+
+@app.command()
+def bench(
+    chats: int = typer.Option(10, "--chats", help="Concurrent simulated chats"),
+    turns: int = typer.Option(5, "--turns", help="Turns per chat"),
+    latency_ms: float = typer.Option(50.0, "--latency-ms", help="Simulated LLM latency per call"),
+    tool_rounds: int = typer.Option(1, "--tool-rounds", help="Tool-calling LLM rounds per turn"),
+    tool_calls: int = typer.Option(1, "--tool-calls", help="Tool calls per round"),
+    response_chars: int = typer.Option(500, "--response-chars", help="Length of each final answer"),
+    concurrency: int = typer.Option(4, "--concurrency", help="Max turns processed at once"),
+    output: Path | None = typer.Option(None, "--output", "-o", help="Write the JSON result here"),
+    baseline: Path | None = typer.Option(None, "--baseline", "-b", help="Fail if worse than this JSON result"),
+    tolerance: float = typer.Option(0.2, "--tolerance", help="Allowed slowdown vs. baseline (0.2 = 20%)"),
+):
+    """Measure mragent's own overhead with a simulated LLM (no API calls)."""
+    import json
+
+    from loguru import logger
+
+    from mragent.bench import BenchConfig, compare, run_bench
+
+    logger.disable("mragent")
+    cfg = BenchConfig(
+        chats=chats, turns=turns, latency_ms=latency_ms, tool_rounds=tool_rounds,
+        tool_calls=tool_calls, response_chars=response_chars, max_concurrent_turns=concurrency,
+    )
+    console.print(f"{__logo__} Benchmarking {chats} chats x {turns} turns ({latency_ms:g} ms simulated latency)...")
+    result = asyncio.run(run_bench(cfg))
+
+    table = Table(title="Turn timings (ms)")
+    table.add_column("Metric", style="cyan")
+    for col in ("calls", "p50", "p99", "mean", "max"):
+        table.add_column(col, justify="right")
+    for label, stats in (("turn latency", result["latency_ms"]), ("turn overhead", result["overhead_ms"])):
+        table.add_row(label, str(result["turns"]), *(f"{stats[k]:.2f}" for k in ("p50", "p99", "mean", "max")))
+    for stage, stats in result["stages"].items():
+        table.add_row(stage, str(stats["calls"]), *(f"{stats[k]:.2f}" for k in ("p50", "p99", "mean", "max")))
+    console.print(table)
+    rss = result["peak_rss_mb"]
+    console.print(
+        f"Throughput: [bold]{result['throughput_turns_per_s']}[/bold] turns/s over {result['duration_s']}s"
+        + (f", peak RSS {rss} MB" if rss is not None else "")
+    )
+
+    if output:
+        output.write_text(json.dumps(result, indent=2), encoding="utf-8")
+        console.print(f"[green]✓[/green] Result written to {output}")
+    if baseline:
+        regressions = compare(result, json.loads(baseline.read_text(encoding="utf-8")), tolerance)
+        if regressions:
+            console.print(f"[red]Regressions vs {baseline}:[/red]")
+            for line in regressions:
+                console.print(f"  {line}")
+            raise typer.Exit(1)
+        console.print(f"[green]✓[/green] Within {tolerance:.0%} of {baseline}")
+
+
 if __name__ == "__main__":
     app()
@@ -206,6 +206,9 @@ class ChannelsConfig(Base):
 
     send_progress: bool = True  # stream agent's text progress to the channel
     send_tool_hints: bool = False  # stream tool-call hints (e.g. read_file("…"))
+    stream_responses: bool = False  # show replies as they are generated (channels that support it)
+    outbound_queue_size: int = 1000  # per-channel backlog before messages are dropped
+    outbound_lanes: int = 1  # >1 sends to different chats of one channel concurrently
     whatsapp: WhatsAppConfig = Field(default_factory=WhatsAppConfig)
     telegram: TelegramConfig = Field(default_factory=TelegramConfig)
     discord: DiscordConfig = Field(default_factory=DiscordConfig)
@@ -218,6 +221,21 @@ class ChannelsConfig(Base):
     matrix: MatrixConfig = Field(default_factory=MatrixConfig)
 
 
+class ImageLimitsConfig(Base):
+    """Size and quality attached images are reduced to."""
+
+    max_edge: int = 1568  # Longest side in pixels; larger images are downscaled (0 = keep size)
+    quality: int = 85  # JPEG quality when recompressing
+
+
+class ImageConfig(ImageLimitsConfig):
+    """How attached images are prepared for vision models (resizing needs Pillow)."""
+
+    models: dict[str, ImageLimitsConfig] = Field(default_factory=dict)  # Overrides, keyed by part of the model name
+    workers: int = 2  # Threads that encode images off the event loop
+    cache_mb: int = 64  # Encoded images kept in memory, keyed by content hash
+
+
 class AgentDefaults(Base):
     """Default agent configuration."""
 
@@ -231,6 +249,14 @@ class AgentDefaults(Base):
     max_tool_iterations: int = 40
     memory_window: int = 100
     reasoning_effort: str | None = None  # low / medium / high — enables LLM thinking mode
+    max_concurrent_turns: int = 4  # Turns processed in parallel across sessions (1 = fully serial)
+    max_parallel_tools: int = 4  # Read-only tool calls run concurrently within one LLM iteration
+    history_max_tokens: int = 32000  # Token budget for session history per call (0 = memoryWindow only)
+    history_tokenizer: str = "heuristic"  # "heuristic" (fast estimate) or "model" (litellm tokenizer)
+    memory_max_tokens: int = 2000  # Larger MEMORY.md files are cut to the facts relevant to each message (0 = all)
+    memory_top_k: int = 20  # Most relevant MEMORY.md facts considered per message
+    memory_consolidation: str = "patch"  # "patch" (LLM returns entry edits) or "rewrite" (LLM returns the whole file)
+    images: ImageConfig = Field(default_factory=ImageConfig)
 
 
 class AgentsConfig(Base):
@@ -239,12 +265,58 @@ class AgentsConfig(Base):
     defaults: AgentDefaults = Field(default_factory=AgentDefaults)
 
 
+class RateLimitConfig(Base):
+    """Client-side limits for one LLM backend."""
+
+    rpm: int = 0  # Requests per minute (0 = unlimited)
+    tpm: int = 0  # Estimated tokens per minute (0 = unlimited)
+    max_concurrency: int = 8  # Ceiling of the adaptive in-flight limit, which halves on 429/overload
+    min_concurrency: int = 1
+
+
+class RetryConfig(Base):
+    """Retries and circuit breaking for one LLM backend."""
+
+    max_attempts: int = 3  # Including the first; only transient failures (timeouts, 429, 5xx) are retried
+    base_delay_s: float = 0.5  # Backoff before the first retry; doubles each time, with full jitter
+    max_delay_s: float = 8.0
+    deadline_s: float = 300.0  # Time budget of one call across all attempts, not counting rate-limit queueing (0 = none)
+    breaker_failures: int = 5  # Consecutive transient failures that open the circuit
+    breaker_reset_s: float = 30.0  # How long an open circuit fails fast before a trial call
+
+
 class ProviderConfig(Base):
     """LLM provider configuration."""
 
     api_key: str = ""
     api_base: str | None = None
     extra_headers: dict[str, str] | None = None  # Custom headers (e.g. APP-Code for AiHubMix)
+    rate_limit: RateLimitConfig = Field(default_factory=RateLimitConfig)
+    retry: RetryConfig = Field(default_factory=RetryConfig)
+
+
+class PoolBackendConfig(Base):
+    """One backend of the provider pool: a provider, key and model."""
+
+    provider: str = ""  # Registry name, e.g. "openrouter" (empty = matched from the model)
+    model: str = ""  # Empty = agents.defaults.model
+    api_key: str = ""  # Empty = the key configured under providers.<provider>
+    api_base: str | None = None
+    weight: int = 1  # Relative share of requests under round_robin
+    rate_limit: RateLimitConfig | None = None  # Empty = the limits of providers.<provider>
+    retry: RetryConfig | None = None  # Empty = the retry settings of providers.<provider>
+
+
+class ProviderPoolConfig(Base):
+    """Spread requests over several backends and route around unhealthy ones."""
+
+    backends: list[PoolBackendConfig] = Field(default_factory=list)  # Empty = no pool, one provider
+    strategy: Literal["round_robin", "least_outstanding"] = "round_robin"
+    max_attempts: int = 2  # Backends tried per request before returning the error
+    eject_after_failures: int = 3  # Consecutive failures that take a backend out of rotation
+    max_error_rate: float = 0.5  # ... or this share of failures among its recent requests
+    eject_s: float = 30.0  # First ejection; doubles after each failed probe
+    eject_max_s: float = 600.0
 
 
 class ProvidersConfig(Base):
@@ -270,6 +342,7 @@ class ProvidersConfig(Base):
     # MRAgent additions
     nvidia_nim: ProviderConfig = Field(default_factory=ProviderConfig)  # NVIDIA NIM (free credits at build.nvidia.com)
     qwen_oauth: ProviderConfig = Field(default_factory=ProviderConfig)  # Qwen OAuth (free ~2000 req/day, no API key)
+    pool: ProviderPoolConfig = Field(default_factory=ProviderPoolConfig)  # Load balancing over several backends
 
 
 class HeartbeatConfig(Base):
@@ -277,6 +350,7 @@ class HeartbeatConfig(Base):
 
     enabled: bool = True
     interval_s: int = 30 * 60  # 30 minutes
+    decision_max_age_s: int = 2 * 60 * 60  # Re-ask about an unchanged HEARTBEAT.md after this long (0 = every tick)
 
 
 class WebUIConfig(Base):
@@ -287,6 +361,20 @@ class WebUIConfig(Base):
     auto_open: bool = True  # Open browser automatically
 
 
+class SessionCacheConfig(Base):
+    """In-memory session cache bounds."""
+
+    max_sessions: int = 256  # LRU bound on cached sessions
+    max_messages: int = 50_000  # Bound on total messages held across cached sessions
+    idle_ttl_s: int = 60 * 60  # Drop sessions untouched for this long (0 = never)
+
+
+class CronConfig(Base):
+    """Cron job execution limits."""
+
+    max_concurrent_jobs: int = 4  # Cron runs allowed at once across all jobs
+
+
 class GatewayConfig(Base):
     """Gateway/server configuration."""
 
@@ -294,6 +382,10 @@ class GatewayConfig(Base):
     port: int = 18790
     heartbeat: HeartbeatConfig = Field(default_factory=HeartbeatConfig)
     web: WebUIConfig = Field(default_factory=WebUIConfig)
+    session_cache: SessionCacheConfig = Field(default_factory=SessionCacheConfig)
+    cron: CronConfig = Field(default_factory=CronConfig)
+    metrics: bool = False  # Serve Prometheus metrics at http://metricsHost:port/metrics (unauthenticated)
+    metrics_host: str = "127.0.0.1"  # Interface for the metrics endpoint; not gateway.host, to stay local by default
 
 
 class WebSearchConfig(Base):
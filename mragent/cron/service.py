@@ -1,9 +1,13 @@
 """Cron service for scheduling agent tasks."""
 
 import asyncio
+import heapq
 import json
+import os
 import time
 import uuid
+import weakref
+from collections import deque
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Callable, Coroutine
@@ -11,6 +15,14 @@ from typing import Any, Callable, Coroutine
 from loguru import logger
 
 from mragent.cron.types import CronJob, CronJobState, CronPayload, CronSchedule, CronStore
+from mragent.utils import metrics
+
+_RUNS = metrics.counter("mragent_cron_runs_total", "Cron job runs by result", ("status",))
+_RUN_SECONDS = metrics.histogram("mragent_cron_run_seconds", "Cron job run duration")
+_LATENESS_SECONDS = metrics.histogram(
+    "mragent_cron_lateness_seconds", "Delay between a cron run's scheduled and actual start",
+)
+_RUNNING = metrics.gauge("mragent_cron_running_jobs", "Cron runs in progress")
 
 
 def _now_ms() -> int:
@@ -60,126 +72,285 @@ def _validate_schedule_for_add(schedule: CronSchedule) -> None:
             raise ValueError(f"unknown timezone '{schedule.tz}'") from None
 
 
+def _job_to_dict(j: CronJob) -> dict[str, Any]:
+    return {
+        "id": j.id,
+        "name": j.name,
+        "enabled": j.enabled,
+        "schedule": {
+            "kind": j.schedule.kind,
+            "atMs": j.schedule.at_ms,
+            "everyMs": j.schedule.every_ms,
+            "expr": j.schedule.expr,
+            "tz": j.schedule.tz,
+        },
+        "payload": {
+            "kind": j.payload.kind,
+            "message": j.payload.message,
+            "deliver": j.payload.deliver,
+            "channel": j.payload.channel,
+            "to": j.payload.to,
+        },
+        "state": _state_to_dict(j.state),
+        "createdAtMs": j.created_at_ms,
+        "updatedAtMs": j.updated_at_ms,
+        "deleteAfterRun": j.delete_after_run,
+        "maxConcurrency": j.max_concurrency,
+        "overlap": j.overlap,
+        "misfire": j.misfire,
+    }
+
+
+def _state_to_dict(state: CronJobState) -> dict[str, Any]:
+    return {
+        "nextRunAtMs": state.next_run_at_ms,
+        "lastRunAtMs": state.last_run_at_ms,
+        "lastStatus": state.last_status,
+        "lastError": state.last_error,
+        "lastDurationMs": state.last_duration_ms,
+        "lastLatenessMs": state.last_lateness_ms,
+    }
+
+
+def _state_from_dict(data: dict[str, Any]) -> CronJobState:
+    return CronJobState(
+        next_run_at_ms=data.get("nextRunAtMs"),
+        last_run_at_ms=data.get("lastRunAtMs"),
+        last_status=data.get("lastStatus"),
+        last_error=data.get("lastError"),
+        last_duration_ms=data.get("lastDurationMs"),
+        last_lateness_ms=data.get("lastLatenessMs"),
+    )
+
+
+def _job_from_dict(j: dict[str, Any]) -> CronJob:
+    return CronJob(
+        id=j["id"],
+        name=j["name"],
+        enabled=j.get("enabled", True),
+        schedule=CronSchedule(
+            kind=j["schedule"]["kind"],
+            at_ms=j["schedule"].get("atMs"),
+            every_ms=j["schedule"].get("everyMs"),
+            expr=j["schedule"].get("expr"),
+            tz=j["schedule"].get("tz"),
+        ),
+        payload=CronPayload(
+            kind=j["payload"].get("kind", "agent_turn"),
+            message=j["payload"].get("message", ""),
+            deliver=j["payload"].get("deliver", False),
+            channel=j["payload"].get("channel"),
+            to=j["payload"].get("to"),
+        ),
+        state=_state_from_dict(j.get("state", {})),
+        created_at_ms=j.get("createdAtMs", 0),
+        updated_at_ms=j.get("updatedAtMs", 0),
+        delete_after_run=j.get("deleteAfterRun", False),
+        max_concurrency=j.get("maxConcurrency", 1),
+        overlap=j.get("overlap", "skip"),
+        misfire=j.get("misfire", "run_once"),
+    )
+
+
 class CronService:
-    """Service for managing and executing scheduled jobs."""
+    """
+    Service for managing and executing scheduled jobs.
+
+    Jobs are persisted as a jobs.json snapshot plus an append-only journal
+    (jobs.journal, one JSON record per line). Each change appends a single
+    record: "upsert" (a whole job), "state" (a job's run state) or "remove".
+    Loading replays the journal over the snapshot. Once ``compact_every``
+    records have piled up, the snapshot is rewritten and the journal emptied.
+    Writes by other processes (e.g. the CLI) are picked up by replaying
+    whatever was appended since the last read.
+
+    Due times are kept in a min-heap of (next_run_at_ms, job_id). Changing a
+    job pushes a new entry; outdated entries are discarded when they reach
+    the top, so scheduling costs O(log n) per change instead of a full scan.
+
+    Due jobs run as concurrent tasks, at most ``max_concurrent_jobs`` at a
+    time. Each job's ``max_concurrency``/``overlap`` decide what happens when
+    it comes due while still running, and ``misfire`` decides what to do with
+    runs missed while the service was down.
+    """
+
+    _MAX_PENDING_RUNS = 20  # Bound on queued/caught-up runs per job
 
     def __init__(
         self,
         store_path: Path,
-        on_job: Callable[[CronJob], Coroutine[Any, Any, str | None]] | None = None
+        on_job: Callable[[CronJob], Coroutine[Any, Any, str | None]] | None = None,
+        compact_every: int = 200,
+        max_concurrent_jobs: int = 4,
     ):
         self.store_path = store_path
+        self.journal_path = store_path.with_suffix(".journal")
         self.on_job = on_job
+        self.compact_every = compact_every
         self._store: CronStore | None = None
-        self._last_mtime: float = 0.0
+        self._jobs: dict[str, CronJob] = {}
+        self._heap: list[tuple[int, str]] = []
+        self._snapshot_sig: tuple[int, int] | None = None  # (mtime_ns, size) of jobs.json we last saw
+        self._journal_pos = 0  # Bytes of the journal already applied
+        self._journal_records = 0
         self._timer_task: asyncio.Task | None = None
         self._running = False
+        self._slots = asyncio.Semaphore(max(1, max_concurrent_jobs))
+        self._runs: dict[str, list[asyncio.Task]] = {}  # job_id -> in-flight runs, oldest first
+        self._pending: dict[str, deque[int]] = {}  # job_id -> scheduled times waiting to run
+        ref = weakref.ref(self)
+        _RUNNING.set_function(lambda: (s := ref()) and sum(len(r) for r in s._runs.values()) or 0)
+
+    # ---------- Persistence ----------
+
+    @staticmethod
+    def _file_sig(path: Path) -> tuple[int, int] | None:
+        try:
+            st = path.stat()
+            return st.st_mtime_ns, st.st_size
+        except OSError:
+            return None
 
     def _load_store(self) -> CronStore:
-        """Load jobs from disk. Reloads automatically if file was modified externally."""
-        if self._store and self.store_path.exists():
-            mtime = self.store_path.stat().st_mtime
-            if mtime != self._last_mtime:
+        """Load jobs from disk, or catch up with changes made by other processes."""
+        if self._store is not None:
+            if self._file_sig(self.store_path) != self._snapshot_sig:
                 logger.info("Cron: jobs.json modified externally, reloading")
                 self._store = None
-        if self._store:
+            else:
+                journal = self._file_sig(self.journal_path)
+                size = journal[1] if journal else 0
+                if size < self._journal_pos:
+                    self._store = None  # Compacted elsewhere
+                elif size > self._journal_pos:
+                    self._replay_journal()
+        if self._store is not None:
             return self._store
 
-        if self.store_path.exists():
+        self._store = CronStore()
+        self._jobs = {}
+        self._journal_pos = self._journal_records = 0
+        self._snapshot_sig = self._file_sig(self.store_path)
+        if self._snapshot_sig:
             try:
                 data = json.loads(self.store_path.read_text(encoding="utf-8"))
-                jobs = []
+                self._store.version = data.get("version", 1)
                 for j in data.get("jobs", []):
-                    jobs.append(CronJob(
-                        id=j["id"],
-                        name=j["name"],
-                        enabled=j.get("enabled", True),
-                        schedule=CronSchedule(
-                            kind=j["schedule"]["kind"],
-                            at_ms=j["schedule"].get("atMs"),
-                            every_ms=j["schedule"].get("everyMs"),
-                            expr=j["schedule"].get("expr"),
-                            tz=j["schedule"].get("tz"),
-                        ),
-                        payload=CronPayload(
-                            kind=j["payload"].get("kind", "agent_turn"),
-                            message=j["payload"].get("message", ""),
-                            deliver=j["payload"].get("deliver", False),
-                            channel=j["payload"].get("channel"),
-                            to=j["payload"].get("to"),
-                        ),
-                        state=CronJobState(
-                            next_run_at_ms=j.get("state", {}).get("nextRunAtMs"),
-                            last_run_at_ms=j.get("state", {}).get("lastRunAtMs"),
-                            last_status=j.get("state", {}).get("lastStatus"),
-                            last_error=j.get("state", {}).get("lastError"),
-                        ),
-                        created_at_ms=j.get("createdAtMs", 0),
-                        updated_at_ms=j.get("updatedAtMs", 0),
-                        delete_after_run=j.get("deleteAfterRun", False),
-                    ))
-                self._store = CronStore(jobs=jobs)
+                    job = _job_from_dict(j)
+                    self._jobs[job.id] = job
             except Exception as e:
                 logger.warning("Failed to load cron store: {}", e)
-                self._store = CronStore()
-        else:
-            self._store = CronStore()
-
+                self._jobs = {}
+        self._replay_journal()
+        self._rebuild_heap()
         return self._store
 
+    def _replay_journal(self) -> None:
+        """Apply journal records appended since the last read."""
+        try:
+            with open(self.journal_path, "rb") as f:
+                f.seek(self._journal_pos)
+                data = f.read()
+        except OSError:
+            return
+        end = data.rfind(b"\n") + 1  # Leave a partially written last line for later
+        for line in data[:end].splitlines():
+            try:
+                self._apply(json.loads(line))
+            except Exception as e:
+                logger.warning("Cron: skipping bad journal record: {}", e)
+            self._journal_records += 1
+        self._journal_pos += end
+
+    def _apply(self, record: dict[str, Any]) -> None:
+        op, job_id = record.get("op"), record.get("id")
+        if op == "upsert":
+            job = _job_from_dict(record["job"])
+            self._jobs[job.id] = job
+            self._push(job)
+        elif op == "remove":
+            self._jobs.pop(job_id, None)
+        elif op == "state" and job_id in self._jobs:
+            job = self._jobs[job_id]
+            job.enabled = record.get("enabled", job.enabled)
+            job.updated_at_ms = record.get("updatedAtMs", job.updated_at_ms)
+            job.state = _state_from_dict(record.get("state", {}))
+            self._push(job)
+
+    def _append(self, record: dict[str, Any]) -> None:
+        """Journal one change, compacting the store when the journal gets long."""
+        self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+        journal = self._file_sig(self.journal_path)
+        if journal and journal[1] > self._journal_pos:
+            self._replay_journal()  # Don't skip over another process's records
+        with open(self.journal_path, "ab") as f:
+            f.write(json.dumps(record, ensure_ascii=False).encode("utf-8") + b"\n")
+            self._journal_pos = f.tell()
+        self._journal_records += 1
+        if self._journal_records >= self.compact_every:
+            self._save_store()
+
     def _save_store(self) -> None:
-        """Save jobs to disk."""
-        if not self._store:
+        """Write a full snapshot and empty the journal."""
+        if self._store is None:
             return
 
         self.store_path.parent.mkdir(parents=True, exist_ok=True)
+        data = {"version": self._store.version, "jobs": [_job_to_dict(j) for j in self._jobs.values()]}
+        tmp = self.store_path.with_suffix(".json.tmp")
+        tmp.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, self.store_path)
+        self._snapshot_sig = self._file_sig(self.store_path)
+        # The snapshot already contains every journaled change, so replaying a
+        # journal left behind by a crash right here would be harmless.
+        if self.journal_path.exists():
+            self.journal_path.write_bytes(b"")
+        self._journal_pos = self._journal_records = 0
+
+    def _save_job(self, job: CronJob) -> None:
+        self._append({"op": "upsert", "id": job.id, "job": _job_to_dict(job)})
+
+    def _save_state(self, job: CronJob) -> None:
+        self._append({
+            "op": "state", "id": job.id, "enabled": job.enabled,
+            "updatedAtMs": job.updated_at_ms, "state": _state_to_dict(job.state),
+        })
+
+    # ---------- Scheduling ----------
+
+    def _push(self, job: CronJob) -> None:
+        if job.enabled and job.state.next_run_at_ms:
+            heapq.heappush(self._heap, (job.state.next_run_at_ms, job.id))
+
+    def _rebuild_heap(self) -> None:
+        self._heap = [
+            (j.state.next_run_at_ms, j.id) for j in self._jobs.values()
+            if j.enabled and j.state.next_run_at_ms
+        ]
+        heapq.heapify(self._heap)
 
-        data = {
-            "version": self._store.version,
-            "jobs": [
-                {
-                    "id": j.id,
-                    "name": j.name,
-                    "enabled": j.enabled,
-                    "schedule": {
-                        "kind": j.schedule.kind,
-                        "atMs": j.schedule.at_ms,
-                        "everyMs": j.schedule.every_ms,
-                        "expr": j.schedule.expr,
-                        "tz": j.schedule.tz,
-                    },
-                    "payload": {
-                        "kind": j.payload.kind,
-                        "message": j.payload.message,
-                        "deliver": j.payload.deliver,
-                        "channel": j.payload.channel,
-                        "to": j.payload.to,
-                    },
-                    "state": {
-                        "nextRunAtMs": j.state.next_run_at_ms,
-                        "lastRunAtMs": j.state.last_run_at_ms,
-                        "lastStatus": j.state.last_status,
-                        "lastError": j.state.last_error,
-                    },
-                    "createdAtMs": j.created_at_ms,
-                    "updatedAtMs": j.updated_at_ms,
-                    "deleteAfterRun": j.delete_after_run,
-                }
-                for j in self._store.jobs
-            ]
-        }
+    def _is_current(self, entry: tuple[int, str]) -> bool:
+        job = self._jobs.get(entry[1])
+        return bool(job and job.enabled and job.state.next_run_at_ms == entry[0])
+
+    def _peek(self) -> tuple[int, str] | None:
+        """Earliest current heap entry, dropping outdated ones on the way."""
+        while self._heap and not self._is_current(self._heap[0]):
+            heapq.heappop(self._heap)
+        return self._heap[0] if self._heap else None
 
-        self.store_path.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
-        self._last_mtime = self.store_path.stat().st_mtime
-    
     async def start(self) -> None:
         """Start the cron service."""
         self._running = True
         self._load_store()
-        self._recompute_next_runs()
+        misfired = self._recompute_next_runs()
         self._save_store()
+        for job, missed in misfired:
+            logger.info("Cron: job '{}' missed {} run(s) while stopped", job.name, len(missed))
+            self._pending.setdefault(job.id, deque()).extend(missed[1:])
+            self._dispatch(job, missed[0])
         self._arm_timer()
-        logger.info("Cron service started with {} jobs", len(self._store.jobs if self._store else []))
+        logger.info("Cron service started with {} jobs", len(self._jobs))
 
     def stop(self) -> None:
         """Stop the cron service."""
@@ -187,23 +358,41 @@ class CronService:
         if self._timer_task:
             self._timer_task.cancel()
             self._timer_task = None
+        for tasks in self._runs.values():
+            for task in tasks:
+                task.cancel()
+        self._pending.clear()
 
-    def _recompute_next_runs(self) -> None:
-        """Recompute next run times for all enabled jobs."""
-        if not self._store:
-            return
+    def _recompute_next_runs(self) -> list[tuple[CronJob, list[int]]]:
+        """Recompute next run times for all enabled jobs; return runs missed per misfire policy."""
         now = _now_ms()
-        for job in self._store.jobs:
-            if job.enabled:
-                job.state.next_run_at_ms = _compute_next_run(job.schedule, now)
+        misfired = []
+        for job in self._jobs.values():
+            if not job.enabled:
+                continue
+            last_due = job.state.next_run_at_ms
+            job.state.next_run_at_ms = _compute_next_run(job.schedule, now)
+            if last_due and last_due <= now and job.misfire != "skip":
+                if job.misfire == "catch_up":
+                    misfired.append((job, self._missed_runs(job.schedule, last_due, now)))
+                else:
+                    misfired.append((job, [last_due]))
+        self._rebuild_heap()
+        return misfired
+
+    def _missed_runs(self, schedule: CronSchedule, first_ms: int, now_ms: int) -> list[int]:
+        missed = [first_ms]
+        while len(missed) < self._MAX_PENDING_RUNS:
+            nxt = _compute_next_run(schedule, missed[-1])
+            if not nxt or nxt > now_ms:
+                break
+            missed.append(nxt)
+        return missed
 
     def _get_next_wake_ms(self) -> int | None:
         """Get the earliest next run time across all jobs."""
-        if not self._store:
-            return None
-        times = [j.state.next_run_at_ms for j in self._store.jobs
-                 if j.enabled and j.state.next_run_at_ms]
-        return min(times) if times else None
+        top = self._peek()
+        return top[0] if top else None
 
     def _arm_timer(self) -> None:
         """Schedule the next timer tick."""
@@ -224,63 +413,120 @@ class CronService:
 
         self._timer_task = asyncio.create_task(tick())
 
+    def _pop_due(self, now: int) -> list[CronJob]:
+        due: dict[str, CronJob] = {}  # A job can have duplicate entries after a replay
+        while (top := self._peek()) and top[0] <= now:
+            heapq.heappop(self._heap)
+            due[top[1]] = self._jobs[top[1]]
+        return list(due.values())
+
     async def _on_timer(self) -> None:
-        """Handle timer tick - run due jobs."""
+        """Handle timer tick - start due jobs without waiting for them."""
         self._load_store()
-        if not self._store:
-            return
 
         now = _now_ms()
-        due_jobs = [
-            j for j in self._store.jobs
-            if j.enabled and j.state.next_run_at_ms and now >= j.state.next_run_at_ms
-        ]
+        for job in self._pop_due(now):
+            scheduled_ms = job.state.next_run_at_ms or now
+            # Schedule the following run up front so a long run can't delay it
+            job.state.next_run_at_ms = _compute_next_run(job.schedule, now)
+            self._push(job)
+            self._dispatch(job, scheduled_ms)
 
-        for job in due_jobs:
-            await self._execute_job(job)
-
-        self._save_store()
         self._arm_timer()
 
-    async def _execute_job(self, job: CronJob) -> None:
-        """Execute a single job."""
+    def _dispatch(self, job: CronJob, scheduled_ms: int) -> None:
+        """Start a run of a due job, applying its overlap policy."""
+        runs = self._runs.setdefault(job.id, [])
+        if len(runs) >= max(1, job.max_concurrency):
+            if job.overlap == "queue" or self._pending.get(job.id):
+                pending = self._pending.setdefault(job.id, deque())
+                if len(pending) < self._MAX_PENDING_RUNS:
+                    pending.append(scheduled_ms)
+                return
+            if job.overlap == "replace":
+                logger.info("Cron: job '{}' still running, replacing the oldest run", job.name)
+                runs.pop(0).cancel()
+            else:
+                logger.info("Cron: job '{}' still running, skipping this run", job.name)
+                job.state.last_status = "skipped"
+                _RUNS.inc(status="skipped")
+                self._save_state(job)
+                return
+
+        task = asyncio.create_task(self._run(job, scheduled_ms))
+        runs.append(task)
+        task.add_done_callback(lambda t: self._on_run_done(job, t))
+
+    async def _run(self, job: CronJob, scheduled_ms: int) -> None:
+        async with self._slots:
+            await self._execute_job(job, scheduled_ms)
+
+    def _on_run_done(self, job: CronJob, task: asyncio.Task) -> None:
+        runs = self._runs.get(job.id, [])
+        if task in runs:
+            runs.remove(task)
+        if not runs:
+            self._runs.pop(job.id, None)
+        pending = self._pending.get(job.id)
+        if pending and self._running and job.id in self._jobs:
+            self._dispatch(job, pending.popleft())
+        if not pending:
+            self._pending.pop(job.id, None)
+
+    async def _execute_job(self, job: CronJob, scheduled_ms: int | None = None) -> None:
+        """Execute a single job. Manual runs (no scheduled_ms) also reschedule the job."""
         start_ms = _now_ms()
         logger.info("Cron: executing job '{}' ({})", job.name, job.id)
 
         try:
-            response = None
             if self.on_job:
-                response = await self.on_job(job)
+                await self.on_job(job)
 
             job.state.last_status = "ok"
             job.state.last_error = None
             logger.info("Cron: job '{}' completed", job.name)
 
+        except asyncio.CancelledError:
+            job.state.last_status = "error"
+            job.state.last_error = "cancelled"
+            raise
         except Exception as e:
             job.state.last_status = "error"
             job.state.last_error = str(e)
             logger.error("Cron: job '{}' failed: {}", job.name, e)
-
-        job.state.last_run_at_ms = start_ms
-        job.updated_at_ms = _now_ms()
-
+        finally:
+            job.state.last_run_at_ms = start_ms
+            job.state.last_duration_ms = _now_ms() - start_ms
+            job.state.last_lateness_ms = max(0, start_ms - scheduled_ms) if scheduled_ms else None
+            _RUNS.inc(status=job.state.last_status)
+            _RUN_SECONDS.observe(job.state.last_duration_ms / 1000)
+            if job.state.last_lateness_ms is not None:
+                _LATENESS_SECONDS.observe(job.state.last_lateness_ms / 1000)
+            job.updated_at_ms = _now_ms()
+            self._finish_run(job, reschedule=scheduled_ms is None)
+
+    def _finish_run(self, job: CronJob, reschedule: bool) -> None:
+        if job.id not in self._jobs:
+            return  # Removed while it was running
         # Handle one-shot jobs
         if job.schedule.kind == "at":
             if job.delete_after_run:
-                self._store.jobs = [j for j in self._store.jobs if j.id != job.id]
-            else:
-                job.enabled = False
-                job.state.next_run_at_ms = None
-        else:
-            # Compute next run
+                self._jobs.pop(job.id, None)
+                self._append({"op": "remove", "id": job.id})
+                return
+            job.enabled = False
+            job.state.next_run_at_ms = None
+        elif reschedule:
             job.state.next_run_at_ms = _compute_next_run(job.schedule, _now_ms())
+            self._push(job)
+        self._save_state(job)
 
     # ========== Public API ==========
 
     def list_jobs(self, include_disabled: bool = False) -> list[CronJob]:
         """List all jobs."""
-        store = self._load_store()
-        jobs = store.jobs if include_disabled else [j for j in store.jobs if j.enabled]
+        self._load_store()
+        jobs = [j for j in self._jobs.values() if include_disabled or j.enabled]
         return sorted(jobs, key=lambda j: j.state.next_run_at_ms or float('inf'))
 
     def add_job(
@@ -292,9 +538,12 @@ class CronService:
         channel: str | None = None,
         to: str | None = None,
         delete_after_run: bool = False,
+        max_concurrency: int = 1,
+        overlap: str = "skip",
+        misfire: str = "run_once",
     ) -> CronJob:
         """Add a new job."""
-        store = self._load_store()
+        self._load_store()
         _validate_schedule_for_add(schedule)
         now = _now_ms()
 
@@ -314,10 +563,14 @@ class CronService:
             created_at_ms=now,
             updated_at_ms=now,
             delete_after_run=delete_after_run,
+            max_concurrency=max_concurrency,
+            overlap=overlap,
+            misfire=misfire,
         )
 
-        store.jobs.append(job)
-        self._save_store()
+        self._jobs[job.id] = job
+        self._push(job)
+        self._save_job(job)
         self._arm_timer()
 
         logger.info("Cron: added job '{}' ({})", name, job.id)
@@ -325,13 +578,11 @@ class CronService:
 
     def remove_job(self, job_id: str) -> bool:
         """Remove a job by ID."""
-        store = self._load_store()
-        before = len(store.jobs)
-        store.jobs = [j for j in store.jobs if j.id != job_id]
-        removed = len(store.jobs) < before
+        self._load_store()
+        removed = self._jobs.pop(job_id, None) is not None
 
         if removed:
-            self._save_store()
+            self._append({"op": "remove", "id": job_id})
             self._arm_timer()
             logger.info("Cron: removed job {}", job_id)
 
@@ -339,38 +590,38 @@ class CronService:
 
     def enable_job(self, job_id: str, enabled: bool = True) -> CronJob | None:
         """Enable or disable a job."""
-        store = self._load_store()
-        for job in store.jobs:
-            if job.id == job_id:
-                job.enabled = enabled
-                job.updated_at_ms = _now_ms()
-                if enabled:
-                    job.state.next_run_at_ms = _compute_next_run(job.schedule, _now_ms())
-                else:
-                    job.state.next_run_at_ms = None
-                self._save_store()
-                self._arm_timer()
-                return job
-        return None
+        self._load_store()
+        job = self._jobs.get(job_id)
+        if not job:
+            return None
+        job.enabled = enabled
+        job.updated_at_ms = _now_ms()
+        if enabled:
+            job.state.next_run_at_ms = _compute_next_run(job.schedule, _now_ms())
+            self._push(job)
+        else:
+            job.state.next_run_at_ms = None
+        self._save_state(job)
+        self._arm_timer()
+        return job
 
     async def run_job(self, job_id: str, force: bool = False) -> bool:
         """Manually run a job."""
-        store = self._load_store()
-        for job in store.jobs:
-            if job.id == job_id:
-                if not force and not job.enabled:
-                    return False
-                await self._execute_job(job)
-                self._save_store()
-                self._arm_timer()
-                return True
-        return False
+        self._load_store()
+        job = self._jobs.get(job_id)
+        if not job or (not force and not job.enabled):
+            return False
+        await self._execute_job(job)
+        self._arm_timer()
+        return True
 
     def status(self) -> dict:
         """Get service status."""
-        store = self._load_store()
+        self._load_store()
         return {
             "enabled": self._running,
-            "jobs": len(store.jobs),
+            "jobs": len(self._jobs),
+            "running": sum(len(r) for r in self._runs.values()),
+            "queued": sum(len(p) for p in self._pending.values()),
             "next_wake_at_ms": self._get_next_wake_ms(),
         }
@@ -3,6 +3,9 @@
 from dataclasses import dataclass, field
 from typing import Literal
 
+OverlapPolicy = Literal["skip", "queue", "replace"]
+MisfirePolicy = Literal["run_once", "catch_up", "skip"]
+
 
 @dataclass
 class CronSchedule:
@@ -36,6 +39,8 @@ class CronJobState:
     last_run_at_ms: int | None = None
     last_status: Literal["ok", "error", "skipped"] | None = None
     last_error: str | None = None
+    last_duration_ms: int | None = None  # How long the last run took
+    last_lateness_ms: int | None = None  # How long after its scheduled time the last run started
 
 
 @dataclass
@@ -50,6 +55,14 @@ class CronJob:
     created_at_ms: int = 0
     updated_at_ms: int = 0
     delete_after_run: bool = False
+    # Runs of this job allowed at the same time
+    max_concurrency: int = 1
+    # When a run is due while max_concurrency runs are still going:
+    # "skip" it, "queue" it until one finishes, or "replace" the oldest run
+    overlap: OverlapPolicy = "skip"
+    # Runs missed while the service was down: "run_once", "catch_up" (each
+    # missed run, up to a limit) or "skip"
+    misfire: MisfirePolicy = "run_once"
 
 
 @dataclass
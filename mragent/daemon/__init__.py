@@ -0,0 +1,6 @@
+"""Resident agent process serving CLI requests over a Unix socket."""
+
+from mragent.daemon.client import DaemonUnavailableError, ask, default_socket_path, ping
+from mragent.daemon.server import DaemonServer
+
+__all__ = ["DaemonServer", "DaemonUnavailableError", "ask", "default_socket_path", "ping"]
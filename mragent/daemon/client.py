@@ -0,0 +1,115 @@
+"""Thin client for a running ``mragent daemon``.
+
+The protocol is one JSON object per line. The client sends a single request
+and reads events until the reply:
+
+  → {"type": "chat", "content": "...", "session": "cli:direct"}
+  ← {"type": "progress", "content": "...", "tool_hint": false}   (zero or more)
+  ← {"type": "keepalive"}   (every KEEPALIVE_S while the turn runs)
+  ← {"type": "reply", "content": "..."} | {"type": "error", "content": "..."}
+
+  → {"type": "ping"}
+  ← {"type": "pong", "pid": 1234, "model": "...", "uptime_s": 12.5}
+
+This module is imported on every ``mragent agent -m`` call, so it only uses
+the standard library.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from pathlib import Path
+from typing import Any, Awaitable, Callable
+
+STREAM_LIMIT = 16 * 1024 * 1024  # Max bytes per line; a reply is one line
+KEEPALIVE_S = 10.0  # How often the daemon signals that a turn is still running
+IDLE_TIMEOUT_S = 60.0  # Silence after which the client gives up on a stuck daemon
+
+
+class DaemonUnavailableError(ConnectionError):
+    """No daemon is listening; the caller should run the request in-process."""
+
+
+def default_socket_path() -> Path:
+    """~/.mragent/daemon.sock"""
+    from mragent.utils.helpers import get_data_path
+    return get_data_path() / "daemon.sock"
+
+
+async def _request(socket_path: Path | None, request: dict[str, Any]):
+    path = socket_path or default_socket_path()
+    if not hasattr(asyncio, "open_unix_connection"):
+        raise DaemonUnavailableError("Unix sockets are not supported on this platform")
+    try:
+        reader, writer = await asyncio.open_unix_connection(str(path), limit=STREAM_LIMIT)
+    except OSError as e:  # Missing socket file, or a stale one nobody listens on
+        raise DaemonUnavailableError(f"no daemon at {path}: {e}") from e
+    writer.write(json.dumps(request, ensure_ascii=False).encode("utf-8") + b"\n")
+    await writer.drain()
+    return reader, writer
+
+
+def _decode(line: bytes) -> dict[str, Any]:
+    try:
+        event = json.loads(line)
+    except ValueError as e:
+        raise RuntimeError(f"malformed message from daemon: {e}") from e
+    if not isinstance(event, dict):
+        raise RuntimeError(f"malformed message from daemon: {line[:80]!r}")
+    return event
+
+
+async def ask(
+    content: str,
+    session: str = "cli:direct",
+    *,
+    socket_path: Path | None = None,
+    on_progress: Callable[..., Awaitable[None]] | None = None,
+    idle_timeout: float = IDLE_TIMEOUT_S,
+) -> str:
+    """Run one agent turn in the daemon and return the reply.
+
+    Raises DaemonUnavailableError only if the request never reached a daemon. Once
+    it has, failures are raised as RuntimeError: the turn may have run, and
+    repeating it in-process could repeat its tool calls. That includes a daemon
+    that sends nothing, not even a keepalive, for ``idle_timeout`` seconds.
+    """
+    reader, writer = await _request(socket_path, {"type": "chat", "content": content, "session": session})
+    try:
+        while True:
+            try:
+                line = await asyncio.wait_for(reader.readline(), idle_timeout)
+            except asyncio.TimeoutError as e:
+                raise RuntimeError(f"daemon sent nothing for {idle_timeout:g}s") from e
+            if not line:
+                break
+            event = _decode(line)
+            kind = event.get("type")
+            if kind == "progress":
+                if on_progress:
+                    await on_progress(event.get("content", ""), tool_hint=event.get("tool_hint", False))
+            elif kind == "reply":
+                return event.get("content", "")
+            elif kind == "error":
+                raise RuntimeError(event.get("content") or "daemon error")
+        raise RuntimeError("daemon closed the connection before replying")
+    finally:
+        writer.close()
+
+
+async def ping(socket_path: Path | None = None, timeout: float = 2.0) -> dict[str, Any]:
+    """Daemon pid, model and uptime; raises DaemonUnavailableError if none is running."""
+    reader, writer = await _request(socket_path, {"type": "ping"})
+    try:
+        line = await asyncio.wait_for(reader.readline(), timeout)
+    except asyncio.TimeoutError as e:
+        raise DaemonUnavailableError(f"daemon did not answer within {timeout:g}s") from e
+    finally:
+        writer.close()
+    if not line:
+        raise DaemonUnavailableError("daemon closed the connection")
+    try:
+        return _decode(line)
+    except RuntimeError as e:
+        raise DaemonUnavailableError(str(e)) from e
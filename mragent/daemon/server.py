@@ -0,0 +1,137 @@
+"""Unix-socket server keeping one AgentLoop warm between CLI calls.
+
+A one-shot ``mragent agent -m`` otherwise pays for imports, provider setup,
+MCP connections and session loading on every call. The daemon does that
+once; each request is then just an agent turn. See client.py for the
+protocol.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from loguru import logger
+
+from mragent.daemon.client import (
+    KEEPALIVE_S,
+    STREAM_LIMIT,
+    DaemonUnavailableError,
+    default_socket_path,
+    ping,
+)
+
+if TYPE_CHECKING:
+    from mragent.agent.loop import AgentLoop
+
+
+class DaemonServer:
+    """Serves agent turns to local clients; the socket is only accessible to the current user."""
+
+    def __init__(self, agent: "AgentLoop", socket_path: Path | None = None):
+        self.agent = agent
+        self.socket_path = socket_path or default_socket_path()
+        self.started_at = time.monotonic()
+        self._server: asyncio.AbstractServer | None = None
+        self._drain_task: asyncio.Task | None = None
+
+    async def start(self) -> None:
+        """Listen on the socket. Raises RuntimeError if another daemon already does."""
+        if self.socket_path.exists():
+            try:
+                info = await ping(self.socket_path)
+            except DaemonUnavailableError:
+                self.socket_path.unlink()  # Left behind by a daemon that did not shut down cleanly
+            else:
+                raise RuntimeError(f"a daemon (pid {info.get('pid')}) is already listening on {self.socket_path}")
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        old_umask = os.umask(0o177)
+        try:
+            self._server = await asyncio.start_unix_server(self._handle, str(self.socket_path), limit=STREAM_LIMIT)
+        finally:
+            os.umask(old_umask)
+        self._drain_task = asyncio.create_task(self._drain_outbound())
+        logger.info("Daemon listening on {}", self.socket_path)
+
+    async def stop(self) -> None:
+        if self._drain_task:
+            self._drain_task.cancel()
+            self._drain_task = None
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+            self.socket_path.unlink(missing_ok=True)
+
+    async def _drain_outbound(self) -> None:
+        """Drop bus messages (e.g. from the message tool): there is no channel to deliver them to."""
+        while True:
+            msg = await self.agent.bus.consume_outbound()
+            logger.debug("Daemon dropped outbound message for {}:{}", msg.channel, msg.chat_id)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        async def send(event: dict[str, Any]) -> None:
+            if writer.is_closing():
+                return  # Client went away; the turn still runs to completion and is saved
+            writer.write(json.dumps(event, ensure_ascii=False).encode("utf-8") + b"\n")
+            try:
+                await writer.drain()
+            except ConnectionError:
+                pass
+
+        try:
+            line = await reader.readline()
+            if not line:
+                return
+            try:
+                request = json.loads(line)
+            except json.JSONDecodeError:
+                await send({"type": "error", "content": "Invalid JSON"})
+                return
+            if request.get("type") == "ping":
+                await send({
+                    "type": "pong",
+                    "pid": os.getpid(),
+                    "model": self.agent.model,
+                    "uptime_s": round(time.monotonic() - self.started_at, 1),
+                })
+            elif request.get("type") == "chat":
+                await self._chat(request, send)
+            else:
+                await send({"type": "error", "content": f"Unknown request type: {request.get('type')!r}"})
+        finally:
+            writer.close()
+
+    async def _chat(self, request: dict[str, Any], send) -> None:
+        ch = self.agent.channels_config
+
+        async def _progress(content: str, *, tool_hint: bool = False) -> None:
+            if ch and tool_hint and not ch.send_tool_hints:
+                return
+            if ch and not tool_hint and not ch.send_progress:
+                return
+            await send({"type": "progress", "content": content, "tool_hint": tool_hint})
+
+        async def _keepalive() -> None:
+            while True:
+                await asyncio.sleep(KEEPALIVE_S)
+                await send({"type": "keepalive"})
+
+        keepalive = asyncio.create_task(_keepalive())
+        try:
+            response = await self.agent.process_direct(
+                request.get("content") or "",
+                session_key=request.get("session") or "cli:direct",
+                on_progress=_progress,
+            )
+        except Exception as e:
+            logger.exception("Daemon request failed")
+            await send({"type": "error", "content": str(e)})
+        else:
+            await send({"type": "reply", "content": response or ""})
+        finally:
+            keepalive.cancel()
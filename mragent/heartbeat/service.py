@@ -3,14 +3,23 @@
 from __future__ import annotations
 
 import asyncio
+import hashlib
+import json
+import time
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, Callable, Coroutine
 
 from loguru import logger
 
+from mragent.providers.limiter import Priority, llm_priority
+from mragent.utils import metrics
+
 if TYPE_CHECKING:
     from mragent.providers.base import LLMProvider
 
+_TICKS = metrics.counter("mragent_heartbeat_ticks_total", "Heartbeat ticks by result", ("result",))
+_DECISION_SECONDS = metrics.histogram("mragent_heartbeat_decision_seconds", "Heartbeat decision LLM call latency")
+
 _HEARTBEAT_TOOL = [
     {
         "type": "function",
@@ -48,6 +57,13 @@ class HeartbeatService:
     Phase 2 (execution): only triggered when Phase 1 returns ``run``.  The
     ``on_execute`` callback runs the task through the full agent loop and
     returns the result to deliver.
+
+    A ``skip`` decision is remembered (in ``.heartbeat_state.json`` in the
+    workspace) together with a hash of HEARTBEAT.md, so later ticks skip
+    Phase 1 until the file changes or the decision is older than
+    ``decision_max_age_s``. The age limit matters for time-dependent tasks
+    ("at 9am ...", "on Mondays ..."), which a cached skip would otherwise
+    never revisit; 0 disables the cache and asks on every tick.
     """
 
     def __init__(
@@ -59,6 +75,7 @@ class HeartbeatService:
         on_notify: Callable[[str], Coroutine[Any, Any, None]] | None = None,
         interval_s: int = 30 * 60,
         enabled: bool = True,
+        decision_max_age_s: int = 2 * 60 * 60,
     ):
         self.workspace = workspace
         self.provider = provider
@@ -67,13 +84,46 @@ class HeartbeatService:
         self.on_notify = on_notify
         self.interval_s = interval_s
         self.enabled = enabled
+        self.decision_max_age_s = decision_max_age_s
         self._running = False
         self._task: asyncio.Task | None = None
+        self._state: dict[str, Any] | None = None
 
     @property
     def heartbeat_file(self) -> Path:
         return self.workspace / "HEARTBEAT.md"
 
+    @property
+    def state_file(self) -> Path:
+        return self.workspace / ".heartbeat_state.json"
+
+    def _decision_key(self, content: str) -> str:
+        return hashlib.sha256(f"{self.model}\n{content}".encode("utf-8")).hexdigest()
+
+    def _load_state(self) -> dict[str, Any]:
+        if self._state is None:
+            try:
+                self._state = json.loads(self.state_file.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                self._state = {}
+        return self._state
+
+    def _save_state(self, state: dict[str, Any]) -> None:
+        self._state = state
+        try:
+            self.state_file.write_text(json.dumps(state), encoding="utf-8")
+        except OSError as e:
+            logger.warning("Heartbeat: failed to save decision cache: {}", e)
+
+    def _is_cached_skip(self, key: str) -> bool:
+        """True if this exact HEARTBEAT.md was last judged 'skip' and that is still fresh."""
+        if self.decision_max_age_s <= 0:
+            return False
+        state = self._load_state()
+        if state.get("skip_key") != key:
+            return False
+        return time.time() - state.get("decided_at", 0) < self.decision_max_age_s
+
     def _read_heartbeat_file(self) -> str | None:
         if self.heartbeat_file.exists():
             try:
@@ -87,23 +137,29 @@ class HeartbeatService:
 
         Returns (action, tasks) where action is 'skip' or 'run'.
         """
-        response = await self.provider.chat(
-            messages=[
-                {"role": "system", "content": "You are a heartbeat agent. Call the heartbeat tool to report your decision."},
-                {"role": "user", "content": (
-                    "Review the following HEARTBEAT.md and decide whether there are active tasks.\n\n"
-                    f"{content}"
-                )},
-            ],
-            tools=_HEARTBEAT_TOOL,
-            model=self.model,
-        )
+        action, tasks, _ = await self._query_decision(content)
+        return action, tasks
+
+    async def _query_decision(self, content: str) -> tuple[str, str, bool]:
+        """Like _decide, plus whether the LLM actually called the tool (vs. error/no answer)."""
+        with llm_priority(Priority.MAINTENANCE):
+            response = await self.provider.chat(
+                messages=[
+                    {"role": "system", "content": "You are a heartbeat agent. Call the heartbeat tool to report your decision."},
+                    {"role": "user", "content": (
+                        "Review the following HEARTBEAT.md and decide whether there are active tasks.\n\n"
+                        f"{content}"
+                    )},
+                ],
+                tools=_HEARTBEAT_TOOL,
+                model=self.model,
+            )
 
         if not response.has_tool_calls:
-            return "skip", ""
+            return "skip", "", False
 
         args = response.tool_calls[0].arguments
-        return args.get("action", "skip"), args.get("tasks", "")
+        return args.get("action", "skip"), args.get("tasks", ""), True
 
     async def start(self) -> None:
         """Start the heartbeat service."""
@@ -144,16 +200,29 @@ class HeartbeatService:
             logger.debug("Heartbeat: HEARTBEAT.md missing or empty")
             return
 
+        key = self._decision_key(content)
+        if self._is_cached_skip(key):
+            logger.debug("Heartbeat: HEARTBEAT.md unchanged since last skip")
+            _TICKS.inc(result="cached_skip")
+            return
+
         logger.info("Heartbeat: checking for tasks...")
 
         try:
-            action, tasks = await self._decide(content)
+            with _DECISION_SECONDS.time():
+                action, tasks, answered = await self._query_decision(content)
 
             if action != "run":
+                if answered:  # Don't let a failed call pin a skip until the file changes
+                    self._save_state({"skip_key": key, "decided_at": time.time()})
                 logger.info("Heartbeat: OK (nothing to report)")
+                _TICKS.inc(result="skip")
                 return
+            if self._load_state():
+                self._save_state({})
 
             logger.info("Heartbeat: tasks found, executing...")
+            _TICKS.inc(result="run")
             if self.on_execute:
                 response = await self.on_execute(tasks)
                 if response and self.on_notify:
@@ -161,9 +230,10 @@ class HeartbeatService:
                     await self.on_notify(response)
         except Exception:
             logger.exception("Heartbeat execution failed")
+            _TICKS.inc(result="error")
 
     async def trigger_now(self) -> str | None:
-        """Manually trigger a heartbeat."""
+        """Manually trigger a heartbeat (always asks the LLM, ignoring the decision cache)."""
         content = self._read_heartbeat_file()
         if not content:
             return None
@@ -1,7 +1,33 @@
-"""LLM provider abstraction module."""
+"""LLM provider abstraction module.
 
-from mragent.providers.base import LLMProvider, LLMResponse
-from mragent.providers.litellm_provider import LiteLLMProvider
-from mragent.providers.openai_codex_provider import OpenAICodexProvider
+Provider classes are imported on first access: LiteLLM alone takes seconds
+to import, and most processes only ever build one provider.
+"""
 
-__all__ = ["LLMProvider", "LLMResponse", "LiteLLMProvider", "OpenAICodexProvider"]
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
+from mragent.providers.base import LLMProvider, LLMResponse, StreamChunk
+
+if TYPE_CHECKING:
+    from mragent.providers.litellm_provider import LiteLLMProvider
+    from mragent.providers.openai_codex_provider import OpenAICodexProvider
+    from mragent.providers.pool import PoolProvider
+
+_LAZY = {
+    "LiteLLMProvider": "mragent.providers.litellm_provider",
+    "OpenAICodexProvider": "mragent.providers.openai_codex_provider",
+    "PoolProvider": "mragent.providers.pool",
+}
+
+__all__ = ["LLMProvider", "LLMResponse", "StreamChunk", "LiteLLMProvider", "OpenAICodexProvider", "PoolProvider"]
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY:
+        value = getattr(importlib.import_module(_LAZY[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,8 +1,10 @@
 """Base LLM provider interface."""
 
+import time
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
-from typing import Any
+from email.utils import parsedate_to_datetime
+from typing import Any, AsyncIterator
 
 
 @dataclass
@@ -22,6 +24,10 @@ class LLMResponse:
     usage: dict[str, int] = field(default_factory=dict)
     reasoning_content: str | None = None  # Kimi, DeepSeek-R1 etc.
     thinking_blocks: list[dict] | None = None  # Anthropic extended thinking
+    status_code: int | None = None  # HTTP status of a failed call, when known
+    retry_after: float | None = None  # Seconds the provider asked us to wait before retrying
+    retryable: bool | None = None  # Provider's own verdict on retrying a failure (None = judge by status)
+    model: str | None = None  # Model that served the call, if not the one requested (e.g. a pool backend's)
     
     @property
     def has_tool_calls(self) -> bool:
@@ -29,6 +35,97 @@ class LLMResponse:
         return len(self.tool_calls) > 0
 
 
+class ProviderHTTPError(RuntimeError):
+    """A provider API answered with a non-success HTTP status."""
+
+    def __init__(self, message: str, status_code: int, headers: Any = None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.headers = headers or {}
+
+
+def _parse_retry_after(value: Any) -> float | None:
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(str(value)).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def error_info(e: BaseException) -> dict[str, Any]:
+    """
+    ``status_code`` and ``retry_after`` of a failed provider call, read from
+    the exception (httpx, openai and LiteLLM errors carry the HTTP response),
+    as keyword arguments for an error LLMResponse.
+    """
+    response = getattr(e, "response", None)
+    status = getattr(e, "status_code", None) or getattr(response, "status_code", None)
+    headers = getattr(e, "headers", None) or getattr(response, "headers", None) or {}
+    retry_after = None
+    try:
+        if (ms := headers.get("retry-after-ms")) is not None:
+            retry_after = _parse_retry_after(ms)
+            retry_after = retry_after / 1000 if retry_after is not None else None
+        if retry_after is None:
+            retry_after = _parse_retry_after(headers.get("retry-after") or headers.get("Retry-After"))
+    except AttributeError:
+        pass
+    return {"status_code": status if isinstance(status, int) else None, "retry_after": retry_after}
+
+
+def _int(value: Any) -> int:
+    try:
+        return int(value or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def normalize_usage(raw: Any) -> dict[str, int]:
+    """
+    Token counts from an OpenAI, Anthropic (via LiteLLM) or Responses API
+    usage object or dict. ``cached_tokens`` / ``cache_creation_tokens`` are
+    only present when the provider reports them, zero included.
+    """
+    if not raw:
+        return {}
+
+    def get(obj: Any, key: str) -> Any:
+        return obj.get(key) if isinstance(obj, dict) else getattr(obj, key, None)
+
+    prompt = _int(get(raw, "prompt_tokens") or get(raw, "input_tokens"))
+    completion = _int(get(raw, "completion_tokens") or get(raw, "output_tokens"))
+    usage = {
+        "prompt_tokens": prompt,
+        "completion_tokens": completion,
+        "total_tokens": _int(get(raw, "total_tokens")) or prompt + completion,
+    }
+    details = get(raw, "prompt_tokens_details") or get(raw, "input_tokens_details")
+    # A reported 0 is kept: it means the prompt cache missed, which is worth seeing
+    cached = [v for v in (get(details, "cached_tokens") if details else None, get(raw, "cache_read_input_tokens"))
+              if v is not None]
+    if cached:
+        usage["cached_tokens"] = max(_int(v) for v in cached)
+    if (created := get(raw, "cache_creation_input_tokens")) is not None:
+        usage["cache_creation_tokens"] = _int(created)
+    return usage
+
+
+@dataclass
+class StreamChunk:
+    """One increment of a streamed response.
+
+    Intermediate chunks carry a text ``delta``; the last chunk carries the
+    fully assembled ``response`` (content, tool calls, usage).
+    """
+    delta: str = ""
+    response: LLMResponse | None = None
+
+
 class LLMProvider(ABC):
     """
     Abstract base class for LLM providers.
@@ -112,6 +209,30 @@ class LLMProvider(ABC):
         """
         pass
 
+    async def chat_stream(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+        reasoning_effort: str | None = None,
+    ) -> AsyncIterator[StreamChunk]:
+        """
+        Stream a chat completion.
+
+        Yields text deltas as they arrive, then a final chunk whose
+        ``response`` holds the assembled result. Providers without native
+        streaming fall back to ``chat()`` and yield the content in one piece.
+        """
+        response = await self.chat(
+            messages=messages, tools=tools, model=model, max_tokens=max_tokens,
+            temperature=temperature, reasoning_effort=reasoning_effort,
+        )
+        if response.content and response.finish_reason != "error":
+            yield StreamChunk(delta=response.content)
+        yield StreamChunk(response=response)
+
     @abstractmethod
     def get_default_model(self) -> str:
         """Get the default model for this provider."""
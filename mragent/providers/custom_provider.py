@@ -3,12 +3,19 @@
 from __future__ import annotations
 
 import uuid
-from typing import Any
+from typing import Any, AsyncIterator
 
 import json_repair
 from openai import AsyncOpenAI
 
-from mragent.providers.base import LLMProvider, LLMResponse, ToolCallRequest
+from mragent.providers.base import (
+    LLMProvider,
+    LLMResponse,
+    StreamChunk,
+    ToolCallRequest,
+    error_info,
+    normalize_usage,
+)
 
 
 class CustomProvider(LLMProvider):
@@ -23,9 +30,9 @@ class CustomProvider(LLMProvider):
             default_headers={"x-session-affinity": uuid.uuid4().hex},
         )
 
-    async def chat(self, messages: list[dict[str, Any]], tools: list[dict[str, Any]] | None = None,
-                   model: str | None = None, max_tokens: int = 4096, temperature: float = 0.7,
-                   reasoning_effort: str | None = None) -> LLMResponse:
+    def _build_kwargs(self, messages: list[dict[str, Any]], tools: list[dict[str, Any]] | None,
+                      model: str | None, max_tokens: int, temperature: float,
+                      reasoning_effort: str | None) -> dict[str, Any]:
         kwargs: dict[str, Any] = {
             "model": model or self.default_model,
             "messages": self._sanitize_empty_content(messages),
@@ -36,10 +43,57 @@ class CustomProvider(LLMProvider):
             kwargs["reasoning_effort"] = reasoning_effort
         if tools:
             kwargs.update(tools=tools, tool_choice="auto")
+        return kwargs
+
+    async def chat(self, messages: list[dict[str, Any]], tools: list[dict[str, Any]] | None = None,
+                   model: str | None = None, max_tokens: int = 4096, temperature: float = 0.7,
+                   reasoning_effort: str | None = None) -> LLMResponse:
+        kwargs = self._build_kwargs(messages, tools, model, max_tokens, temperature, reasoning_effort)
         try:
             return self._parse(await self._client.chat.completions.create(**kwargs))
         except Exception as e:
-            return LLMResponse(content=f"Error: {e}", finish_reason="error")
+            return LLMResponse(content=f"Error: {e}", finish_reason="error", **error_info(e))
+
+    async def chat_stream(self, messages: list[dict[str, Any]], tools: list[dict[str, Any]] | None = None,
+                          model: str | None = None, max_tokens: int = 4096, temperature: float = 0.7,
+                          reasoning_effort: str | None = None) -> AsyncIterator[StreamChunk]:
+        kwargs = self._build_kwargs(messages, tools, model, max_tokens, temperature, reasoning_effort)
+        kwargs.update(stream=True, stream_options={"include_usage": True})
+        content: list[str] = []
+        reasoning: list[str] = []
+        calls: dict[int, dict[str, str]] = {}  # index -> {id, name, arguments}
+        finish_reason, usage = "stop", None
+        try:
+            async for chunk in await self._client.chat.completions.create(**kwargs):
+                usage = chunk.usage or usage
+                for choice in chunk.choices or []:
+                    delta = choice.delta
+                    finish_reason = choice.finish_reason or finish_reason
+                    if text := getattr(delta, "reasoning_content", None):
+                        reasoning.append(text)
+                    if delta.content:
+                        content.append(delta.content)
+                        yield StreamChunk(delta=delta.content)
+                    for tc in delta.tool_calls or []:
+                        buf = calls.setdefault(tc.index, {"id": "", "name": "", "arguments": ""})
+                        buf["id"] = tc.id or buf["id"]
+                        if tc.function:
+                            buf["name"] += tc.function.name or ""
+                            buf["arguments"] += tc.function.arguments or ""
+        except Exception as e:
+            yield StreamChunk(response=LLMResponse(content=f"Error: {e}", finish_reason="error", **error_info(e)))
+            return
+        yield StreamChunk(response=LLMResponse(
+            content="".join(content) or None,
+            tool_calls=[
+                ToolCallRequest(id=b["id"] or uuid.uuid4().hex[:9], name=b["name"],
+                                arguments=json_repair.loads(b["arguments"] or "{}"))
+                for _, b in sorted(calls.items())
+            ],
+            finish_reason=finish_reason,
+            usage=normalize_usage(usage),
+            reasoning_content="".join(reasoning) or None,
+        ))
 
     def _parse(self, response: Any) -> LLMResponse:
         choice = response.choices[0]
@@ -49,10 +103,9 @@ class CustomProvider(LLMProvider):
                             arguments=json_repair.loads(tc.function.arguments) if isinstance(tc.function.arguments, str) else tc.function.arguments)
             for tc in (msg.tool_calls or [])
         ]
-        u = response.usage
         return LLMResponse(
             content=msg.content, tool_calls=tool_calls, finish_reason=choice.finish_reason or "stop",
-            usage={"prompt_tokens": u.prompt_tokens, "completion_tokens": u.completion_tokens, "total_tokens": u.total_tokens} if u else {},
+            usage=normalize_usage(response.usage),
             reasoning_content=getattr(msg, "reasoning_content", None) or None,
         )
 
@@ -0,0 +1,271 @@
+"""Client-side rate limiting and adaptive concurrency for LLM backends.
+
+Each backend gets an AdaptiveLimiter: token buckets for requests and
+(estimated) tokens per minute, plus an in-flight limit that follows AIMD —
+it grows by about one slot per window of successful calls and halves when
+the provider signals overload (429/503/529). Retry-After pauses the backend.
+
+Waiting requests are admitted in priority order. The priority is ambient:
+callers wrap background work in ``llm_priority(Priority.MAINTENANCE)`` and
+everything the task sends to the LLM inside that block queues behind
+interactive turns.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from enum import IntEnum
+from typing import Any, AsyncIterator, Callable, Iterator
+
+from mragent.providers.base import LLMProvider, LLMResponse, StreamChunk
+from mragent.session.tokens import HeuristicEstimator
+from mragent.utils import metrics
+
+_THROTTLED = metrics.counter(
+    "mragent_llm_throttled_total", "LLM responses that signalled overload or rate limiting", ("backend",),
+)
+_CONCURRENCY = metrics.gauge("mragent_llm_concurrency_limit", "Adaptive in-flight limit", ("backend",))
+_IN_FLIGHT = metrics.gauge("mragent_llm_in_flight", "LLM requests in flight", ("backend",))
+_QUEUE_SECONDS = metrics.histogram(
+    "mragent_llm_queue_seconds", "Time an LLM request waited for the limiter", ("priority",),
+)
+
+_OVERLOAD_STATUS = frozenset({429, 503, 529})
+_OVERLOAD_MARKERS = ("rate limit", "ratelimit", "too many requests", "overloaded", "429")
+_estimate = HeuristicEstimator()
+
+
+class Priority(IntEnum):
+    """Admission order when a backend is saturated; lower goes first."""
+
+    INTERACTIVE = 0  # User turns
+    BACKGROUND = 1  # Subagents, cron jobs, heartbeat tasks
+    MAINTENANCE = 2  # Memory consolidation, heartbeat decisions
+
+
+_PRIORITY: ContextVar[Priority] = ContextVar("llm_priority", default=Priority.INTERACTIVE)
+
+
+@contextmanager
+def llm_priority(priority: Priority) -> Iterator[None]:
+    """Send the LLM calls made inside this block at ``priority``."""
+    token = _PRIORITY.set(priority)
+    try:
+        yield
+    finally:
+        _PRIORITY.reset(token)
+
+
+_ON_ADMITTED: ContextVar[Callable[[], None] | None] = ContextVar("llm_on_admitted", default=None)
+
+
+@contextmanager
+def on_admitted(callback: Callable[[], None]) -> Iterator[None]:
+    """Call ``callback`` when an LLM call started inside this block leaves the limiter queue."""
+    token = _ON_ADMITTED.set(callback)
+    try:
+        yield
+    finally:
+        _ON_ADMITTED.reset(token)
+
+
+def _admitted() -> None:
+    if (callback := _ON_ADMITTED.get()) is not None:
+        callback()
+
+
+def is_overloaded(response: LLMResponse) -> bool:
+    """True if an error response means "slow down" rather than "this request is bad"."""
+    if response.finish_reason != "error":
+        return False
+    if response.status_code is not None:
+        return response.status_code in _OVERLOAD_STATUS
+    text = (response.content or "").lower()
+    return any(marker in text for marker in _OVERLOAD_MARKERS)
+
+
+class TokenBucket:
+    """``per_minute`` units per minute, with up to a minute's worth of burst."""
+
+    def __init__(self, per_minute: float, now: float):
+        self.rate = per_minute / 60
+        self.capacity = float(per_minute)
+        self.level = float(per_minute)
+        self.updated = now
+
+    def _refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay(self, amount: float, now: float) -> float:
+        """Seconds until ``amount`` (capped at the capacity) is available."""
+        self._refill(now)
+        missing = min(amount, self.capacity) - self.level
+        return missing / self.rate if missing > 0 else 0.0
+
+    def take(self, amount: float, now: float) -> None:
+        """Consume ``amount``; the level may go negative to account for usage reported afterwards."""
+        self._refill(now)
+        self.level -= amount
+
+
+class AdaptiveLimiter:
+    """Admission control for one backend: RPM/TPM buckets, AIMD concurrency and Retry-After."""
+
+    def __init__(
+        self,
+        name: str = "default",
+        rpm: int = 0,
+        tpm: int = 0,
+        max_concurrency: int = 8,
+        min_concurrency: int = 1,
+        decrease_cooldown_s: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.max_concurrency = max(1, max_concurrency)
+        self.min_concurrency = max(1, min(min_concurrency, self.max_concurrency))
+        self.limit = float(self.max_concurrency)
+        self.in_flight = 0
+        self.paused_until = 0.0
+        self.decrease_cooldown_s = decrease_cooldown_s
+        self._clock = clock
+        now = clock()
+        self._rpm = TokenBucket(rpm, now) if rpm > 0 else None
+        self._tpm = TokenBucket(tpm, now) if tpm > 0 else None
+        self._decreased_at = float("-inf")
+        self._waiters: list[tuple[int, int]] = []
+        self._seq = itertools.count()
+        self._changed = asyncio.Event()
+        _CONCURRENCY.set_function(lambda: self.limit, backend=name)
+        _IN_FLIGHT.set_function(lambda: self.in_flight, backend=name)
+
+    def _notify(self) -> None:
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    def _wait_time(self, entry: tuple[int, int], tokens: int) -> float | None:
+        """0 = admit now, None = wait for a state change, else seconds to wait."""
+        if self._waiters[0] != entry or self.in_flight >= int(self.limit):
+            return None
+        now = self._clock()
+        wait = max(
+            self.paused_until - now,
+            self._rpm.delay(1, now) if self._rpm else 0.0,
+            self._tpm.delay(tokens, now) if self._tpm else 0.0,
+        )
+        return wait if wait > 0 else 0
+
+    async def acquire(self, tokens: int = 0, priority: Priority | None = None) -> None:
+        """Wait for a slot, behind every waiter of higher priority, and charge the buckets."""
+        priority = _PRIORITY.get() if priority is None else priority
+        entry = (int(priority), next(self._seq))
+        heapq.heappush(self._waiters, entry)
+        started = time.perf_counter()
+        try:
+            while (wait := self._wait_time(entry, tokens)) != 0:
+                changed = self._changed
+                try:
+                    await asyncio.wait_for(changed.wait(), wait)
+                except asyncio.TimeoutError:
+                    pass
+        except BaseException:
+            self._waiters.remove(entry)
+            heapq.heapify(self._waiters)
+            self._notify()
+            raise
+        heapq.heappop(self._waiters)
+        now = self._clock()
+        if self._rpm:
+            self._rpm.take(1, now)
+        if self._tpm:
+            self._tpm.take(tokens, now)
+        self.in_flight += 1
+        _QUEUE_SECONDS.observe(time.perf_counter() - started, priority=priority.name.lower())
+        self._notify()
+
+    def release(self, response: LLMResponse | None) -> None:
+        """Free the slot and adapt the limit to how the call went (None = cancelled)."""
+        self.in_flight -= 1
+        if response is not None:
+            self._adapt(response)
+        self._notify()
+
+    def _adapt(self, response: LLMResponse) -> None:
+        now = self._clock()
+        if self._tpm and (completion := response.usage.get("completion_tokens")):
+            self._tpm.take(completion, now)
+        if is_overloaded(response):
+            _THROTTLED.inc(backend=self.name)
+            if response.retry_after:
+                self.paused_until = max(self.paused_until, now + response.retry_after)
+            # One decrease per burst: the calls already in flight will fail too
+            if now - self._decreased_at >= self.decrease_cooldown_s:
+                self.limit = max(float(self.min_concurrency), self.limit / 2)
+                self._decreased_at = now
+        elif response.finish_reason != "error":
+            self.limit = min(float(self.max_concurrency), self.limit + 1 / self.limit)
+
+
+class RateLimitedProvider(LLMProvider):
+    """Routes every call of ``inner`` through an AdaptiveLimiter."""
+
+    def __init__(self, inner: LLMProvider, limiter: AdaptiveLimiter):
+        super().__init__(inner.api_key, inner.api_base)
+        self.inner = inner
+        self.limiter = limiter
+
+    @staticmethod
+    def _prompt_tokens(messages: list[dict[str, Any]]) -> int:
+        return sum(_estimate(m) for m in messages)
+
+    async def chat(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+        reasoning_effort: str | None = None,
+    ) -> LLMResponse:
+        await self.limiter.acquire(self._prompt_tokens(messages))
+        _admitted()
+        response = None
+        try:
+            response = await self.inner.chat(
+                messages=messages, tools=tools, model=model, max_tokens=max_tokens,
+                temperature=temperature, reasoning_effort=reasoning_effort,
+            )
+            return response
+        finally:
+            self.limiter.release(response)
+
+    async def chat_stream(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+        reasoning_effort: str | None = None,
+    ) -> AsyncIterator[StreamChunk]:
+        await self.limiter.acquire(self._prompt_tokens(messages))
+        _admitted()
+        response = None
+        try:
+            async for chunk in self.inner.chat_stream(
+                messages=messages, tools=tools, model=model, max_tokens=max_tokens,
+                temperature=temperature, reasoning_effort=reasoning_effort,
+            ):
+                response = chunk.response or response
+                yield chunk
+        finally:
+            self.limiter.release(response)
+
+    def get_default_model(self) -> str:
+        return self.inner.get_default_model()
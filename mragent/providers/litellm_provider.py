@@ -3,14 +3,21 @@
 import os
 import secrets
 import string
-from typing import Any
+from typing import Any, AsyncIterator
 
 import json_repair
 import litellm
 from litellm import acompletion
 from loguru import logger
 
-from mragent.providers.base import LLMProvider, LLMResponse, ToolCallRequest
+from mragent.providers.base import (
+    LLMProvider,
+    LLMResponse,
+    StreamChunk,
+    ToolCallRequest,
+    error_info,
+    normalize_usage,
+)
 from mragent.providers.registry import find_by_model, find_gateway
 
 # Standard chat-completion message keys.
@@ -179,28 +186,16 @@ class LiteLLMProvider(LLMProvider):
             sanitized.append(clean)
         return sanitized
 
-    async def chat(
+    def _build_kwargs(
         self,
         messages: list[dict[str, Any]],
-        tools: list[dict[str, Any]] | None = None,
-        model: str | None = None,
-        max_tokens: int = 4096,
-        temperature: float = 0.7,
-        reasoning_effort: str | None = None,
-    ) -> LLMResponse:
-        """
-        Send a chat completion request via LiteLLM.
-
-        Args:
-            messages: List of message dicts with 'role' and 'content'.
-            tools: Optional list of tool definitions in OpenAI format.
-            model: Model identifier (e.g., 'anthropic/claude-sonnet-4-5').
-            max_tokens: Maximum tokens in response.
-            temperature: Sampling temperature.
-
-        Returns:
-            LLMResponse with content and/or tool calls.
-        """
+        tools: list[dict[str, Any]] | None,
+        model: str | None,
+        max_tokens: int,
+        temperature: float,
+        reasoning_effort: str | None,
+    ) -> dict[str, Any]:
+        """Build the acompletion() arguments shared by chat() and chat_stream()."""
         original_model = model or self.default_model
         model = self._resolve_model(original_model)
         extra_msg_keys = self._extra_msg_keys(original_model, model)
@@ -242,6 +237,31 @@ class LiteLLMProvider(LLMProvider):
             kwargs["tools"] = tools
             kwargs["tool_choice"] = "auto"
 
+        return kwargs
+
+    async def chat(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+        reasoning_effort: str | None = None,
+    ) -> LLMResponse:
+        """
+        Send a chat completion request via LiteLLM.
+
+        Args:
+            messages: List of message dicts with 'role' and 'content'.
+            tools: Optional list of tool definitions in OpenAI format.
+            model: Model identifier (e.g., 'anthropic/claude-sonnet-4-5').
+            max_tokens: Maximum tokens in response.
+            temperature: Sampling temperature.
+
+        Returns:
+            LLMResponse with content and/or tool calls.
+        """
+        kwargs = self._build_kwargs(messages, tools, model, max_tokens, temperature, reasoning_effort)
         try:
             response = await acompletion(**kwargs)
             return self._parse_response(response)
@@ -250,8 +270,41 @@ class LiteLLMProvider(LLMProvider):
             return LLMResponse(
                 content=f"Error calling LLM: {str(e)}",
                 finish_reason="error",
+                **error_info(e),
             )
 
+    async def chat_stream(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+        reasoning_effort: str | None = None,
+    ) -> AsyncIterator[StreamChunk]:
+        """Stream a chat completion via LiteLLM, assembling the final response from the chunks."""
+        kwargs = self._build_kwargs(messages, tools, model, max_tokens, temperature, reasoning_effort)
+        kwargs.update(stream=True, stream_options={"include_usage": True})
+        chunks: list[Any] = []
+        try:
+            stream = await acompletion(**kwargs)
+            async for chunk in stream:
+                chunks.append(chunk)
+                for choice in getattr(chunk, "choices", None) or []:
+                    delta = getattr(choice, "delta", None)
+                    if delta is not None and getattr(delta, "content", None):
+                        yield StreamChunk(delta=delta.content)
+            response = litellm.stream_chunk_builder(chunks, messages=kwargs["messages"])
+            if response is None:
+                raise RuntimeError("empty streaming response")
+            yield StreamChunk(response=self._parse_response(response))
+        except Exception as e:
+            yield StreamChunk(response=LLMResponse(
+                content=f"Error calling LLM: {str(e)}",
+                finish_reason="error",
+                **error_info(e),
+            ))
+
     def _parse_response(self, response: Any) -> LLMResponse:
         """Parse LiteLLM response into our standard format."""
         choice = response.choices[0]
@@ -288,13 +341,7 @@ class LiteLLMProvider(LLMProvider):
                 arguments=args,
             ))
 
-        usage = {}
-        if hasattr(response, "usage") and response.usage:
-            usage = {
-                "prompt_tokens": response.usage.prompt_tokens,
-                "completion_tokens": response.usage.completion_tokens,
-                "total_tokens": response.usage.total_tokens,
-            }
+        usage = normalize_usage(getattr(response, "usage", None))
 
         reasoning_content = getattr(message, "reasoning_content", None) or None
         thinking_blocks = getattr(message, "thinking_blocks", None) or None
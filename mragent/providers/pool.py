@@ -0,0 +1,236 @@
+"""Provider pool: load balancing and health-aware routing over several backends."""
+
+from __future__ import annotations
+
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable, Literal
+
+from loguru import logger
+
+from mragent.providers.base import LLMProvider, LLMResponse, StreamChunk
+from mragent.utils import metrics
+
+_REQUESTS = metrics.counter(
+    "mragent_pool_requests_total", "Requests sent to provider pool backends", ("backend", "outcome"),
+)
+_IN_ROTATION = metrics.gauge(
+    "mragent_pool_backend_in_rotation", "1 if the pool backend is receiving traffic", ("backend",),
+)
+
+_WINDOW = 20  # Recent outcomes kept per backend for its error rate
+_MIN_SAMPLES = 5  # Outcomes needed before the error rate can eject a backend
+_LATENCY_ALPHA = 0.2  # Weight of the newest sample in the latency EWMA
+
+
+@dataclass
+class Backend:
+    """One provider (with its key) and the model to ask it for, plus live health stats."""
+
+    name: str
+    provider: LLMProvider
+    model: str | None = None  # None = the model the caller asked for
+    weight: int = 1
+    outstanding: int = 0
+    latency_s: float | None = None  # EWMA over successful calls
+    failures: int = 0  # Consecutive
+    recent: deque[bool] = field(default_factory=lambda: deque(maxlen=_WINDOW))  # True = failed
+    ejected_until: float = 0.0
+    ejections: int = 0  # Consecutive ejections; > 0 means on probation after re-admission
+    current_weight: int = 0  # Smooth weighted round-robin state
+
+    @property
+    def error_rate(self) -> float:
+        return sum(self.recent) / len(self.recent) if self.recent else 0.0
+
+
+class PoolProvider(LLMProvider):
+    """
+    Spread requests over several backends.
+
+    ``round_robin`` is smooth weighted round-robin; ``least_outstanding``
+    picks the backend with the fewest in-flight requests per unit of weight,
+    breaking ties by latency. A failed request is retried on another backend
+    (up to ``max_attempts`` backends). A backend is ejected after
+    ``eject_after_failures`` consecutive failures or when ``max_error_rate``
+    of its recent requests failed; once the ejection expires it gets one
+    probe request at a time, and a failed probe ejects it for twice as long.
+    If every backend is ejected, the one due back soonest is tried anyway.
+    """
+
+    def __init__(
+        self,
+        backends: list[Backend],
+        strategy: Literal["round_robin", "least_outstanding"] = "round_robin",
+        max_attempts: int = 2,
+        eject_after_failures: int = 3,
+        max_error_rate: float = 0.5,
+        eject_s: float = 30.0,
+        eject_max_s: float = 600.0,
+        default_model: str | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if not backends:
+            raise ValueError("PoolProvider needs at least one backend")
+        super().__init__()
+        self.backends = backends
+        self.strategy = strategy
+        self.max_attempts = max(1, max_attempts)
+        self.eject_after_failures = max(1, eject_after_failures)
+        self.max_error_rate = max_error_rate
+        self.eject_s = eject_s
+        self.eject_max_s = eject_max_s
+        self.default_model = default_model or backends[0].model or backends[0].provider.get_default_model()
+        self._clock = clock
+        for b in backends:
+            _IN_ROTATION.set_function(lambda b=b: float(b.ejected_until <= self._clock()), backend=b.name)
+
+    def _pick(self, tried: set[int]) -> Backend | None:
+        now = self._clock()
+        untried = [b for b in self.backends if id(b) not in tried]
+        # A backend on probation takes one request at a time until it succeeds
+        candidates = [b for b in untried if b.ejected_until <= now and not (b.ejections and b.outstanding)]
+        if not candidates:
+            return min(untried, key=lambda b: b.ejected_until, default=None)
+
+        if self.strategy == "least_outstanding":
+            return min(candidates, key=lambda b: (b.outstanding / max(b.weight, 1), b.latency_s or 0.0))
+
+        total = sum(max(b.weight, 1) for b in candidates)
+        for b in candidates:
+            b.current_weight += max(b.weight, 1)
+        best = max(candidates, key=lambda b: b.current_weight)
+        best.current_weight -= total
+        return best
+
+    def _record(self, backend: Backend, ok: bool, elapsed: float) -> None:
+        _REQUESTS.inc(backend=backend.name, outcome="ok" if ok else "error")
+        backend.recent.append(not ok)
+        if ok:
+            backend.failures = 0
+            if backend.latency_s is None:
+                backend.latency_s = elapsed
+            else:
+                backend.latency_s += _LATENCY_ALPHA * (elapsed - backend.latency_s)
+            if backend.ejections:
+                logger.info("Provider pool: {} is healthy again", backend.name)
+                backend.ejections = 0
+            return
+
+        backend.failures += 1
+        if (
+            backend.ejections  # Failed probe
+            or backend.failures >= self.eject_after_failures
+            or (len(backend.recent) >= _MIN_SAMPLES and backend.error_rate >= self.max_error_rate)
+        ):
+            duration = min(self.eject_s * 2 ** backend.ejections, self.eject_max_s)
+            backend.ejected_until = self._clock() + duration
+            backend.ejections += 1
+            backend.failures = 0
+            backend.recent.clear()
+            logger.warning("Provider pool: ejecting {} for {:.0f}s", backend.name, duration)
+
+    @staticmethod
+    def _error(e: Exception) -> LLMResponse:
+        return LLMResponse(content=f"Error calling LLM: {e}", finish_reason="error")
+
+    async def chat(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+        reasoning_effort: str | None = None,
+    ) -> LLMResponse:
+        tried: set[int] = set()
+        response = LLMResponse(content="Error calling LLM: no backend available", finish_reason="error")
+        for _ in range(self.max_attempts):
+            backend = self._pick(tried)
+            if backend is None:
+                break
+            tried.add(id(backend))
+            backend.outstanding += 1
+            started = self._clock()
+            try:
+                response = await backend.provider.chat(
+                    messages=messages, tools=tools, model=backend.model or model,
+                    max_tokens=max_tokens, temperature=temperature, reasoning_effort=reasoning_effort,
+                )
+            except Exception as e:
+                response = self._error(e)
+            finally:
+                backend.outstanding -= 1
+            response.model = response.model or backend.model
+            ok = response.finish_reason != "error"
+            self._record(backend, ok, self._clock() - started)
+            if ok:
+                return response
+            logger.warning("Provider pool: {} failed: {}", backend.name, (response.content or "")[:200])
+        return response
+
+    async def chat_stream(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+        reasoning_effort: str | None = None,
+    ) -> AsyncIterator[StreamChunk]:
+        """Like chat(), but a backend that has already streamed text is not retried elsewhere."""
+        tried: set[int] = set()
+        response = LLMResponse(content="Error calling LLM: no backend available", finish_reason="error")
+        for _ in range(self.max_attempts):
+            backend = self._pick(tried)
+            if backend is None:
+                break
+            tried.add(id(backend))
+            backend.outstanding += 1
+            started = self._clock()
+            streamed, final = False, None
+            try:
+                async for chunk in backend.provider.chat_stream(
+                    messages=messages, tools=tools, model=backend.model or model,
+                    max_tokens=max_tokens, temperature=temperature, reasoning_effort=reasoning_effort,
+                ):
+                    if chunk.response is not None:
+                        final = chunk.response
+                    else:
+                        streamed = True
+                        yield chunk
+            except Exception as e:
+                final = self._error(e)
+            finally:
+                backend.outstanding -= 1
+            response = final or LLMResponse(
+                content="Error calling LLM: stream ended without a response", finish_reason="error",
+            )
+            response.model = response.model or backend.model
+            ok = response.finish_reason != "error"
+            self._record(backend, ok, self._clock() - started)
+            if ok or streamed:
+                break
+            logger.warning("Provider pool: {} failed: {}", backend.name, (response.content or "")[:200])
+        yield StreamChunk(response=response)
+
+    def stats(self) -> list[dict[str, Any]]:
+        """Health and load of each backend, for status output."""
+        now = self._clock()
+        return [
+            {
+                "backend": b.name,
+                "model": b.model,
+                "weight": b.weight,
+                "in_rotation": b.ejected_until <= now,
+                "outstanding": b.outstanding,
+                "latency_ms": round(b.latency_s * 1000, 1) if b.latency_s is not None else None,
+                "error_rate": round(b.error_rate, 3),
+                "ejected_for_s": round(max(0.0, b.ejected_until - now), 1),
+            }
+            for b in self.backends
+        ]
+
+    def get_default_model(self) -> str:
+        return self.default_model
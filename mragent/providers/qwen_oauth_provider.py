@@ -23,7 +23,14 @@ from typing import Any
 import httpx
 from loguru import logger
 
-from mragent.providers.base import LLMProvider, LLMResponse, ToolCallRequest
+from mragent.providers.base import (
+    LLMProvider,
+    LLMResponse,
+    ToolCallRequest,
+    error_info,
+    normalize_usage,
+)
+from mragent.utils.http import get_http_client
 
 _TOKEN_FILE = Path.home() / ".mragent" / "qwen_token.json"
 _QWEN_CHAT_API = "https://chat.qwen.ai/api/chat/completions"
@@ -173,31 +180,36 @@ class QwenOAuthProvider(LLMProvider):
         }
 
         try:
-            async with httpx.AsyncClient(timeout=120.0) as client:
-                response = await client.post(_QWEN_CHAT_API, json=payload, headers=headers)
-
-                if response.status_code == 401:
-                    # Token expired — clear cache and report
-                    self._token = None
-                    _TOKEN_FILE.unlink(missing_ok=True)
-                    return LLMResponse(
-                        content=(
-                            "Qwen OAuth token expired. Run `mragent agent` again to re-authenticate, "
-                            "or delete ~/.mragent/qwen_token.json."
-                        ),
-                        finish_reason="error",
-                    )
-
-                response.raise_for_status()
-                data = response.json()
-                return self._parse_response(data)
+            response = await get_http_client().post(
+                _QWEN_CHAT_API, json=payload, headers=headers, timeout=120.0,
+            )
+
+            if response.status_code == 401:
+                # Token expired — clear cache and report
+                self._token = None
+                _TOKEN_FILE.unlink(missing_ok=True)
+                return LLMResponse(
+                    content=(
+                        "Qwen OAuth token expired. Run `mragent agent` again to re-authenticate, "
+                        "or delete ~/.mragent/qwen_token.json."
+                    ),
+                    finish_reason="error",
+                )
+
+            response.raise_for_status()
+            data = response.json()
+            return self._parse_response(data)
 
         except httpx.HTTPStatusError as e:
             logger.error("Qwen API HTTP error: {} — {}", e.response.status_code, e.response.text[:300])
-            return LLMResponse(content=f"Qwen API error {e.response.status_code}: {e.response.text[:200]}", finish_reason="error")
+            return LLMResponse(
+                content=f"Qwen API error {e.response.status_code}: {e.response.text[:200]}",
+                finish_reason="error",
+                **error_info(e),
+            )
         except Exception as e:
             logger.error("Qwen API error: {}", e)
-            return LLMResponse(content=f"Qwen API error: {e}", finish_reason="error")
+            return LLMResponse(content=f"Qwen API error: {e}", finish_reason="error", **error_info(e))
 
     @staticmethod
     def _parse_response(data: dict[str, Any]) -> LLMResponse:
@@ -226,12 +238,7 @@ class QwenOAuthProvider(LLMProvider):
                     arguments=args,
                 ))
 
-            usage_raw = data.get("usage", {})
-            usage = {
-                "prompt_tokens": usage_raw.get("prompt_tokens", 0),
-                "completion_tokens": usage_raw.get("completion_tokens", 0),
-                "total_tokens": usage_raw.get("total_tokens", 0),
-            }
+            usage = normalize_usage(data.get("usage"))
 
             return LLMResponse(
                 content=content,
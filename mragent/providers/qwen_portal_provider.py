@@ -25,7 +25,14 @@ try:
 except ImportError:
     get_oauth_token = None
 
-from mragent.providers.base import LLMProvider, LLMResponse, ToolCallRequest
+from mragent.providers.base import (
+    LLMProvider,
+    LLMResponse,
+    ToolCallRequest,
+    error_info,
+    normalize_usage,
+)
+from mragent.utils.http import get_http_client
 
 _TOKEN_FILE = Path.home() / ".mragent" / "qwen_portal_token.json"
 _QWEN_PORTAL_API = "https://portal.qwen.ai/v1/chat/completions"
@@ -135,28 +142,33 @@ class QwenPortalProvider(LLMProvider):
         }
 
         try:
-            async with httpx.AsyncClient(timeout=120.0) as client:
-                response = await client.post(_QWEN_PORTAL_API, json=payload, headers=headers)
-
-                if response.status_code == 401:
-                    # Token might have expired early
-                    self._token_data = None
-                    _TOKEN_FILE.unlink(missing_ok=True)
-                    return LLMResponse(
-                        content="Qwen Portal session expired. Please run again to re-authorize.",
-                        finish_reason="error",
-                    )
-
-                response.raise_for_status()
-                data = response.json()
-                return self._parse_openai_response(data)
+            response = await get_http_client().post(
+                _QWEN_PORTAL_API, json=payload, headers=headers, timeout=120.0,
+            )
+
+            if response.status_code == 401:
+                # Token might have expired early
+                self._token_data = None
+                _TOKEN_FILE.unlink(missing_ok=True)
+                return LLMResponse(
+                    content="Qwen Portal session expired. Please run again to re-authorize.",
+                    finish_reason="error",
+                )
+
+            response.raise_for_status()
+            data = response.json()
+            return self._parse_openai_response(data)
 
         except httpx.HTTPStatusError as e:
             logger.error("Qwen Portal HTTP error: {} — {}", e.response.status_code, e.response.text[:300])
-            return LLMResponse(content=f"Qwen Portal error {e.response.status_code}: {e.response.text[:200]}", finish_reason="error")
+            return LLMResponse(
+                content=f"Qwen Portal error {e.response.status_code}: {e.response.text[:200]}",
+                finish_reason="error",
+                **error_info(e),
+            )
         except Exception as e:
             logger.error("Qwen Portal error: {}", e)
-            return LLMResponse(content=f"Qwen Portal error: {e}", finish_reason="error")
+            return LLMResponse(content=f"Qwen Portal error: {e}", finish_reason="error", **error_info(e))
 
     def _parse_openai_response(self, data: dict[str, Any]) -> LLMResponse:
         """Standard OpenAI response parser."""
@@ -186,12 +198,7 @@ class QwenPortalProvider(LLMProvider):
                 arguments=args,
             ))
 
-        usage_raw = data.get("usage", {})
-        usage = {
-            "prompt_tokens": usage_raw.get("prompt_tokens", 0),
-            "completion_tokens": usage_raw.get("completion_tokens", 0),
-            "total_tokens": usage_raw.get("total_tokens", 0),
-        }
+        usage = normalize_usage(data.get("usage"))
 
         return LLMResponse(
             content=content,
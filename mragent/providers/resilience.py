@@ -0,0 +1,326 @@
+"""Retries with backoff and a circuit breaker around an LLM endpoint.
+
+A chat request has no side effects, so it is safe to send again as long as
+nothing from the failed attempt has reached the caller: plain calls are
+retried freely, streams only until the first text delta. Only transient
+failures are retried (timeouts, connection errors, 408/429/5xx); a 400 or
+401 fails immediately. Backoff is exponential with full jitter, stretched
+to any Retry-After, and every call has a total deadline across attempts.
+The deadline starts when the first attempt leaves the rate limiter's queue:
+waiting for a slot is the limiter's business and not an endpoint failure.
+
+The breaker counts consecutive transient failures. When it opens, calls
+fail fast for ``reset_s``; then one trial call is let through and its
+outcome closes or re-opens the breaker.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable
+
+from loguru import logger
+
+from mragent.providers.base import LLMProvider, LLMResponse, StreamChunk
+from mragent.providers.limiter import RateLimitedProvider, on_admitted
+from mragent.utils import metrics
+
+_RETRIES = metrics.counter("mragent_llm_retries_total", "LLM calls retried after a transient failure", ("endpoint",))
+_CIRCUIT_OPENS = metrics.counter("mragent_llm_circuit_opens_total", "Times the circuit breaker opened", ("endpoint",))
+_CIRCUIT_STATE = metrics.gauge(
+    "mragent_llm_circuit_state", "Circuit breaker state (0 closed, 1 half-open, 2 open)", ("endpoint",),
+)
+
+_TRANSIENT_STATUS = frozenset({408, 425, 429, 500, 502, 503, 504, 529})
+_TRANSIENT_MARKERS = (
+    "timeout", "timed out", "connection", "temporarily", "overloaded", "rate limit", "server disconnected",
+)
+
+
+def is_transient(response: LLMResponse) -> bool:
+    """True if a failed call may succeed when sent again unchanged."""
+    if response.finish_reason != "error":
+        return False
+    if response.retryable is not None:
+        return response.retryable
+    if response.status_code is not None:
+        return response.status_code in _TRANSIENT_STATUS
+    text = (response.content or "").lower()
+    return any(marker in text for marker in _TRANSIENT_MARKERS)
+
+
+@dataclass
+class RetryPolicy:
+    """How hard to try one call."""
+
+    max_attempts: int = 3
+    base_delay_s: float = 0.5
+    max_delay_s: float = 8.0
+    deadline_s: float = 300.0  # Across all attempts and waits, from when the first attempt is admitted (0 = none)
+
+    def deadline(self, started: float | None) -> float:
+        """Absolute deadline of a call whose first attempt started at ``started`` (None = now)."""
+        if self.deadline_s <= 0:
+            return float("inf")
+        return (started or time.monotonic()) + self.deadline_s
+
+    def backoff(self, attempt: int, retry_after: float | None = None) -> float:
+        """Delay before retry number ``attempt`` (1-based)."""
+        delay = random.uniform(0, min(self.max_delay_s, self.base_delay_s * 2 ** (attempt - 1)))
+        return max(delay, retry_after or 0.0)
+
+
+class CircuitBreaker:
+    """Closed → open after ``failure_threshold`` consecutive failures → half-open after ``reset_s``."""
+
+    CLOSED, HALF_OPEN, OPEN = 0, 1, 2
+
+    def __init__(
+        self,
+        name: str = "default",
+        failure_threshold: int = 5,
+        reset_s: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_s = reset_s
+        self.failures = 0
+        self.opened_at: float | None = None
+        self._trial_running = False
+        self._clock = clock
+        _CIRCUIT_STATE.set_function(lambda: self.state, endpoint=name)
+
+    @property
+    def state(self) -> int:
+        if self.opened_at is None:
+            return self.CLOSED
+        return self.HALF_OPEN if self._clock() - self.opened_at >= self.reset_s else self.OPEN
+
+    def allow(self) -> bool:
+        """Whether a call may go out now. In half-open state only one trial at a time."""
+        state = self.state
+        if state == self.CLOSED:
+            return True
+        if state == self.HALF_OPEN and not self._trial_running:
+            self._trial_running = True
+            return True
+        return False
+
+    def record(self, success: bool) -> None:
+        self._trial_running = False
+        if success:
+            if self.opened_at is not None:
+                logger.info("Circuit for {} closed", self.name)
+            self.failures = 0
+            self.opened_at = None
+            return
+        self.failures += 1
+        if self.opened_at is not None or self.failures >= self.failure_threshold:
+            if self.opened_at is None:
+                logger.warning("Circuit for {} opened after {} failures", self.name, self.failures)
+            _CIRCUIT_OPENS.inc(endpoint=self.name)
+            self.opened_at = self._clock()
+
+    def release(self) -> None:
+        """Give up a trial slot without an outcome (call cancelled or not transient)."""
+        self._trial_running = False
+
+
+async def _first_of(call: asyncio.Future, admitted: asyncio.Event) -> None:
+    """Wait until ``call`` is admitted by the limiter or has finished."""
+    waiter = asyncio.ensure_future(admitted.wait())
+    try:
+        await asyncio.wait({call, waiter}, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        waiter.cancel()
+
+
+async def _cancel(task: asyncio.Future) -> None:
+    """Cancel ``task`` and wait until it has stopped, e.g. before closing the generator it drives."""
+    task.cancel()
+    await asyncio.wait({task})
+
+
+class ResilientProvider(LLMProvider):
+    """Retries transient failures of ``inner`` and stops calling it while its breaker is open."""
+
+    def __init__(
+        self,
+        inner: LLMProvider,
+        policy: RetryPolicy | None = None,
+        breaker: CircuitBreaker | None = None,
+        sleep: Callable[[float], Any] = asyncio.sleep,
+    ):
+        super().__init__(inner.api_key, inner.api_base)
+        self.inner = inner
+        self.policy = policy or RetryPolicy()
+        self.breaker = breaker or CircuitBreaker()
+        self._sleep = sleep
+
+    def _circuit_open(self) -> LLMResponse:
+        return LLMResponse(
+            content=f"Error calling LLM: {self.breaker.name} is unavailable (circuit open), try again later",
+            finish_reason="error",
+            retryable=False,
+        )
+
+    def _deadline_exceeded(self) -> LLMResponse:
+        return LLMResponse(
+            content=f"Error calling LLM: no answer within {self.policy.deadline_s:g}s",
+            finish_reason="error",
+            retryable=False,
+        )
+
+    def _settle(self, response: LLMResponse) -> bool:
+        """Feed the breaker; True if the call should be retried."""
+        transient = is_transient(response)
+        if response.finish_reason != "error" or transient:
+            self.breaker.record(success=not transient)
+        else:
+            self.breaker.release()  # The endpoint answered; the request itself was bad
+        return transient
+
+    @staticmethod
+    def _admission(started: list[float]) -> tuple[asyncio.Event, Callable[[], None]]:
+        """An event set when a call leaves the limiter queue; the first admission time goes into ``started``."""
+        admitted = asyncio.Event()
+
+        def mark() -> None:
+            if not started:
+                started.append(time.monotonic())
+            admitted.set()
+
+        return admitted, mark
+
+    async def _before_retry(self, attempt: int, response: LLMResponse, deadline: float) -> bool:
+        """Sleep before retry ``attempt``; False if out of attempts or time."""
+        if attempt >= self.policy.max_attempts:
+            return False
+        delay = self.policy.backoff(attempt, response.retry_after)
+        if time.monotonic() + delay >= deadline:
+            return False
+        _RETRIES.inc(endpoint=self.breaker.name)
+        logger.warning(
+            "LLM call to {} failed ({}), retry {} in {:.1f}s",
+            self.breaker.name, (response.content or "")[:120], attempt, delay,
+        )
+        await self._sleep(delay)
+        return True
+
+    async def chat(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+        reasoning_effort: str | None = None,
+    ) -> LLMResponse:
+        started: list[float] = []  # When the first attempt left the limiter queue
+        attempt = 0
+        while True:
+            attempt += 1
+            if not self.breaker.allow():
+                return self._circuit_open()
+            admitted, mark = self._admission(started)
+            with on_admitted(mark):
+                call = asyncio.ensure_future(self.inner.chat(
+                    messages=messages, tools=tools, model=model, max_tokens=max_tokens,
+                    temperature=temperature, reasoning_effort=reasoning_effort,
+                ))
+            if not isinstance(self.inner, RateLimitedProvider):
+                mark()  # Nothing to queue for
+            try:
+                await _first_of(call, admitted)  # No timeout while queued
+                deadline = self.policy.deadline(started[0] if started else None)
+                if not call.done() and time.monotonic() >= deadline:
+                    call.cancel()  # Admitted too late to start; the endpoint is not at fault
+                    self.breaker.release()
+                    return self._deadline_exceeded()
+                timeout = None if deadline == float("inf") else max(0.0, deadline - time.monotonic())
+                response = await asyncio.wait_for(call, timeout=timeout)
+            except asyncio.TimeoutError:
+                self.breaker.record(success=False)
+                return self._deadline_exceeded()
+            except BaseException:
+                call.cancel()
+                self.breaker.release()
+                raise
+            if not self._settle(response) or not await self._before_retry(attempt, response, deadline):
+                return response
+
+    async def chat_stream(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+        reasoning_effort: str | None = None,
+    ) -> AsyncIterator[StreamChunk]:
+        """Like chat(), but an attempt that has streamed text is final.
+
+        The deadline covers the whole stream, starting when the first attempt
+        leaves the limiter queue; a stream that stalls past it ends with an error.
+        """
+        started: list[float] = []  # When the first attempt left the limiter queue
+        attempt = 0
+        while True:
+            attempt += 1
+            if not self.breaker.allow():
+                yield StreamChunk(response=self._circuit_open())
+                return
+            admitted, mark = self._admission(started)
+            if not isinstance(self.inner, RateLimitedProvider):
+                mark()  # Nothing to queue for
+            stream = self.inner.chat_stream(
+                messages=messages, tools=tools, model=model, max_tokens=max_tokens,
+                temperature=temperature, reasoning_effort=reasoning_effort,
+            )
+            response, streamed = None, False
+            try:
+                while True:
+                    with on_admitted(mark):
+                        step = asyncio.ensure_future(stream.__anext__())
+                    try:
+                        await _first_of(step, admitted)  # No timeout while queued
+                        deadline = self.policy.deadline(started[0] if started else None)
+                        if not step.done() and time.monotonic() >= deadline and not streamed and response is None:
+                            await _cancel(step)  # Admitted too late to start; the endpoint is not at fault
+                            self.breaker.release()
+                            yield StreamChunk(response=self._deadline_exceeded())
+                            return
+                        timeout = None if deadline == float("inf") else max(0.0, deadline - time.monotonic())
+                        chunk = await asyncio.wait_for(step, timeout=timeout)
+                    except StopAsyncIteration:
+                        break
+                    except asyncio.TimeoutError:
+                        self.breaker.record(success=False)
+                        yield StreamChunk(response=self._deadline_exceeded())
+                        return
+                    except BaseException:
+                        await _cancel(step)
+                        raise
+                    if chunk.response is not None:
+                        response = chunk.response
+                    else:
+                        streamed = True
+                        yield chunk
+            except BaseException:
+                self.breaker.release()
+                raise
+            finally:
+                await stream.aclose()
+            if response is None:
+                response = LLMResponse(content="Error calling LLM: stream ended without a response", finish_reason="error")
+            retry = self._settle(response) and not streamed
+            if not retry or not await self._before_retry(attempt, response, deadline):
+                yield StreamChunk(response=response)
+                return
+
+    def get_default_model(self) -> str:
+        return self.inner.get_default_model()
@@ -8,9 +8,10 @@ Sign up at https://console.groq.com — no credit card required.
 import os
 from pathlib import Path
 
-import httpx
 from loguru import logger
 
+from mragent.utils.http import get_http_client
+
 _MAX_AUDIO_BYTES = 25 * 1024 * 1024  # Groq free tier limit: 25 MB
 
 
@@ -61,28 +62,27 @@ class GroqTranscriptionProvider:
             return ""
 
         try:
-            async with httpx.AsyncClient() as client:
-                with open(path, "rb") as f:
-                    files: dict = {
-                        "file": (path.name, f),
-                        "model": (None, self.model),
-                        "response_format": (None, "json"),
-                    }
-                    if language:
-                        files["language"] = (None, language)
-
-                    headers = {"Authorization": f"Bearer {self.api_key}"}
-
-                    response = await client.post(
-                        self.api_url,
-                        headers=headers,
-                        files=files,
-                        timeout=60.0,
-                    )
-
-                    response.raise_for_status()
-                    data = response.json()
-                    return data.get("text", "")
+            with open(path, "rb") as f:
+                files: dict = {
+                    "file": (path.name, f),
+                    "model": (None, self.model),
+                    "response_format": (None, "json"),
+                }
+                if language:
+                    files["language"] = (None, language)
+
+                headers = {"Authorization": f"Bearer {self.api_key}"}
+
+                response = await get_http_client().post(
+                    self.api_url,
+                    headers=headers,
+                    files=files,
+                    timeout=60.0,
+                )
+
+                response.raise_for_status()
+                data = response.json()
+                return data.get("text", "")
 
         except Exception as e:
             logger.error("Groq transcription error: {}", e)
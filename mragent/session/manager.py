@@ -1,7 +1,11 @@
 """Session management for conversation history."""
 
 import json
+import os
 import shutil
+import time
+import weakref
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
@@ -9,8 +13,15 @@ from typing import Any
 
 from loguru import logger
 
+from mragent.session.tokens import HeuristicEstimator, TokenEstimator, message_tokens
+from mragent.utils import metrics
 from mragent.utils.helpers import ensure_dir, safe_filename
 
+_CACHE_LOOKUPS = metrics.counter("mragent_session_cache_lookups_total", "Session cache lookups by result", ("result",))
+_CACHE_EVICTIONS = metrics.counter("mragent_session_cache_evictions_total", "Sessions dropped from the cache")
+_CACHE_SIZE = metrics.gauge("mragent_session_cache_size", "Sessions held in the cache")
+_CACHE_MESSAGES = metrics.gauge("mragent_session_cache_messages", "Messages held by cached sessions")
+
 
 @dataclass
 class Session:
@@ -30,6 +41,22 @@ class Session:
     updated_at: datetime = field(default_factory=datetime.now)
     metadata: dict[str, Any] = field(default_factory=dict)
     last_consolidated: int = 0  # Number of messages already consolidated to files
+    # Persistence bookkeeping: messages already on disk, and metadata records
+    # appended since the file was last fully rewritten.
+    _persisted: int = field(default=0, init=False, repr=False, compare=False)
+    _meta_records: int = field(default=0, init=False, repr=False, compare=False)
+    _saved_marker: tuple = field(default=(), init=False, repr=False, compare=False)
+
+    def _marker(self) -> tuple:
+        """Cheap fingerprint of the state that save() persists."""
+        return (len(self.messages), self.last_consolidated, self.updated_at)
+
+    @property
+    def is_dirty(self) -> bool:
+        """True if the session has changes that have not been saved."""
+        if not self._saved_marker:
+            return bool(self.messages)
+        return self._saved_marker != self._marker()
 
     def add_message(self, role: str, content: str, **kwargs: Any) -> None:
         """Add a message to the session."""
@@ -42,8 +69,22 @@ class Session:
         self.messages.append(msg)
         self.updated_at = datetime.now()
 
-    def get_history(self, max_messages: int = 500) -> list[dict[str, Any]]:
-        """Return unconsolidated messages for LLM input, aligned to a user turn."""
+    def get_history(
+        self,
+        max_messages: int = 500,
+        max_tokens: int | None = None,
+        estimator: TokenEstimator | None = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Return unconsolidated messages for LLM input, aligned to a user turn.
+
+        With ``max_tokens``, whole turns (a user message and everything after
+        it up to the next one) are taken from the most recent backwards while
+        they fit the budget, so tool calls always keep their results. The
+        latest turn is kept even when it alone is over budget, with its tool
+        results truncated. Token counts are cached on each message (see
+        ``message_tokens``).
+        """
         unconsolidated = self.messages[self.last_consolidated:]
         sliced = unconsolidated[-max_messages:]
 
@@ -53,6 +94,9 @@ class Session:
                 sliced = sliced[i:]
                 break
 
+        if max_tokens is not None:
+            sliced = self._fit_turns(sliced, max_tokens, estimator or HeuristicEstimator())
+
         out: list[dict[str, Any]] = []
         for m in sliced:
             entry: dict[str, Any] = {"role": m["role"], "content": m.get("content", "")}
@@ -62,6 +106,51 @@ class Session:
             out.append(entry)
         return out
 
+    @staticmethod
+    def _fit_turns(
+        messages: list[dict[str, Any]], budget: int, estimator: TokenEstimator,
+    ) -> list[dict[str, Any]]:
+        """
+        Keep the longest suffix of whole user turns whose tokens fit the budget.
+
+        The latest turn is always kept: if it alone is over budget, its tool
+        results are truncated to share what the other messages leave over.
+        """
+        start, used = len(messages), 0
+        turn_tokens = 0
+        for i in range(len(messages) - 1, -1, -1):
+            turn_tokens += message_tokens(messages[i], estimator)
+            if messages[i].get("role") != "user":
+                continue
+            if used + turn_tokens > budget:
+                if start == len(messages):
+                    return Session._shrink_tool_results(messages[i:], budget, estimator)
+                break
+            used += turn_tokens
+            start, turn_tokens = i, 0
+        return messages[start:]
+
+    @staticmethod
+    def _shrink_tool_results(
+        turn: list[dict[str, Any]], budget: int, estimator: TokenEstimator,
+    ) -> list[dict[str, Any]]:
+        """Copy of ``turn`` with tool results cut to an equal share of the budget left by the rest."""
+        tools = {id(m) for m in turn if m.get("role") == "tool" and isinstance(m.get("content"), str)}
+        if not tools:
+            return turn
+        fixed = sum(message_tokens(m, estimator) for m in turn if id(m) not in tools)
+        share = max(0, budget - fixed) // len(tools)
+        out = []
+        for m in turn:
+            tokens = message_tokens(m, estimator)
+            if id(m) in tools and tokens > share:
+                content = m["content"]
+                keep = len(content) * share // tokens
+                m = {k: v for k, v in m.items() if k != "_tokens"}
+                m["content"] = content[:keep] + f"\n... (truncated, {len(content) - keep} more chars)"
+            out.append(m)
+        return out
+
     def clear(self) -> None:
         """Clear all messages and reset session to initial state."""
         self.messages = []
@@ -73,14 +162,44 @@ class SessionManager:
     """
     Manages conversation sessions.
 
-    Sessions are stored as JSONL files in the sessions directory.
+    Sessions are stored as JSONL files in the sessions directory. The file
+    starts with a metadata record followed by one line per message. Saves are
+    append-only: new messages are appended together with a trailing metadata
+    record (the last one wins on load), and the file is compacted back to a
+    single header once enough metadata records have piled up.
+
+    Loaded sessions are kept in an LRU cache bounded by session count, total
+    cached messages and idle time. Dirty sessions are saved before they are
+    dropped, and a dropped session that is still referenced elsewhere (e.g.
+    by a running turn) is handed back as the same object on the next lookup.
     """
 
-    def __init__(self, workspace: Path):
+    def __init__(
+        self,
+        workspace: Path,
+        fsync: bool = True,
+        compact_every: int = 50,
+        max_cached_sessions: int = 256,
+        max_cached_messages: int | None = 50_000,
+        idle_ttl_s: float | None = 3600,
+    ):
         self.workspace = workspace
         self.sessions_dir = ensure_dir(self.workspace / "sessions")
         self.legacy_sessions_dir = Path.home() / ".mragent" / "sessions"
-        self._cache: dict[str, Session] = {}
+        self.fsync = fsync
+        self.compact_every = compact_every
+        self.max_cached_sessions = max(1, max_cached_sessions)
+        self.max_cached_messages = max_cached_messages
+        self.idle_ttl_s = idle_ttl_s
+        self._cache: OrderedDict[str, Session] = OrderedDict()
+        self._last_access: dict[str, float] = {}
+        self._evicted: weakref.WeakValueDictionary[str, Session] = weakref.WeakValueDictionary()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        ref = weakref.ref(self)
+        _CACHE_SIZE.set_function(lambda: (m := ref()) and len(m._cache) or 0)
+        _CACHE_MESSAGES.set_function(lambda: (m := ref()) and m._cached_messages() or 0)
 
     def _get_session_path(self, key: str) -> Path:
         """Get the file path for a session."""
@@ -102,16 +221,75 @@ class SessionManager:
         Returns:
             The session.
         """
-        if key in self._cache:
-            return self._cache[key]
-
-        session = self._load(key)
-        if session is None:
-            session = Session(key=key)
-
-        self._cache[key] = session
+        session = self._cache.get(key) or self._evicted.pop(key, None)
+        if session is not None:
+            self._hits += 1
+            _CACHE_LOOKUPS.inc(result="hit")
+        else:
+            self._misses += 1
+            _CACHE_LOOKUPS.inc(result="miss")
+            session = self._load(key)
+            if session is None:
+                session = Session(key=key)
+
+        self._touch(session)
         return session
 
+    def _touch(self, session: Session) -> None:
+        """Mark a session as most recently used and enforce the cache bounds."""
+        self._cache[session.key] = session
+        self._cache.move_to_end(session.key)
+        self._last_access[session.key] = time.monotonic()
+        self._evict()
+
+    def _evict(self) -> None:
+        """Drop least recently used sessions that are idle or over the size bounds."""
+        now = time.monotonic()
+        total_messages = (
+            self._cached_messages()
+            if self.max_cached_messages is not None else 0
+        )
+        while len(self._cache) > 1:
+            key, session = next(iter(self._cache.items()))
+            idle = (
+                self.idle_ttl_s is not None
+                and now - self._last_access.get(key, now) >= self.idle_ttl_s
+            )
+            over_size = len(self._cache) > self.max_cached_sessions
+            over_memory = (
+                self.max_cached_messages is not None
+                and total_messages > self.max_cached_messages
+            )
+            if not (idle or over_size or over_memory):
+                break
+            if session.is_dirty:
+                try:
+                    self.save(session, _touch=False)
+                except Exception:
+                    logger.exception("Failed to flush session {} before eviction", key)
+                    self._cache.move_to_end(key)  # Keep it; retry on a later sweep
+                    break
+            del self._cache[key]
+            self._last_access.pop(key, None)
+            self._evicted[key] = session
+            self._evictions += 1
+            _CACHE_EVICTIONS.inc()
+            total_messages -= len(session.messages)
+            logger.debug("Evicted session {} from cache", key)
+
+    def _cached_messages(self) -> int:
+        return sum(len(s.messages) for s in self._cache.values())
+
+    def cache_stats(self) -> dict[str, int]:
+        """Return this manager's cache counters; process-wide totals are exported as metrics."""
+        return {
+            "size": len(self._cache),
+            "messages": self._cached_messages(),
+            "hits": self._hits,
+            "misses": self._misses,
+            "evictions": self._evictions,
+        }
+
     def _load(self, key: str) -> Session | None:
         """Load a session from disk."""
         path = self._get_session_path(key)
@@ -131,56 +309,141 @@ class SessionManager:
             messages = []
             metadata = {}
             created_at = None
+            updated_at = None
             last_consolidated = 0
+            meta_records = 0
+            torn = False
 
             with open(path, encoding="utf-8") as f:
-                for line in f:
-                    line = line.strip()
-                    if not line:
-                        continue
+                lines = f.read().split("\n")
+            for i, line in enumerate(lines):
+                line = line.strip()
+                if not line:
+                    continue
 
+                try:
                     data = json.loads(line)
-
-                    if data.get("_type") == "metadata":
-                        metadata = data.get("metadata", {})
-                        created_at = datetime.fromisoformat(data["created_at"]) if data.get("created_at") else None
-                        last_consolidated = data.get("last_consolidated", 0)
-                    else:
-                        messages.append(data)
-
-            return Session(
+                except json.JSONDecodeError:
+                    if i < len(lines) - 1:
+                        raise
+                    # A crash mid-append can leave a partial final line.
+                    logger.warning("Dropping truncated trailing record in session {}", key)
+                    torn = True
+                    break
+
+                if data.get("_type") == "metadata":
+                    metadata = data.get("metadata", {})
+                    created_at = datetime.fromisoformat(data["created_at"]) if data.get("created_at") else None
+                    updated_at = datetime.fromisoformat(data["updated_at"]) if data.get("updated_at") else None
+                    last_consolidated = data.get("last_consolidated", 0)
+                    meta_records += 1
+                else:
+                    messages.append(data)
+
+            session = Session(
                 key=key,
                 messages=messages,
                 created_at=created_at or datetime.now(),
+                updated_at=updated_at or datetime.now(),
                 metadata=metadata,
                 last_consolidated=last_consolidated
             )
+            # A torn file is rewritten on the next save; otherwise keep appending.
+            session._persisted = 0 if torn else len(messages)
+            session._meta_records = meta_records
+            session._saved_marker = () if torn else session._marker()
+            return session
         except Exception as e:
             logger.warning("Failed to load session {}: {}", key, e)
             return None
 
-    def save(self, session: Session) -> None:
-        """Save a session to disk."""
-        path = self._get_session_path(session.key)
-
-        with open(path, "w", encoding="utf-8") as f:
-            metadata_line = {
-                "_type": "metadata",
-                "key": session.key,
-                "created_at": session.created_at.isoformat(),
-                "updated_at": session.updated_at.isoformat(),
-                "metadata": session.metadata,
-                "last_consolidated": session.last_consolidated
-            }
-            f.write(json.dumps(metadata_line, ensure_ascii=False) + "\n")
-            for msg in session.messages:
-                f.write(json.dumps(msg, ensure_ascii=False) + "\n")
+    @staticmethod
+    def _metadata_line(session: Session) -> str:
+        return json.dumps({
+            "_type": "metadata",
+            "key": session.key,
+            "created_at": session.created_at.isoformat(),
+            "updated_at": session.updated_at.isoformat(),
+            "metadata": session.metadata,
+            "last_consolidated": session.last_consolidated
+        }, ensure_ascii=False) + "\n"
+
+    def save(self, session: Session, *, _touch: bool = True) -> None:
+        """
+        Save a session to disk.
 
-        self._cache[session.key] = session
+        Only messages added since the last save are written, followed by a
+        metadata record. The file is rewritten in full when the session is
+        new to this manager, when messages were removed (e.g. ``/new``), or
+        when ``compact_every`` metadata records have accumulated.
+        """
+        path = self._get_session_path(session.key)
+        persisted = session._persisted
+
+        if (
+            persisted == 0
+            or persisted > len(session.messages)
+            or session._meta_records >= self.compact_every
+            or not path.exists()
+        ):
+            self.compact(session, _touch=_touch)
+            return
+
+        lines = [json.dumps(m, ensure_ascii=False) + "\n" for m in session.messages[persisted:]]
+        lines.append(self._metadata_line(session))
+        with open(path, "a", encoding="utf-8") as f:
+            f.write("".join(lines))
+            self._sync(f)
+
+        session._persisted = len(session.messages)
+        session._meta_records += 1
+        session._saved_marker = session._marker()
+        if _touch:
+            self._touch(session)
+
+    def compact(self, session: Session, *, _touch: bool = True) -> None:
+        """Atomically rewrite a session file as one metadata header plus all messages."""
+        path = self._get_session_path(session.key)
+        tmp = path.with_suffix(".jsonl.tmp")
+
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(self._metadata_line(session))
+            f.write("".join(json.dumps(m, ensure_ascii=False) + "\n" for m in session.messages))
+            self._sync(f)
+        os.replace(tmp, path)
+        if self.fsync:
+            self._sync_dir(path.parent)
+
+        session._persisted = len(session.messages)
+        session._meta_records = 1
+        session._saved_marker = session._marker()
+        if _touch:
+            self._touch(session)
+
+    def _sync(self, f) -> None:
+        f.flush()
+        if self.fsync:
+            os.fsync(f.fileno())
+
+    @staticmethod
+    def _sync_dir(directory: Path) -> None:
+        """Persist a rename by syncing its directory entry (no-op where unsupported)."""
+        try:
+            fd = os.open(directory, os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
 
     def invalidate(self, key: str) -> None:
         """Remove a session from the in-memory cache."""
         self._cache.pop(key, None)
+        self._evicted.pop(key, None)
+        self._last_access.pop(key, None)
 
     def delete_session(self, key: str) -> bool:
         """
@@ -212,20 +475,49 @@ class SessionManager:
 
         for path in self.sessions_dir.glob("*.jsonl"):
             try:
-                # Read just the metadata line
+                # Read just the header and, for appended files, the trailing metadata record
                 with open(path, encoding="utf-8") as f:
                     first_line = f.readline().strip()
-                    if first_line:
-                        data = json.loads(first_line)
-                        if data.get("_type") == "metadata":
-                            key = data.get("key") or path.stem.replace("_", ":", 1)
-                            sessions.append({
-                                "key": key,
-                                "created_at": data.get("created_at"),
-                                "updated_at": data.get("updated_at"),
-                                "path": str(path)
-                            })
+                if first_line:
+                    data = json.loads(first_line)
+                    if data.get("_type") == "metadata":
+                        key = data.get("key") or path.stem.replace("_", ":", 1)
+                        updated_at = data.get("updated_at")
+                        metadata = data.get("metadata") or {}
+                        tail = self._read_last_line(path)
+                        if tail and tail != first_line:
+                            try:
+                                last = json.loads(tail)
+                            except json.JSONDecodeError:
+                                last = {}
+                            if last.get("_type") == "metadata":
+                                updated_at = last.get("updated_at", updated_at)
+                                metadata = last.get("metadata") or metadata
+                        sessions.append({
+                            "key": key,
+                            "created_at": data.get("created_at"),
+                            "updated_at": updated_at,
+                            "path": str(path),
+                            "usage": metadata.get("usage"),
+                        })
             except Exception:
                 continue
 
         return sorted(sessions, key=lambda x: x.get("updated_at", ""), reverse=True)
+
+    @staticmethod
+    def _read_last_line(path: Path, chunk: int = 8192) -> str:
+        """Return the last non-empty line of a file without reading all of it."""
+        with open(path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            pos = f.tell()
+            buf = b""
+            while pos > 0:
+                step = min(chunk, pos)
+                pos -= step
+                f.seek(pos)
+                buf = f.read(step) + buf
+                stripped = buf.rstrip(b"\n")
+                if b"\n" in stripped:
+                    return stripped.rsplit(b"\n", 1)[1].decode("utf-8", errors="replace").strip()
+            return buf.strip().decode("utf-8", errors="replace")
@@ -0,0 +1,83 @@
+"""Token estimation for budgeting conversation history."""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Protocol
+
+_MESSAGE_OVERHEAD = 4  # Role and separators the chat format adds per message
+_IMAGE_TOKENS = 765  # Typical cost of one image part at "auto" detail
+
+
+class TokenEstimator(Protocol):
+    """Counts the tokens of one chat message. ``name`` keys the per-message cache."""
+
+    name: str
+
+    def __call__(self, message: dict[str, Any]) -> int: ...
+
+
+def estimate_text_tokens(text: str) -> int:
+    """~4 ASCII characters per token; other characters (CJK, emoji) count one each."""
+    ascii_chars = len(text.encode("ascii", "ignore"))
+    return (ascii_chars + 3) // 4 + (len(text) - ascii_chars)
+
+
+class HeuristicEstimator:
+    """Dependency-free estimate; errs on the high side for non-English text."""
+
+    name = "heuristic"
+
+    def __call__(self, message: dict[str, Any]) -> int:
+        content = message.get("content")
+        tokens = _MESSAGE_OVERHEAD
+        if isinstance(content, str):
+            tokens += estimate_text_tokens(content)
+        elif isinstance(content, list):
+            for part in content:
+                if not isinstance(part, dict):
+                    continue
+                if part.get("type") == "image_url":
+                    tokens += _IMAGE_TOKENS
+                else:
+                    tokens += estimate_text_tokens(str(part.get("text", "")))
+        if message.get("tool_calls"):
+            tokens += estimate_text_tokens(json.dumps(message["tool_calls"], ensure_ascii=False))
+        return tokens
+
+
+class LiteLLMEstimator:
+    """Count with the model's own tokenizer via litellm, falling back to the heuristic."""
+
+    def __init__(self, model: str):
+        self.model = model
+        self.name = f"litellm:{model}"
+        self._fallback = HeuristicEstimator()
+
+    def __call__(self, message: dict[str, Any]) -> int:
+        import litellm
+
+        entry = {k: message[k] for k in ("role", "content", "tool_calls", "tool_call_id", "name") if k in message}
+        try:
+            return litellm.token_counter(model=self.model, messages=[entry])
+        except Exception:
+            return self._fallback(message)
+
+
+def get_estimator(tokenizer: str, model: str | None = None) -> TokenEstimator:
+    """Build the estimator named in config: "heuristic" or "model"."""
+    if tokenizer == "model" and model:
+        return LiteLLMEstimator(model)
+    return HeuristicEstimator()
+
+
+def message_tokens(message: dict[str, Any], estimator: TokenEstimator) -> int:
+    """Token count of a message, cached on the message under ``_tokens``."""
+    cache = message.get("_tokens")
+    if not isinstance(cache, dict):
+        cache = {}
+    if (cached := cache.get(estimator.name)) is not None:
+        return cached
+    count = estimator(message)
+    message["_tokens"] = {**cache, estimator.name: count}
+    return count
@@ -0,0 +1,74 @@
+"""Token usage accounting kept in session metadata."""
+
+from __future__ import annotations
+
+from typing import Any
+
+USAGE_KEYS = ("prompt_tokens", "completion_tokens", "total_tokens", "cached_tokens", "cache_creation_tokens")
+
+
+def add_usage(into: dict[str, int], usage: dict[str, Any], *, requests: int = 1) -> dict[str, int]:
+    """Add one LLM response's token counts (or another total) to ``into``."""
+    for key in USAGE_KEYS:
+        if (value := usage.get(key)) is not None:  # Keep reported zeros, e.g. cached_tokens = 0
+            into[key] = into.get(key, 0) + int(value)
+    into["requests"] = into.get("requests", 0) + requests
+    return into
+
+
+def merge_usage(into: dict[str, int], other: dict[str, int]) -> dict[str, int]:
+    """Add an accumulated total (including its request and turn counts) to ``into``."""
+    add_usage(into, other, requests=other.get("requests", 0))
+    if other.get("turns"):
+        into["turns"] = into.get("turns", 0) + other["turns"]
+    return into
+
+
+def cache_hit_rate(usage: dict[str, int]) -> float | None:
+    """Share of prompt tokens served from the provider's prompt cache, if it reports that."""
+    prompt = usage.get("prompt_tokens", 0)
+    if not prompt or "cached_tokens" not in usage:
+        return None
+    return usage["cached_tokens"] / prompt
+
+
+def record_turn(metadata: dict[str, Any], turn: dict[str, dict[str, int]]) -> None:
+    """
+    Fold one turn's usage, keyed by the model that served each call, into
+    session metadata::
+
+        {"usage": {"total": {...}, "models": {model: {...}}, "last_turn": {...}}}
+    """
+    turn = {model: counts for model, counts in turn.items() if counts.get("requests")}
+    if not turn:
+        return
+    total: dict[str, int] = {"turns": 1}
+    for counts in turn.values():
+        merge_usage(total, counts)
+    usage = metadata.setdefault("usage", {})
+    merge_usage(usage.setdefault("total", {}), total)
+    for model, counts in turn.items():
+        merge_usage(usage.setdefault("models", {}).setdefault(model, {}), {**counts, "turns": 1})
+    usage["last_turn"] = total
+
+
+def summarize(sessions: list[dict[str, Any]]) -> dict[str, Any]:
+    """
+    Aggregate the usage of sessions as returned by ``SessionManager.list_sessions``
+    into totals by session, model and channel (the part of the key before ':').
+    """
+    total: dict[str, int] = {}
+    by_model: dict[str, dict[str, int]] = {}
+    by_channel: dict[str, dict[str, int]] = {}
+    by_session: dict[str, dict[str, int]] = {}
+    for info in sessions:
+        usage = info.get("usage") or {}
+        if not usage.get("total"):
+            continue
+        key = info.get("key", "")
+        by_session[key] = dict(usage["total"])
+        merge_usage(total, usage["total"])
+        merge_usage(by_channel.setdefault(key.split(":", 1)[0], {}), usage["total"])
+        for model, counts in (usage.get("models") or {}).items():
+            merge_usage(by_model.setdefault(model, {}), counts)
+    return {"total": total, "by_model": by_model, "by_channel": by_channel, "by_session": by_session}
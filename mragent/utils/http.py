@@ -0,0 +1,54 @@
+"""Process-wide pooled HTTP clients."""
+
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import weakref
+
+import httpx
+
+# Redirects are opt-in per request (follow_redirects=True); when followed,
+# chains are capped here so web_fetch can't be bounced around indefinitely.
+MAX_REDIRECTS = 5
+
+_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=30.0)
+_TIMEOUT = httpx.Timeout(30.0)
+_HTTP2 = importlib.util.find_spec("h2") is not None
+
+# Connection pools are tied to the event loop they were created on, so clients
+# are kept per loop and keyed by the settings that can't change per request.
+_clients: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop, dict[tuple[str | None, bool], httpx.AsyncClient]
+] = weakref.WeakKeyDictionary()
+
+
+def get_http_client(proxy: str | None = None, verify: bool = True) -> httpx.AsyncClient:
+    """
+    Return the shared client for these proxy/verify settings.
+
+    Callers must not close it or use it as a context manager; pass timeouts,
+    headers and follow_redirects per request instead. Pools are released by
+    close_http_clients() at shutdown.
+    """
+    loop = asyncio.get_running_loop()
+    pool = _clients.setdefault(loop, {})
+    key = (proxy or None, verify)
+    client = pool.get(key)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            proxy=proxy or None,
+            verify=verify,
+            http2=_HTTP2,
+            limits=_LIMITS,
+            timeout=_TIMEOUT,
+            max_redirects=MAX_REDIRECTS,
+        )
+        pool[key] = client
+    return client
+
+
+async def close_http_clients() -> None:
+    """Close every shared client created on the running event loop."""
+    pool = _clients.pop(asyncio.get_running_loop(), {})
+    await asyncio.gather(*(c.aclose() for c in pool.values()), return_exceptions=True)
@@ -0,0 +1,35 @@
+"""Standalone /metrics endpoint for processes without the web UI (the gateway)."""
+
+from __future__ import annotations
+
+from aiohttp import web
+from loguru import logger
+
+from mragent.utils import metrics
+
+
+async def handle_metrics(request: web.Request) -> web.Response:
+    """Serve all process metrics in Prometheus text format."""
+    return web.Response(body=metrics.render().encode("utf-8"), headers={"Content-Type": metrics.CONTENT_TYPE})
+
+
+class MetricsServer:
+    """Minimal aiohttp app serving GET /metrics."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 18790):
+        self.host = host
+        self.port = port
+        self._runner: web.AppRunner | None = None
+
+    async def start(self) -> None:
+        app = web.Application()
+        app.router.add_get("/metrics", handle_metrics)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+        logger.info("Metrics served at http://{}:{}/metrics", self.host, self.port)
+
+    async def stop(self) -> None:
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
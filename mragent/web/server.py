@@ -6,6 +6,8 @@ Routes:
   POST /api/chat      → chat with agent (JSON)
   WS   /ws            → streaming agent responses
   POST /api/voice     → audio → Groq transcription → text
+  GET  /api/usage     → token usage by session, model and channel
+  GET  /metrics       → Prometheus metrics
 """
 
 from __future__ import annotations
@@ -21,6 +23,8 @@ from typing import TYPE_CHECKING
 from aiohttp import WSMsgType, web
 from loguru import logger
 
+from mragent.web.metrics import handle_metrics
+
 if TYPE_CHECKING:
     from mragent.agent.loop import AgentLoop
 
@@ -61,6 +65,8 @@ class WebServer:
         app.router.add_get("/api/history", self._handle_get_history)
         app.router.add_delete("/api/history", self._handle_delete_history)
         app.router.add_get("/api/sessions", self._handle_get_sessions)
+        app.router.add_get("/api/usage", self._handle_usage)
+        app.router.add_get("/metrics", handle_metrics)
         return app
 
     # ------------------------------------------------------------------
@@ -172,6 +178,16 @@ class WebServer:
             logger.error("Sessions list error: {}", e)
             return web.json_response({"error": str(e)}, status=500)
 
+    async def _handle_usage(self, request: web.Request) -> web.Response:
+        """GET /api/usage — token usage and cache hits summed over all sessions."""
+        from mragent.session.usage import summarize
+
+        try:
+            return web.json_response(summarize(self.agent.sessions.list_sessions()))
+        except Exception as e:
+            logger.error("Usage summary error: {}", e)
+            return web.json_response({"error": str(e)}, status=500)
+
     # ------------------------------------------------------------------
     # WebSocket streaming
     # ------------------------------------------------------------------
@@ -206,6 +222,10 @@ class WebServer:
                                 "tool_hint": tool_hint,
                             })
 
+                    async def _stream(content: str) -> None:
+                        if not ws.closed:
+                            await ws.send_json({"type": "stream", "content": content})
+
                     try:
                         response = await self.agent.process_direct(
                             message,
@@ -214,6 +234,7 @@ class WebServer:
                             chat_id="user",
                             on_progress=_progress,
                             media=media,
+                            on_stream=_stream,
                         )
                         if not ws.closed:
                             await ws.send_json({"type": "response", "content": response or ""})
@@ -342,15 +363,16 @@ class WebServer:
             return web.json_response({"error": "Key must start with 'nvapi-'"}, status=400)
 
         import httpx
+
+        from mragent.utils.http import get_http_client
         try:
-            async with httpx.AsyncClient() as client:
-                resp = await client.get(
-                    "https://integrate.api.nvidia.com/v1/models",
-                    headers={"Authorization": f"Bearer {api_key}"},
-                    timeout=20.0,
-                )
-                resp.raise_for_status()
-                data = resp.json()
+            resp = await get_http_client().get(
+                "https://integrate.api.nvidia.com/v1/models",
+                headers={"Authorization": f"Bearer {api_key}"},
+                timeout=20.0,
+            )
+            resp.raise_for_status()
+            data = resp.json()
         except httpx.HTTPStatusError as e:
             return web.json_response(
                 {"error": f"NVIDIA API error: {e.response.status_code}"},
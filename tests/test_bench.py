@@ -0,0 +1,39 @@
+"""Agent loop benchmark with a scripted provider (no network)."""
+
+import pytest
+
+from mragent.bench import BenchConfig, compare, run_bench
+
+
+@pytest.mark.asyncio
+async def test_bench_drives_concurrent_chats_through_the_loop(tmp_path) -> None:
+    cfg = BenchConfig(chats=3, turns=2, latency_ms=0, tool_rounds=1, tool_calls=2, response_chars=50)
+
+    result = await run_bench(cfg, workspace=tmp_path)
+
+    assert result["turns"] == 6
+    assert result["llm_calls"] == 12  # One tool round + one answer per turn
+    stages = result["stages"]
+    assert {s: stages[s]["calls"] for s in stages} == {
+        "build_messages": 6, "save_turn": 6, "session_save": 6, "tool_dispatch": 6,
+    }
+    assert result["latency_ms"]["p99"] >= result["latency_ms"]["p50"] > 0
+    assert result["throughput_turns_per_s"] > 0
+    assert compare(result, result) == []
+
+
+def test_compare_flags_slowdowns_beyond_tolerance() -> None:
+    baseline = {
+        "latency_ms": {"p50": 10.0, "p99": 20.0},
+        "stages": {"session_save": {"mean": 2.0}, "save_turn": {"mean": 0.01}},
+        "throughput_turns_per_s": 100.0,
+    }
+    result = {
+        "latency_ms": {"p50": 11.0, "p99": 40.0},
+        "stages": {"session_save": {"mean": 5.0}, "save_turn": {"mean": 0.1}},
+        "throughput_turns_per_s": 50.0,
+    }
+
+    regressions = compare(result, baseline, tolerance=0.2)
+
+    assert [r.split(":")[0] for r in regressions] == ["latency p99", "session_save mean", "throughput"]
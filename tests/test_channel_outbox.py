@@ -0,0 +1,112 @@
+"""Tests for per-channel outbound queues."""
+
+import asyncio
+
+import pytest
+
+from mragent.bus.events import OutboundMessage
+from mragent.bus.queue import MessageBus
+from mragent.channels.base import BaseChannel
+from mragent.channels.manager import ChannelManager
+from mragent.channels.outbox import ChannelOutbox
+from mragent.config.schema import Config
+
+
+class _RecordingChannel(BaseChannel):
+    name = "recording"
+
+    def __init__(self, delay: float = 0.0, fail: bool = False):
+        super().__init__(config=None, bus=MessageBus())
+        self.delay = delay
+        self.fail = fail
+        self.sent: list[str] = []
+
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+    async def send(self, msg: OutboundMessage) -> None:
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("boom")
+        self.sent.append(msg.content)
+
+
+def _msg(channel: str, content: str, chat_id: str = "c1") -> OutboundMessage:
+    return OutboundMessage(channel=channel, chat_id=chat_id, content=content)
+
+
+@pytest.mark.asyncio
+async def test_slow_channel_does_not_block_others() -> None:
+    manager = ChannelManager(Config(), MessageBus())
+    slow, fast = _RecordingChannel(delay=0.5), _RecordingChannel()
+    manager.channels = {"slow": slow, "fast": fast}
+    manager.outboxes = {name: ChannelOutbox(ch) for name, ch in manager.channels.items()}
+    for outbox in manager.outboxes.values():
+        outbox.start()
+    dispatcher = asyncio.create_task(manager._dispatch_outbound())
+    try:
+        await manager.bus.publish_outbound(_msg("slow", "a"))
+        await manager.bus.publish_outbound(_msg("fast", "b"))
+        await asyncio.sleep(0.1)
+        assert fast.sent == ["b"]
+        assert slow.sent == []
+        assert manager.get_status()["slow"]["outbound"]["queue_depth"] == 0
+    finally:
+        dispatcher.cancel()
+        for outbox in manager.outboxes.values():
+            await outbox.stop()
+
+
+@pytest.mark.asyncio
+async def test_lanes_keep_per_chat_order_and_record_stats() -> None:
+    channel = _RecordingChannel(delay=0.01)
+    outbox = ChannelOutbox(channel, lanes=4)
+    outbox.start()
+    try:
+        for i in range(5):
+            for chat in ("x", "y"):
+                outbox.submit(_msg("recording", f"{chat}{i}", chat_id=chat))
+        await asyncio.gather(*(q.join() for q in outbox._queues))
+    finally:
+        await outbox.stop()
+
+    assert [c for c in channel.sent if c.startswith("x")] == [f"x{i}" for i in range(5)]
+    assert [c for c in channel.sent if c.startswith("y")] == [f"y{i}" for i in range(5)]
+    stats = outbox.snapshot()
+    assert stats["sent"] == 10 and stats["queue_depth"] == 0
+    assert stats["send_latency_max_ms"] > 0
+
+
+@pytest.mark.asyncio
+async def test_full_queue_drops_and_failures_are_counted() -> None:
+    outbox = ChannelOutbox(_RecordingChannel(fail=True), maxsize=1)
+
+    assert outbox.submit(_msg("recording", "a")) is True
+    assert outbox.submit(_msg("recording", "b")) is False
+
+    outbox.start()
+    await outbox._queues[0].join()
+    await outbox.stop()
+    assert outbox.snapshot()["dropped"] == 1
+    assert outbox.snapshot()["failed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_stop_drains_queued_messages_within_timeout() -> None:
+    channel = _RecordingChannel(delay=0.01)
+    outbox = ChannelOutbox(channel)
+    outbox.start()
+    for i in range(3):
+        outbox.submit(_msg("recording", f"m{i}"))
+    await outbox.stop()
+    assert channel.sent == ["m0", "m1", "m2"]
+
+    stuck = ChannelOutbox(_RecordingChannel(delay=10))
+    stuck.start()
+    for i in range(3):
+        stuck.submit(_msg("recording", f"m{i}"))
+    await stuck.stop(drain_timeout=0.05)
+    assert stuck.snapshot()["dropped"] == 3 and stuck.snapshot()["sent"] == 0
@@ -177,6 +177,213 @@ class TestSessionPersistence:
         session.clear()
         assert len(session.messages) == 0
 
+    def test_save_appends_only_new_messages(self, temp_manager):
+        """Test that a second save appends instead of rewriting the file."""
+        session = create_session_with_messages("test:append", 10)
+        temp_manager.save(session)
+        path = temp_manager._get_session_path("test:append")
+        before = path.read_text(encoding="utf-8")
+
+        session.add_message("user", "msg10")
+        session.last_consolidated = 4
+        temp_manager.save(session)
+        after = path.read_text(encoding="utf-8")
+
+        assert after.startswith(before)
+        appended = after[len(before):].splitlines()
+        assert len(appended) == 2  # one message + trailing metadata record
+        assert '"_type": "metadata"' in appended[-1]
+
+        temp_manager.invalidate("test:append")
+        reloaded = temp_manager.get_or_create("test:append")
+        assert len(reloaded.messages) == 11
+        assert reloaded.last_consolidated == 4
+        assert temp_manager.list_sessions()[0]["updated_at"] == session.updated_at.isoformat()
+
+    def test_save_compacts_after_threshold(self, tmp_path):
+        """Test that accumulated metadata records are compacted into one header."""
+        manager = SessionManager(Path(tmp_path), fsync=False, compact_every=3)
+        session = create_session_with_messages("test:compact", 2)
+        for i in range(5):
+            session.add_message("user", f"extra{i}")
+            manager.save(session)
+
+        lines = manager._get_session_path("test:compact").read_text(encoding="utf-8").splitlines()
+        assert sum('"_type": "metadata"' in line for line in lines) <= 3
+
+        manager.invalidate("test:compact")
+        assert len(manager.get_or_create("test:compact").messages) == 7
+
+    def test_clear_rewrites_file(self, temp_manager):
+        """Test that dropping messages forces a full rewrite."""
+        session = create_session_with_messages("test:new", 5)
+        temp_manager.save(session)
+        session.clear()
+        temp_manager.save(session)
+
+        temp_manager.invalidate("test:new")
+        assert temp_manager.get_or_create("test:new").messages == []
+
+    def test_load_legacy_file_then_append(self, temp_manager):
+        """Test that files written by the old full-rewrite format still load and append."""
+        path = temp_manager._get_session_path("test:legacy")
+        path.write_text(
+            '{"_type": "metadata", "key": "test:legacy", "created_at": "2025-01-01T00:00:00", '
+            '"updated_at": "2025-01-01T00:00:00", "metadata": {}, "last_consolidated": 1}\n'
+            '{"role": "user", "content": "old"}\n',
+            encoding="utf-8",
+        )
+        session = temp_manager.get_or_create("test:legacy")
+        assert session.last_consolidated == 1
+        session.add_message("assistant", "new")
+        temp_manager.save(session)
+
+        temp_manager.invalidate("test:legacy")
+        reloaded = temp_manager.get_or_create("test:legacy")
+        assert [m["content"] for m in reloaded.messages] == ["old", "new"]
+
+    def test_load_drops_truncated_trailing_record(self, temp_manager):
+        """Test that a partial final line from a crash does not lose the session."""
+        session = create_session_with_messages("test:torn", 3)
+        temp_manager.save(session)
+        path = temp_manager._get_session_path("test:torn")
+        with open(path, "a", encoding="utf-8") as f:
+            f.write('{"role": "user", "cont')
+
+        temp_manager.invalidate("test:torn")
+        reloaded = temp_manager.get_or_create("test:torn")
+        assert len(reloaded.messages) == 3
+
+        reloaded.add_message("user", "after")
+        temp_manager.save(reloaded)
+        temp_manager.invalidate("test:torn")
+        assert len(temp_manager.get_or_create("test:torn").messages) == 4
+
+
+
+class TestSessionCache:
+    """Test the bounded LRU session cache."""
+
+    def test_lru_evicts_and_flushes_dirty_sessions(self, tmp_path):
+        manager = SessionManager(Path(tmp_path), fsync=False, max_cached_sessions=2)
+        a = manager.get_or_create("test:a")
+        a.add_message("user", "unsaved")
+        manager.get_or_create("test:b")
+        manager.get_or_create("test:c")  # pushes "test:a" out
+
+        assert "test:a" not in manager._cache
+        assert manager._get_session_path("test:a").exists()
+        stats = manager.cache_stats()
+        assert stats["evictions"] == 1
+        assert stats["misses"] == 3
+
+        del a
+        reloaded = manager.get_or_create("test:a")
+        assert [m["content"] for m in reloaded.messages] == ["unsaved"]
+
+    def test_evicted_session_in_use_is_returned_as_same_object(self, tmp_path):
+        manager = SessionManager(Path(tmp_path), fsync=False, max_cached_sessions=1)
+        held = manager.get_or_create("test:busy")
+        manager.get_or_create("test:other")
+
+        assert manager.get_or_create("test:busy") is held
+        assert manager.cache_stats()["hits"] == 1
+
+    def test_cache_counters_are_exported_as_metrics(self, tmp_path):
+        from mragent.session import manager as manager_module
+        from mragent.utils import metrics
+
+        lookups, evictions = manager_module._CACHE_LOOKUPS, manager_module._CACHE_EVICTIONS
+        before = (lookups.value(result="hit"), lookups.value(result="miss"), evictions.value())
+        manager = SessionManager(Path(tmp_path), fsync=False, max_cached_sessions=1)
+        held = manager.get_or_create("test:a")
+        held.add_message("user", "hi")
+        manager.get_or_create("test:b")
+        manager.get_or_create("test:a")
+
+        assert lookups.value(result="hit") - before[0] == 1
+        assert lookups.value(result="miss") - before[1] == 2
+        assert evictions.value() - before[2] == 2
+        rendered = metrics.render()
+        assert "mragent_session_cache_size 1" in rendered
+        assert "mragent_session_cache_messages 1" in rendered
+
+    def test_message_bound_and_idle_ttl(self, tmp_path):
+        manager = SessionManager(Path(tmp_path), fsync=False, max_cached_messages=5, idle_ttl_s=None)
+        big = create_session_with_messages("test:big", 6)
+        manager.save(big)
+        manager.get_or_create("test:small")
+        assert list(manager._cache) == ["test:small"]
+
+        manager.idle_ttl_s = 0
+        manager.get_or_create("test:next")
+        assert list(manager._cache) == ["test:next"]
+
+
+class TestHistoryTokenBudget:
+    """Test token-budgeted history windowing."""
+
+    class _CharEstimator:
+        name = "chars"
+
+        def __init__(self):
+            self.calls = 0
+
+        def __call__(self, message):
+            self.calls += 1
+            return len(message.get("content") or "")
+
+    def _tool_session(self) -> Session:
+        session = Session(key="test:budget")
+        session.add_message("user", "a" * 50)
+        session.add_message("assistant", "b" * 50)
+        session.add_message("user", "c" * 10)
+        session.add_message("assistant", "", tool_calls=[{"id": "t1", "type": "function",
+                                                          "function": {"name": "x", "arguments": "{}"}}])
+        session.add_message("tool", "d" * 10, tool_call_id="t1", name="x")
+        session.add_message("assistant", "e" * 10)
+        return session
+
+    def test_budget_keeps_whole_recent_turns(self):
+        session = self._tool_session()
+        estimator = self._CharEstimator()
+
+        history = session.get_history(max_tokens=40, estimator=estimator)
+        assert [m["role"] for m in history] == ["user", "assistant", "tool", "assistant"]
+        assert history[1]["tool_calls"][0]["id"] == history[2]["tool_call_id"]
+
+        assert session.get_history(max_tokens=200, estimator=estimator)[0]["content"] == "a" * 50
+        tight = session.get_history(max_tokens=20, estimator=estimator)
+        assert [m["content"] for m in tight] == ["c" * 10, "", "\n... (truncated, 10 more chars)", "e" * 10]
+
+    def test_latest_turn_is_kept_with_tool_results_truncated(self):
+        session = self._tool_session()
+        session.add_message("user", "f" * 10)
+        session.add_message("assistant", "", tool_calls=[{"id": "t2", "type": "function",
+                                                          "function": {"name": "x", "arguments": "{}"}}])
+        session.add_message("tool", "g" * 400, tool_call_id="t2", name="x")
+        session.add_message("assistant", "h" * 10)
+        estimator = self._CharEstimator()
+
+        history = session.get_history(max_tokens=100, estimator=estimator)
+
+        assert [m["role"] for m in history] == ["user", "assistant", "tool", "assistant"]
+        assert history[2]["tool_call_id"] == "t2"
+        assert history[2]["content"].startswith("g" * 80 + "\n... (truncated")
+        assert len(session.messages[-2]["content"]) == 400  # Stored history is untouched
+        assert history[0]["content"] == "f" * 10 and history[3]["content"] == "h" * 10
+
+    def test_token_counts_are_cached_on_messages(self):
+        session = self._tool_session()
+        estimator = self._CharEstimator()
+
+        session.get_history(max_tokens=1000, estimator=estimator)
+        session.get_history(max_tokens=1000, estimator=estimator)
+
+        assert estimator.calls == len(session.messages)
+        assert session.messages[0]["_tokens"] == {"chars": 50}
+        assert all("_tokens" not in m for m in session.get_history(max_tokens=1000, estimator=estimator))
+
 
 class TestConsolidationTriggerConditions:
     """Test consolidation trigger conditions and logic."""
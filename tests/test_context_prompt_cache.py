@@ -7,6 +7,7 @@ from pathlib import Path
 import datetime as datetime_module
 
 from mragent.agent.context import ContextBuilder
+from mragent.agent.memory_index import parse_memory
 
 
 class _FakeDatetime(real_datetime):
@@ -63,3 +64,89 @@ def test_runtime_context_is_separate_untrusted_user_message(tmp_path) -> None:
     assert "Channel: cli" in user_content
     assert "Chat ID: direct" in user_content
     assert "Return exactly: OK" in user_content
+
+
+def test_system_prompt_is_cached_until_an_input_changes(tmp_path, monkeypatch) -> None:
+    """Prompt should be rebuilt only when a bootstrap, memory or skill file changes."""
+    workspace = _make_workspace(tmp_path)
+    builder = ContextBuilder(workspace)
+    builds = 0
+    assemble = builder._assemble_system_prompt
+
+    def _counting_assemble() -> str:
+        nonlocal builds
+        builds += 1
+        return assemble()
+
+    monkeypatch.setattr(builder, "_assemble_system_prompt", _counting_assemble)
+
+    first = builder.build_system_prompt()
+    assert builder.build_system_prompt() == first
+    assert builds == 1
+
+    (workspace / "USER.md").write_text("Name: Ada", encoding="utf-8")
+    assert "Name: Ada" in builder.build_system_prompt()
+    assert builds == 2
+
+    builder.memory.write_long_term("Likes tea")
+    assert "Likes tea" in builder.build_system_prompt()
+
+    skill = workspace / "skills" / "brew"
+    skill.mkdir(parents=True)
+    (skill / "SKILL.md").write_text("---\ndescription: Brew tea\n---\nSteps", encoding="utf-8")
+    assert "Brew tea" in builder.build_system_prompt()
+    assert builds == 4
+
+
+def test_large_memory_is_filtered_to_relevant_facts(tmp_path) -> None:
+    workspace = _make_workspace(tmp_path)
+    builder = ContextBuilder(workspace, memory_max_tokens=60, memory_top_k=2)
+    facts = "\n".join(f"- Filler fact number {i} about gardening chores." for i in range(20))
+    builder.memory.write_long_term(
+        "## Pinned\n- User's name is Ada.\n\n"
+        "## Preferences\n- Drinks oolong tea every morning.\n- Prefers dark mode in editors.\n\n"
+        f"## Misc\n{facts}\n"
+    )
+
+    system = builder.build_messages(history=[], current_message="What tea should I buy?")[0]["content"]
+    assert system.startswith(builder.build_system_prompt())  # Cached part stays a stable prefix
+    memory = system.rsplit("# Memory\n", 1)[1]
+    assert "User's name is Ada." in memory
+    assert "## Preferences\n\n- Drinks oolong tea" in memory
+    assert "dark mode" not in memory and "gardening" not in memory
+
+    history = [{"role": "user", "content": "Which editor theme do I like?"}]
+    memory = builder.build_messages(history=history, current_message="ok")[0]["content"].rsplit("# Memory\n", 1)[1]
+    assert "dark mode" in memory
+
+
+def test_small_memory_is_included_whole(tmp_path) -> None:
+    workspace = _make_workspace(tmp_path)
+    builder = ContextBuilder(workspace, memory_max_tokens=500)
+    builder.memory.write_long_term("# Notes\nLikes tea\n\nLives in Lisbon")
+
+    system = builder.build_messages(history=[], current_message="hello")[0]["content"]
+    assert "# Notes\n\nLikes tea\n\nLives in Lisbon" in system
+    assert "Showing" not in system
+
+
+def test_fenced_code_stays_with_its_fact() -> None:
+    facts = parse_memory(
+        "## Setup\n- Deploy with:\n\n```bash\n# build first\nmake\n\nmake deploy\n```\n"
+        "Staging runs nightly.\n\n## Pinned\n- User's name is Ada.\n"
+    )
+
+    assert [(f.section, f.pinned) for f in facts] == [("## Setup", False)] * 2 + [("## Pinned", True)]
+    assert facts[0].text == "- Deploy with:\n\n```bash\n# build first\nmake\n\nmake deploy\n```"
+    assert facts[1].text == "Staging runs nightly."
+
+
+def test_nested_items_stay_with_their_parent() -> None:
+    facts = parse_memory(
+        "## Pets\n- Cat named Miso\n  - Allergic to fish\n  - Vet on Fridays\n\n  Adopted in 2021.\n- Dog named Rex\n"
+    )
+
+    assert [f.text for f in facts] == [
+        "- Cat named Miso\n  - Allergic to fish\n  - Vet on Fridays\n\n  Adopted in 2021.",
+        "- Dog named Rex",
+    ]
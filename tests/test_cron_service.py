@@ -2,6 +2,7 @@ import asyncio
 
 import pytest
 
+from mragent.agent.tools.cron import CronTool
 from mragent.cron.service import CronService
 from mragent.cron.types import CronSchedule
 
@@ -59,3 +60,143 @@ async def test_running_service_honors_external_disable(tmp_path) -> None:
         assert called == []
     finally:
         service.stop()
+
+
+def test_changes_are_journaled_and_compacted(tmp_path) -> None:
+    store_path = tmp_path / "cron" / "jobs.json"
+    service = CronService(store_path, compact_every=3)
+    a = service.add_job(name="a", schedule=CronSchedule(kind="every", every_ms=60_000), message="a")
+    service.add_job(name="b", schedule=CronSchedule(kind="every", every_ms=60_000), message="b")
+
+    assert not store_path.exists()
+    assert len(service.journal_path.read_text().splitlines()) == 2
+
+    reloaded = CronService(store_path)
+    assert {j.name for j in reloaded.list_jobs()} == {"a", "b"}
+
+    service.enable_job(a.id, enabled=False)  # Third record triggers compaction
+    assert service.journal_path.read_text() == ""
+    assert [j.name for j in CronService(store_path).list_jobs()] == ["b"]
+
+
+@pytest.mark.asyncio
+async def test_due_jobs_come_off_the_heap_in_order(tmp_path) -> None:
+    ran: list[str] = []
+
+    async def on_job(job) -> None:
+        ran.append(job.name)
+
+    service = CronService(tmp_path / "cron" / "jobs.json", on_job=on_job)
+    for name, every in (("slow", 300), ("fast", 100), ("never", 60_000)):
+        service.add_job(name=name, schedule=CronSchedule(kind="every", every_ms=every), message=name)
+    service.remove_job(service.list_jobs()[-1].id)
+
+    assert service._get_next_wake_ms() == service.list_jobs()[0].state.next_run_at_ms
+    due = service._pop_due(service.list_jobs()[1].state.next_run_at_ms)
+    assert [j.name for j in due] == ["fast", "slow"]
+    for job in due:
+        await service._execute_job(job)
+    assert ran == ["fast", "slow"]
+    assert service.status()["jobs"] == 2
+
+
+@pytest.mark.asyncio
+async def test_due_jobs_run_concurrently_and_overlap_is_skipped(tmp_path) -> None:
+    release = asyncio.Event()
+    started: list[str] = []
+
+    async def on_job(job) -> None:
+        started.append(job.name)
+        await release.wait()
+
+    service = CronService(tmp_path / "cron" / "jobs.json", on_job=on_job)
+    service._running = True
+    a = service.add_job(name="a", schedule=CronSchedule(kind="every", every_ms=60_000), message="a")
+    b = service.add_job(name="b", schedule=CronSchedule(kind="every", every_ms=60_000), message="b")
+
+    service._dispatch(a, 1)
+    service._dispatch(b, 1)
+    await asyncio.sleep(0.01)
+    assert sorted(started) == ["a", "b"]  # Neither waits for the other
+
+    service._dispatch(a, 2)  # Still running with overlap="skip"
+    assert a.state.last_status == "skipped"
+    assert service.status()["running"] == 2
+
+    release.set()
+    await asyncio.sleep(0.01)
+    assert service.status()["running"] == 0
+    assert started.count("a") == 1
+    assert a.state.last_status == "ok"
+    assert a.state.last_duration_ms is not None and a.state.last_lateness_ms > 0
+
+
+@pytest.mark.asyncio
+async def test_queued_runs_start_after_the_current_one(tmp_path) -> None:
+    release = asyncio.Event()
+    runs = 0
+
+    async def on_job(job) -> None:
+        nonlocal runs
+        runs += 1
+        await release.wait()
+
+    service = CronService(tmp_path / "cron" / "jobs.json", on_job=on_job)
+    service._running = True
+    job = service.add_job(
+        name="q", schedule=CronSchedule(kind="every", every_ms=60_000), message="q", overlap="queue",
+    )
+    service._dispatch(job, 1)
+    service._dispatch(job, 2)
+    await asyncio.sleep(0.01)
+    assert runs == 1 and service.status()["queued"] == 1
+
+    release.set()
+    await asyncio.sleep(0.01)
+    assert runs == 2 and service.status()["queued"] == 0
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(("misfire", "expected"), [("run_once", 1), ("catch_up", 3), ("skip", 0)])
+async def test_misfired_runs_follow_policy(tmp_path, misfire, expected) -> None:
+    store_path = tmp_path / "cron" / "jobs.json"
+    ran: list[str] = []
+
+    async def on_job(job) -> None:
+        ran.append(job.id)
+
+    writer = CronService(store_path)
+    job = writer.add_job(
+        name="m", schedule=CronSchedule(kind="every", every_ms=60_000), message="m",
+        misfire=misfire, overlap="queue",
+    )
+    job.state.next_run_at_ms -= 3 * 60_000  # Missed three runs while "down"
+    writer._save_store()
+
+    service = CronService(store_path, on_job=on_job)
+    await service.start()
+    try:
+        await asyncio.sleep(0.05)
+        assert len(ran) == expected
+        assert service.list_jobs()[0].state.next_run_at_ms > writer._jobs[job.id].state.next_run_at_ms
+    finally:
+        service.stop()
+
+
+@pytest.mark.asyncio
+async def test_cron_tool_passes_run_policies_through(tmp_path) -> None:
+    service = CronService(tmp_path / "cron" / "jobs.json")
+    tool = CronTool(service)
+    tool.set_context("telegram", "42")
+
+    result = await tool.execute(
+        action="add", message="sync inbox", every_seconds=60, max_concurrency=2, overlap="queue", misfire="catch_up",
+    )
+    assert result.startswith("Created job")
+    job = service.list_jobs()[0]
+    assert (job.max_concurrency, job.overlap, job.misfire) == (2, "queue", "catch_up")
+
+    assert tool.validate_params({"action": "add", "overlap": "sometimes"})
+    assert "overlap must be one of" in await tool.execute(action="add", message="x", every_seconds=60, overlap="bad")
+    assert "misfire must be one of" in await tool.execute(action="add", message="x", every_seconds=60, misfire="bad")
+    assert len(service.list_jobs()) == 1
@@ -0,0 +1,100 @@
+"""Tests for the daemon socket server and its thin client."""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from mragent.bus.events import OutboundMessage
+from mragent.bus.queue import MessageBus
+from mragent.daemon import DaemonServer, DaemonUnavailableError, ask, ping
+
+
+class FakeAgent:
+    def __init__(self) -> None:
+        self.bus = MessageBus()
+        self.model = "fake-model"
+        self.channels_config = SimpleNamespace(send_progress=True, send_tool_hints=False)
+        self.calls: list[tuple[str, str]] = []
+
+    async def process_direct(self, content, session_key="cli:direct", on_progress=None, **kwargs) -> str:
+        self.calls.append((content, session_key))
+        if content == "boom":
+            raise ValueError("provider exploded")
+        await on_progress("reading files")
+        await on_progress('read_file("a.txt")', tool_hint=True)  # Filtered by channels_config
+        await self.bus.publish_outbound(OutboundMessage(channel="cli", chat_id="direct", content="side note"))
+        return f"echo: {content}"
+
+
+@pytest.mark.asyncio
+async def test_ask_streams_progress_and_reply(tmp_path) -> None:
+    agent = FakeAgent()
+    server = DaemonServer(agent, tmp_path / "d.sock")
+    await server.start()
+    progress: list[str] = []
+
+    async def on_progress(content: str, *, tool_hint: bool = False) -> None:
+        progress.append(content)
+
+    try:
+        reply = await ask("hello", "cli:script", socket_path=server.socket_path, on_progress=on_progress)
+        with pytest.raises(RuntimeError, match="provider exploded"):
+            await ask("boom", socket_path=server.socket_path)
+        info = await ping(server.socket_path)
+        await asyncio.sleep(0)
+    finally:
+        await server.stop()
+
+    assert reply == "echo: hello"
+    assert progress == ["reading files"]
+    assert agent.calls == [("hello", "cli:script"), ("boom", "cli:direct")]
+    assert info["model"] == "fake-model" and info["pid"] > 0
+    assert agent.bus.outbound_size == 0
+    assert not server.socket_path.exists()
+
+
+@pytest.mark.asyncio
+async def test_client_reports_missing_daemon(tmp_path) -> None:
+    with pytest.raises(DaemonUnavailableError):
+        await ask("hello", socket_path=tmp_path / "missing.sock")
+
+
+@pytest.mark.asyncio
+async def test_stale_socket_is_replaced_and_live_one_refused(tmp_path) -> None:
+    path = tmp_path / "d.sock"
+    stale = await asyncio.start_unix_server(lambda r, w: None, str(path))
+    stale.close()
+    await stale.wait_closed()
+    path.touch()  # File left behind with nobody listening
+
+    first = DaemonServer(FakeAgent(), path)
+    await first.start()
+    try:
+        with pytest.raises(RuntimeError, match="already listening"):
+            await DaemonServer(FakeAgent(), path).start()
+        assert await ask("still here", socket_path=path) == "echo: still here"
+    finally:
+        await first.stop()
+
+
+@pytest.mark.asyncio
+async def test_stuck_or_garbled_daemon_raises_instead_of_hanging(tmp_path) -> None:
+    async def stuck(reader, writer) -> None:
+        await reader.readline()
+        await asyncio.sleep(10)
+
+    async def garbled(reader, writer) -> None:
+        await reader.readline()
+        writer.write(b"{not json\n")
+        await writer.drain()
+        writer.close()
+
+    for handler, error in ((stuck, "sent nothing for 0.05s"), (garbled, "malformed message")):
+        path = tmp_path / f"{handler.__name__}.sock"
+        server = await asyncio.start_unix_server(handler, str(path))
+        try:
+            with pytest.raises(RuntimeError, match=error):
+                await ask("hello", socket_path=path, idle_timeout=0.05)
+        finally:
+            server.close()
@@ -115,3 +115,63 @@ async def test_trigger_now_returns_none_when_decision_is_skip(tmp_path) -> None:
     )
 
     assert await service.trigger_now() is None
+
+
+@pytest.mark.asyncio
+async def test_tick_skips_llm_while_heartbeat_file_is_unchanged(tmp_path) -> None:
+    (tmp_path / "HEARTBEAT.md").write_text("- nothing yet", encoding="utf-8")
+    skip = LLMResponse(
+        content="",
+        tool_calls=[ToolCallRequest(id="hb_1", name="heartbeat", arguments={"action": "skip"})],
+    )
+    provider = DummyProvider([skip, skip])
+    calls = 0
+    chat = provider.chat
+
+    async def _counting_chat(*args, **kwargs):
+        nonlocal calls
+        calls += 1
+        return await chat(*args, **kwargs)
+
+    provider.chat = _counting_chat
+
+    service = HeartbeatService(workspace=tmp_path, provider=provider, model="openai/gpt-4o-mini")
+    await service._tick()
+    await service._tick()
+    assert calls == 1
+
+    # The decision survives a restart
+    restarted = HeartbeatService(workspace=tmp_path, provider=provider, model="openai/gpt-4o-mini")
+    await restarted._tick()
+    assert calls == 1
+
+    (tmp_path / "HEARTBEAT.md").write_text("- [ ] new task", encoding="utf-8")
+    await restarted._tick()
+    assert calls == 2
+
+    restarted.decision_max_age_s = 1
+    restarted._state["decided_at"] -= 5
+    await restarted._tick()
+    assert calls == 3
+
+
+@pytest.mark.asyncio
+async def test_skip_decision_expires_by_default_and_zero_disables_cache(tmp_path) -> None:
+    (tmp_path / "HEARTBEAT.md").write_text("- at 9am send the daily summary", encoding="utf-8")
+    skip = LLMResponse(
+        content="",
+        tool_calls=[ToolCallRequest(id="hb_1", name="heartbeat", arguments={"action": "skip"})],
+    )
+    provider = DummyProvider([skip] * 4)
+    service = HeartbeatService(workspace=tmp_path, provider=provider, model="openai/gpt-4o-mini")
+    assert service.decision_max_age_s > 0
+
+    await service._tick()
+    service._state["decided_at"] -= service.decision_max_age_s + 1
+    await service._tick()
+    assert provider._responses == [skip] * 2  # A time-dependent task is re-evaluated
+
+    service.decision_max_age_s = 0
+    await service._tick()
+    await service._tick()
+    assert provider._responses == []
@@ -0,0 +1,60 @@
+"""Tests for the HISTORY.md full-text index and search_history tool."""
+
+import threading
+
+import pytest
+
+from mragent.agent.memory import MemoryStore
+from mragent.agent.tools.memory import SearchHistoryTool
+
+
+def test_appended_entries_are_indexed_and_ranked(tmp_path) -> None:
+    store = MemoryStore(tmp_path)
+    store.append_history("[2026-01-05 09:00] Planned the quarterly budget review with Alice.")
+    store.append_history("[2026-02-10 14:30] Alice moved the budget meeting; deadline is Friday.")
+    store.append_history("[2026-03-01 08:15] Fixed the printer.")
+
+    hits = store.history_index.search("budget deadline")
+    assert [h.ts for h in hits] == ["2026-02-10 14:30", "2026-01-05 09:00"]
+    assert "**deadline**" in hits[0].snippet
+
+    assert [h.ts for h in store.history_index.search("budget", until="2026-01-31")] == ["2026-01-05 09:00"]
+    assert store.history_index.search("budget", since="2026-03-01") == []
+
+
+def test_index_catches_up_with_external_edits(tmp_path) -> None:
+    store = MemoryStore(tmp_path)
+    store.append_history("[2026-01-05 09:00] Talked about kayaks.")
+    with open(store.history_file, "a", encoding="utf-8") as f:
+        f.write("[2026-01-06 10:00] Bought a kayak paddle.\n\n")
+    assert len(MemoryStore(tmp_path).history_index.search("paddle")) == 1
+
+    store.history_file.write_text("[2026-02-01 12:00] Fresh start.\n\n", encoding="utf-8")
+    assert store.history_index.search("kayaks") == []
+    assert len(store.history_index.search("fresh")) == 1
+
+
+@pytest.mark.asyncio
+async def test_search_history_tool_formats_results(tmp_path) -> None:
+    store = MemoryStore(tmp_path)
+    store.append_history("[2026-01-05 09:00] Booked flights to Lisbon.")
+    tool = SearchHistoryTool(store)
+
+    assert (await tool.execute(query="lisbon")).startswith("[2026-01-05 09:00] ")
+    assert "No history entries" in await tool.execute(query="tokyo")
+
+
+@pytest.mark.asyncio
+async def test_search_history_tool_runs_off_the_event_loop(tmp_path, monkeypatch) -> None:
+    store = MemoryStore(tmp_path)
+    store.append_history("[2026-01-05 09:00] Booked flights to Lisbon.")
+    threads: list[threading.Thread] = []
+    search = store.history_index.search
+
+    def recording_search(*args, **kwargs):
+        threads.append(threading.current_thread())
+        return search(*args, **kwargs)
+
+    monkeypatch.setattr(store.history_index, "search", recording_search)
+    assert (await SearchHistoryTool(store).execute(query="lisbon")).startswith("[2026-01-05 09:00] ")
+    assert threads and threads[0] is not threading.main_thread()
@@ -0,0 +1,28 @@
+"""Tests for the shared pooled HTTP client registry."""
+
+import pytest
+
+from mragent.utils.http import close_http_clients, get_http_client
+
+
+@pytest.mark.asyncio
+async def test_clients_are_shared_per_settings() -> None:
+    try:
+        client = get_http_client()
+        assert get_http_client() is client
+        assert get_http_client(proxy=None, verify=True) is client
+        assert get_http_client(verify=False) is not client
+        assert get_http_client(proxy="http://127.0.0.1:3128") is not client
+    finally:
+        await close_http_clients()
+
+
+@pytest.mark.asyncio
+async def test_close_releases_clients_and_next_call_reopens() -> None:
+    client = get_http_client()
+    await close_http_clients()
+
+    assert client.is_closed
+    fresh = get_http_client()
+    assert fresh is not client and not fresh.is_closed
+    await close_http_clients()
@@ -0,0 +1,60 @@
+"""Import-time budget for the CLI's fast start path.
+
+Each check runs in a fresh interpreter under ``python -X importtime``. The
+budgets are several times what a laptop measures, so they only trip when a
+heavy dependency creeps back into a module-level import.
+"""
+
+import subprocess
+import sys
+
+import pytest
+
+# Loaded only by the commands, providers or channels that need them
+_HEAVY = ("litellm", "openai", "oauth_cli_kit", "prompt_toolkit", "telegram", "slack_sdk", "nio", "lark_oapi")
+
+
+def _run(code: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True, check=True,
+    )
+
+
+def _profile(stderr: str) -> tuple[float, set[str]]:
+    """Seconds spent importing mragent modules, and every module that was imported."""
+    total_us, modules = 0, set()
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if not cumulative.strip().isdigit():
+            continue  # Header line
+        modules.add(name.strip())
+        if name.startswith(" mragent"):  # Top-level entry, nested imports are in its cumulative time
+            total_us += int(cumulative)
+    return total_us / 1e6, modules
+
+
+@pytest.mark.parametrize("module, budget_s", [
+    ("mragent.cli.commands", 1.0),
+    ("mragent.agent.loop", 2.5),
+    ("mragent.channels.manager", 1.5),
+    ("mragent.daemon.client", 0.5),
+])
+def test_import_stays_within_budget(module: str, budget_s: float) -> None:
+    seconds, modules = _profile(_run(f"import {module}").stderr)
+
+    assert not modules & set(_HEAVY), f"{module} imports {sorted(modules & set(_HEAVY))}"
+    assert seconds < budget_s, f"importing {module} took {seconds:.2f}s (budget {budget_s}s)"
+
+
+def test_custom_provider_does_not_load_litellm() -> None:
+    code = (
+        "import sys\n"
+        "from mragent.cli.commands import _make_provider\n"
+        "from mragent.config.schema import Config\n"
+        "_make_provider(Config.model_validate({'agents': {'defaults': {'model': 'llama-3', 'provider': 'custom'}},"
+        " 'providers': {'custom': {'apiKey': 'sk-local', 'apiBase': 'http://localhost:8000/v1'}}}))\n"
+        "assert 'litellm' not in sys.modules, 'litellm imported'\n"
+    )
+    _run(code)
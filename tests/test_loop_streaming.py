@@ -0,0 +1,81 @@
+"""Tests for streaming partial replies through the provider and agent loop."""
+
+from pathlib import Path
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+
+from mragent.agent.loop import AgentLoop
+from mragent.bus.events import InboundMessage
+from mragent.bus.queue import MessageBus
+from mragent.config.schema import ChannelsConfig
+from mragent.providers.base import LLMProvider, LLMResponse, StreamChunk
+
+
+class _StaticProvider(LLMProvider):
+    async def chat(self, messages, tools=None, model=None, max_tokens=4096,
+                   temperature=0.7, reasoning_effort=None) -> LLMResponse:
+        return LLMResponse(content="hello")
+
+    def get_default_model(self) -> str:
+        return "test-model"
+
+
+class _StreamingProvider(_StaticProvider):
+    def __init__(self, deltas: list[str]):
+        super().__init__()
+        self.deltas = deltas
+
+    async def chat_stream(self, messages, tools=None, model=None, max_tokens=4096,
+                          temperature=0.7, reasoning_effort=None):
+        for delta in self.deltas:
+            yield StreamChunk(delta=delta)
+        yield StreamChunk(response=LLMResponse(content="".join(self.deltas)))
+
+
+def _make_loop(tmp_path: Path, provider: LLMProvider, stream: bool = True) -> AgentLoop:
+    loop = AgentLoop(
+        bus=MessageBus(), provider=provider, workspace=tmp_path, model="test-model",
+        memory_window=10, channels_config=ChannelsConfig(stream_responses=stream),
+    )
+    loop.tools.get_definitions = MagicMock(return_value=[])
+    loop._STREAM_INTERVAL_S = 0
+    return loop
+
+
+@pytest.mark.asyncio
+async def test_default_chat_stream_falls_back_to_chat() -> None:
+    chunks = [c async for c in _StaticProvider().chat_stream([{"role": "user", "content": "hi"}])]
+
+    assert [c.delta for c in chunks[:-1]] == ["hello"]
+    assert chunks[-1].response is not None
+    assert chunks[-1].response.content == "hello"
+
+
+@pytest.mark.asyncio
+async def test_partial_replies_are_published_with_stream_flag(tmp_path: Path) -> None:
+    loop = _make_loop(tmp_path, _StreamingProvider(["<think>plan", "</think>Hel", "lo ", "world"]))
+    msg = InboundMessage(channel="telegram", sender_id="u", chat_id="1", content="hi",
+                         metadata={"message_id": 7})
+
+    result = await loop._process_message(msg)
+
+    published: list[Any] = []
+    while loop.bus.outbound_size:
+        published.append(await loop.bus.consume_outbound())
+    assert [m.content for m in published] == ["Hel", "Hello", "Hello world"]
+    assert all(m.metadata["_stream"] and m.metadata["message_id"] == 7 for m in published)
+    assert result is not None and result.content == "Hello world"
+
+
+@pytest.mark.asyncio
+async def test_streaming_disabled_uses_plain_chat(tmp_path: Path) -> None:
+    provider = _StreamingProvider(["never"])
+    loop = _make_loop(tmp_path, provider, stream=False)
+    msg = InboundMessage(channel="telegram", sender_id="u", chat_id="1", content="hi")
+
+    result = await loop._process_message(msg)
+
+    assert loop.bus.outbound_size == 0
+    assert result is not None and result.content == "hello"
@@ -0,0 +1,89 @@
+"""Tests for image attachment preprocessing and the encoded-media cache."""
+
+import base64
+import io
+import threading
+
+import pytest
+
+from mragent.agent import media as media_module
+from mragent.agent.context import ContextBuilder
+from mragent.agent.media import ImageLimits, MediaPipeline
+
+Image = pytest.importorskip("PIL.Image")
+
+
+def _photo(path, size=(4000, 3000), orientation: int | None = None) -> None:
+    im = Image.new("RGB", size, (200, 120, 40))
+    exif = Image.Exif()
+    exif[0x010F] = "PhoneMaker"  # Make
+    if orientation:
+        exif[0x0112] = orientation
+    im.save(path, "JPEG", quality=95, exif=exif.tobytes())
+
+
+def _decode(url: str):
+    header, data = url.split(",", 1)
+    return header, Image.open(io.BytesIO(base64.b64decode(data)))
+
+
+def test_photo_is_downscaled_rotated_and_stripped(tmp_path) -> None:
+    path = tmp_path / "photo.jpg"
+    _photo(path, orientation=6)  # Rotated 90°: displayed as 3000x4000
+    pipeline = MediaPipeline(ImageLimits(max_edge=1000, quality=80))
+
+    image = pipeline.encode(str(path))
+
+    header, im = _decode(image.url)
+    assert header == "data:image/jpeg;base64"
+    assert im.size == (750, 1000)
+    assert not im.getexif()
+    assert len(base64.b64decode(image.data)) < image.source_bytes
+
+
+def test_encodings_are_cached_by_content_and_model(tmp_path) -> None:
+    first, copy = tmp_path / "a.jpg", tmp_path / "b.jpg"
+    _photo(first, size=(800, 600))
+    copy.write_bytes(first.read_bytes())
+    pipeline = MediaPipeline(ImageLimits(max_edge=512), {"gpt-4o": ImageLimits(max_edge=256)})
+
+    image = pipeline.encode(str(first), "openai/gpt-4o-mini")
+    assert pipeline.encode(str(first), "openai/gpt-4o-mini") is image
+    assert pipeline.encode(str(copy), "openai/gpt-4o-mini") is image
+    assert _decode(image.url)[1].size == (256, 192)
+    assert _decode(pipeline.encode(str(first), "anthropic/claude").url)[1].size == (512, 384)
+
+    _photo(first, size=(300, 200))  # Edited in place: new content, new entry
+    assert _decode(pipeline.encode(str(first), "openai/gpt-4o-mini").url)[1].size == (256, 171)
+
+
+@pytest.mark.asyncio
+async def test_prepare_encodes_off_the_event_loop(tmp_path, monkeypatch) -> None:
+    threads: list[str] = []
+    shrink = media_module.shrink_image
+
+    def recording_shrink(raw, mime, limits):
+        threads.append(threading.current_thread().name)
+        return shrink(raw, mime, limits)
+
+    monkeypatch.setattr(media_module, "shrink_image", recording_shrink)
+    paths = []
+    for i in range(3):
+        paths.append(str(tmp_path / f"{i}.png"))
+        Image.new("RGBA", (64 + i, 64), (0, 0, 0, 0)).save(paths[-1])
+    builder = ContextBuilder(tmp_path, media=MediaPipeline(workers=2))
+
+    await builder.media.prepare(paths)
+    content = builder._build_user_content("look", paths + [str(tmp_path / "gone.png")])
+
+    assert len(threads) == 3 and all(t.startswith("mragent-media") for t in threads)
+    assert [c["image_url"]["url"][:22] for c in content[:3]] == ["data:image/png;base64,"] * 3
+    assert content[3] == {"type": "text", "text": "look"}
+
+
+def test_non_images_are_listed_as_attachments(tmp_path) -> None:
+    doc = tmp_path / "notes.txt"
+    doc.write_text("hello")
+    builder = ContextBuilder(tmp_path)
+
+    assert builder._build_user_content("read this", [str(doc)]) == f"Attached file: {doc}\n\nread this"
@@ -220,3 +220,104 @@ class TestMemoryConsolidationTypeHandling:
         result = await store.consolidate(session, provider, "test-model", memory_window=50)
 
         assert result is False
+
+
+class TestPatchConsolidation:
+    """Patch mode: the LLM edits keyed entries instead of rewriting MEMORY.md."""
+
+    @staticmethod
+    def _patch_response(ops):
+        return LLMResponse(
+            content=None,
+            tool_calls=[ToolCallRequest(
+                id="call_1",
+                name="save_memory",
+                arguments={"history_entry": "[2026-01-01 10:00] Chatted.", "memory_patch": ops},
+            )],
+        )
+
+    @pytest.mark.asyncio
+    async def test_patch_ops_edit_entries_in_place(self, tmp_path: Path) -> None:
+        from mragent.agent.memory_index import parse_memory
+
+        store = MemoryStore(tmp_path)
+        store.write_long_term(
+            "# Long-term Memory\n\n## Preferences\n- Likes tea\n- Uses vim\n\n## Projects\n- Building a boat\n"
+        )
+        tea, vim, boat = (f.id for f in parse_memory(store.read_long_term()))
+        provider = AsyncMock()
+        provider.chat = AsyncMock(return_value=self._patch_response([
+            {"op": "update", "id": tea, "text": "Likes oolong tea"},
+            {"op": "delete", "id": boat},
+            {"op": "add", "section": "Preferences", "text": "Prefers metric units"},
+            {"op": "add", "section": "People", "text": "Alice is their sister"},
+            {"op": "delete", "id": "nope"},
+        ]))
+
+        result = await store.consolidate(_make_session(60), provider, "test-model", memory_window=50)
+
+        assert result is True
+        prompt = provider.chat.call_args.kwargs["messages"][1]["content"]
+        assert f"[{vim}] - Uses vim" in prompt
+        assert store.read_long_term() == (
+            "# Long-term Memory\n\n## Preferences\n- Likes oolong tea\n- Uses vim\n- Prefers metric units"
+            "\n\n## Projects\n\n## People\n\n- Alice is their sister\n"
+        )
+
+    @pytest.mark.asyncio
+    async def test_patch_applies_to_memory_edited_during_the_call(self, tmp_path: Path) -> None:
+        store = MemoryStore(tmp_path)
+        store.write_long_term("## Facts\n- A\n")
+
+        async def _chat(**kwargs):
+            store.write_long_term("## Facts\n- A\n- B written meanwhile\n")
+            return self._patch_response([{"op": "add", "section": "Facts", "text": "C"}])
+
+        provider = AsyncMock()
+        provider.chat = _chat
+
+        assert await store.consolidate(_make_session(60), provider, "test-model", memory_window=50)
+        assert store.read_long_term() == "## Facts\n- A\n- B written meanwhile\n- C\n"
+
+    @pytest.mark.asyncio
+    async def test_patch_keeps_untouched_markdown_byte_for_byte(self, tmp_path: Path) -> None:
+        from mragent.agent.memory_index import parse_memory
+
+        store = MemoryStore(tmp_path)
+        original = (
+            "# Long-term Memory\n\n## Setup\n- Uses a venv\n  - sub item\n    * deeper\n\n"
+            "~~~bash\n# install deps\npip install -e .\n\npytest -q\n~~~\n\n"
+            "## Notes   \nTrailing spaces stay.  \n- Old note\n"
+        )
+        store.write_long_term(original)
+        old_note = parse_memory(original)[-1].id
+        provider = AsyncMock()
+        provider.chat = AsyncMock(return_value=self._patch_response([
+            {"op": "delete", "id": "missing"},
+            {"op": "update", "id": "missing", "text": "x"},
+        ]))
+        before = store.memory_file.stat().st_mtime_ns
+
+        assert await store.consolidate(_make_session(60), provider, "test-model", memory_window=50)
+        assert store.memory_file.stat().st_mtime_ns == before  # No op applied, nothing written
+
+        provider.chat = AsyncMock(return_value=self._patch_response([
+            {"op": "add", "section": "Setup", "text": "Python 3.11"},
+            {"op": "update", "id": old_note, "text": "New note"},
+        ]))
+        assert await store.consolidate(_make_session(60), provider, "test-model", memory_window=50)
+        assert store.read_long_term() == original.replace("pytest -q\n~~~\n", "pytest -q\n~~~\n- Python 3.11\n").replace(
+            "- Old note", "- New note"
+        )
+
+    @pytest.mark.asyncio
+    async def test_rewrite_mode_sends_full_memory(self, tmp_path: Path) -> None:
+        store = MemoryStore(tmp_path)
+        store.write_long_term("## Facts\n- A\n")
+        provider = AsyncMock()
+        provider.chat = AsyncMock(return_value=_make_tool_response("[2026-01-01] x", "## Facts\n- A\n- B\n"))
+
+        assert await store.consolidate(_make_session(60), provider, "m", memory_window=50, mode="rewrite")
+        tool = provider.chat.call_args.kwargs["tools"][0]["function"]["parameters"]
+        assert "memory_patch" not in tool["properties"]
+        assert store.read_long_term() == "## Facts\n- A\n- B\n"
@@ -101,3 +101,24 @@ class TestMessageToolTurnTracking:
         tool._sent_in_turn = True
         tool.start_turn()
         assert not tool._sent_in_turn
+
+    @pytest.mark.asyncio
+    async def test_context_is_isolated_between_concurrent_turns(self) -> None:
+        import asyncio
+
+        tool = MessageTool()
+        sent: list[OutboundMessage] = []
+        tool.set_send_callback(AsyncMock(side_effect=lambda m: sent.append(m)))
+
+        async def turn(chat_id: str) -> bool:
+            tool.set_context("telegram", chat_id)
+            tool.start_turn()
+            await asyncio.sleep(0)
+            await tool.execute(content=f"hi {chat_id}")
+            return tool._sent_in_turn
+
+        results = await asyncio.gather(
+            asyncio.create_task(turn("a")), asyncio.create_task(turn("b")),
+        )
+        assert results == [True, True]
+        assert sorted(m.chat_id for m in sent) == ["a", "b"]
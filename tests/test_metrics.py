@@ -0,0 +1,75 @@
+"""Tests for the metrics registry and its wiring."""
+
+import pytest
+from aiohttp.test_utils import make_mocked_request
+
+from mragent.bench import BenchConfig, run_bench
+from mragent.bus.queue import MessageBus
+from mragent.utils import metrics
+from mragent.utils.metrics import Registry
+from mragent.web.metrics import handle_metrics
+
+
+def test_registry_renders_prometheus_text() -> None:
+    reg = Registry()
+    calls = reg.counter("t_calls_total", "Calls", ("tool",))
+    calls.inc(tool='say "hi"')
+    calls.inc(2, tool='say "hi"')
+    latency = reg.histogram("t_seconds", "Latency", buckets=(0.1, 1))
+    latency.observe(0.05)
+    latency.observe(0.5)
+    latency.observe(7)
+    depth = reg.gauge("t_depth", "Depth")
+    depth.set_function(lambda: 4)
+
+    assert reg.counter("t_calls_total", "Calls", ("tool",)) is calls
+    with pytest.raises(ValueError):
+        reg.gauge("t_calls_total", "Calls")
+    assert reg.render().splitlines() == [
+        "# HELP t_calls_total Calls",
+        "# TYPE t_calls_total counter",
+        't_calls_total{tool="say \\"hi\\""} 3',
+        "# HELP t_seconds Latency",
+        "# TYPE t_seconds histogram",
+        't_seconds_bucket{le="0.1"} 1',
+        't_seconds_bucket{le="1"} 2',
+        't_seconds_bucket{le="+Inf"} 3',
+        "t_seconds_sum 7.55",
+        "t_seconds_count 3",
+        "# HELP t_depth Depth",
+        "# TYPE t_depth gauge",
+        "t_depth 4",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_agent_turns_are_instrumented(tmp_path) -> None:
+    turns = metrics.counter("mragent_turns_total", "", ("outcome",))
+    tools = metrics.counter("mragent_tool_calls_total", "", ("tool", "outcome"))
+    llm = metrics.histogram("mragent_llm_request_seconds", "", ("outcome",))
+    before = (turns.value(outcome="ok"), tools.value(tool="list_dir", outcome="ok"), llm.count(outcome="ok"))
+
+    await run_bench(BenchConfig(chats=2, turns=1, latency_ms=0), workspace=tmp_path)
+
+    after = (turns.value(outcome="ok"), tools.value(tool="list_dir", outcome="ok"), llm.count(outcome="ok"))
+    assert [a - b for a, b in zip(after, before)] == [2, 2, 4]
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint_serves_bus_depth() -> None:
+    bus = MessageBus()
+    bus.outbound.put_nowait(object())
+
+    response = await handle_metrics(make_mocked_request("GET", "/metrics"))
+
+    assert response.content_type == "text/plain"
+    assert 'mragent_bus_queue_depth{queue="outbound"} 1' in response.body.decode()
+
+
+def test_gateway_metrics_are_opt_in_and_local() -> None:
+    from mragent.config.schema import GatewayConfig
+
+    gateway = GatewayConfig()
+    assert gateway.metrics is False
+    assert gateway.metrics_host == "127.0.0.1"
+    assert GatewayConfig.model_validate({"metrics": True, "metricsHost": "0.0.0.0"}).metrics_host == "0.0.0.0"
@@ -0,0 +1,148 @@
+"""Tests for PoolProvider load balancing and health-aware routing."""
+
+import asyncio
+
+import pytest
+
+from mragent.cli.commands import _make_provider
+from mragent.config.schema import Config
+from mragent.providers.base import LLMProvider, LLMResponse
+from mragent.providers.custom_provider import CustomProvider
+from mragent.providers.pool import Backend, PoolProvider
+
+
+class StubBackend(LLMProvider):
+    """Answers with its own name, or fails while ``failing`` is set."""
+
+    def __init__(self, name: str, failing: bool = False, delay_s: float = 0.0):
+        super().__init__()
+        self.name = name
+        self.failing = failing
+        self.delay_s = delay_s
+        self.models: list[str | None] = []
+
+    async def chat(self, messages, tools=None, model=None, max_tokens=4096, temperature=0.7,
+                   reasoning_effort=None) -> LLMResponse:
+        self.models.append(model)
+        if self.delay_s:
+            await asyncio.sleep(self.delay_s)
+        if self.failing:
+            return LLMResponse(content=f"Error calling LLM: {self.name} is down", finish_reason="error")
+        return LLMResponse(content=self.name)
+
+    def get_default_model(self) -> str:
+        return "stub"
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _pool(*stubs: StubBackend, weights=None, **kwargs) -> PoolProvider:
+    weights = weights or [1] * len(stubs)
+    return PoolProvider(
+        [Backend(name=s.name, provider=s, weight=w) for s, w in zip(stubs, weights)], **kwargs,
+    )
+
+
+async def _ask(pool: PoolProvider, n: int) -> list[str]:
+    return [(await pool.chat([{"role": "user", "content": "hi"}], model="m")).content for _ in range(n)]
+
+
+@pytest.mark.asyncio
+async def test_round_robin_follows_weights() -> None:
+    pool = _pool(StubBackend("a"), StubBackend("b"), weights=[3, 1])
+
+    answers = await _ask(pool, 8)
+
+    assert answers.count("a") == 6 and answers.count("b") == 2
+    assert answers[:4] in (["a", "a", "b", "a"], ["a", "b", "a", "a"])
+
+
+@pytest.mark.asyncio
+async def test_least_outstanding_avoids_busy_backend() -> None:
+    slow, fast = StubBackend("slow", delay_s=0.05), StubBackend("fast")
+    pool = _pool(slow, fast, strategy="least_outstanding")
+
+    first = asyncio.create_task(pool.chat([], model="m"))
+    await asyncio.sleep(0)
+    answers = await _ask(pool, 3)
+    await first
+
+    assert slow.models == ["m"]
+    assert answers == ["fast", "fast", "fast"]
+
+
+@pytest.mark.asyncio
+async def test_failed_request_fails_over_and_ejects_backend() -> None:
+    clock = FakeClock()
+    down, up = StubBackend("down", failing=True), StubBackend("up")
+    pool = _pool(down, up, eject_after_failures=2, eject_s=30, clock=clock)
+
+    assert await _ask(pool, 4) == ["up"] * 4
+    assert len(down.models) == 2  # Ejected after two failures, then skipped
+    assert [s["in_rotation"] for s in pool.stats()] == [False, True]
+
+    # After the ejection a single probe goes through; it fails and doubles the ejection
+    clock.now += 31
+    assert await _ask(pool, 2) == ["up", "up"]
+    assert len(down.models) == 3
+    assert pool.stats()[0]["ejected_for_s"] == 60
+
+    # A successful probe puts the backend back into rotation
+    clock.now += 61
+    down.failing = False
+    assert sorted(await _ask(pool, 4)) == ["down", "down", "up", "up"]
+    assert pool.backends[0].ejections == 0
+
+
+@pytest.mark.asyncio
+async def test_all_backends_down_returns_last_error() -> None:
+    pool = _pool(StubBackend("a", failing=True), StubBackend("b", failing=True), max_attempts=3)
+
+    response = await pool.chat([], model="m")
+
+    assert response.finish_reason == "error"
+    assert "is down" in response.content
+
+
+@pytest.mark.asyncio
+async def test_stream_fails_over_before_any_text() -> None:
+    pool = _pool(StubBackend("down", failing=True), StubBackend("up"))
+
+    chunks = [c async for c in pool.chat_stream([], model="m")]
+
+    assert [c.delta for c in chunks if c.response is None] == ["up"]
+    assert chunks[-1].response.content == "up"
+
+
+def test_make_provider_builds_pool_from_config() -> None:
+    config = Config.model_validate({
+        "agents": {"defaults": {"model": "custom/llama"}},
+        "providers": {
+            "custom": {"apiKey": "shared", "apiBase": "http://one:8000/v1"},
+            "pool": {
+                "strategy": "least_outstanding",
+                "backends": [
+                    {"provider": "custom", "weight": 2},
+                    {"provider": "custom", "apiKey": "second", "apiBase": "http://two:8000/v1", "model": "mistral"},
+                ],
+            },
+        },
+    })
+
+    provider = _make_provider(config)
+
+    assert isinstance(provider, PoolProvider)
+    assert provider.strategy == "least_outstanding"
+    assert provider.get_default_model() == "custom/llama"
+    first, second = (b.provider.inner.inner for b in provider.backends)
+    assert isinstance(first, CustomProvider) and provider.backends[0].weight == 2
+    assert (first.api_key, first.api_base) == ("shared", "http://one:8000/v1")
+    assert (second.api_key, second.api_base, provider.backends[1].model) == (
+        "second", "http://two:8000/v1", "mistral",
+    )
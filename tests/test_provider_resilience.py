@@ -0,0 +1,205 @@
+"""Tests for LLM call retries and circuit breaking."""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from mragent.providers import openai_codex_provider
+from mragent.providers.base import LLMProvider, LLMResponse, StreamChunk
+from mragent.providers.limiter import AdaptiveLimiter, RateLimitedProvider
+from mragent.providers.openai_codex_provider import OpenAICodexProvider
+from mragent.providers.resilience import CircuitBreaker, ResilientProvider, RetryPolicy
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class ScriptedBackend(LLMProvider):
+    """Plays back ``script``; a str item is streamed as a delta before the next response."""
+
+    def __init__(self, script: list):
+        super().__init__()
+        self.script = list(script)
+        self.calls = 0
+
+    async def chat(self, messages, tools=None, model=None, max_tokens=4096, temperature=0.7,
+                   reasoning_effort=None) -> LLMResponse:
+        self.calls += 1
+        return self.script.pop(0)
+
+    async def chat_stream(self, messages, tools=None, model=None, max_tokens=4096, temperature=0.7,
+                          reasoning_effort=None):
+        self.calls += 1
+        item = self.script.pop(0)
+        while isinstance(item, str):
+            yield StreamChunk(delta=item)
+            item = self.script.pop(0)
+        yield StreamChunk(response=item)
+
+    def get_default_model(self) -> str:
+        return "scripted"
+
+
+def _error(status: int | None, text: str = "Error calling LLM") -> LLMResponse:
+    return LLMResponse(content=text, finish_reason="error", status_code=status)
+
+
+def _resilient(backend: LLMProvider, **breaker) -> tuple[ResilientProvider, list[float]]:
+    sleeps: list[float] = []
+
+    async def sleep(delay: float) -> None:
+        sleeps.append(delay)
+
+    provider = ResilientProvider(
+        backend, RetryPolicy(max_attempts=3, base_delay_s=0.5), CircuitBreaker(**breaker), sleep=sleep,
+    )
+    return provider, sleeps
+
+
+@pytest.mark.asyncio
+async def test_transient_errors_are_retried_with_backoff() -> None:
+    backend = ScriptedBackend([
+        _error(502),
+        LLMResponse(content="busy", finish_reason="error", status_code=429, retry_after=3),
+        LLMResponse(content="ok"),
+    ])
+    provider, sleeps = _resilient(backend)
+
+    response = await provider.chat([])
+
+    assert response.content == "ok"
+    assert backend.calls == 3
+    assert 0 <= sleeps[0] <= 0.5
+    assert sleeps[1] == 3  # Retry-After wins over the shorter jittered backoff
+
+
+@pytest.mark.asyncio
+async def test_bad_requests_and_exhausted_attempts_are_returned() -> None:
+    backend = ScriptedBackend([_error(400, "Error: invalid tool schema")])
+    provider, sleeps = _resilient(backend)
+    assert (await provider.chat([])).status_code == 400
+    assert backend.calls == 1 and sleeps == []
+
+    backend = ScriptedBackend([_error(None, "Error: Connection reset by peer")] * 3)
+    provider, sleeps = _resilient(backend)
+    assert "Connection reset" in (await provider.chat([])).content
+    assert backend.calls == 3 and len(sleeps) == 2
+
+
+@pytest.mark.asyncio
+async def test_circuit_opens_fails_fast_and_recovers() -> None:
+    clock = FakeClock()
+    backend = ScriptedBackend([_error(503)] * 4 + [LLMResponse(content="back")])
+    provider, _ = _resilient(backend, name="flaky", failure_threshold=4, reset_s=30, clock=clock)
+
+    await provider.chat([])  # 3 attempts
+    await provider.chat([])  # 4th failure opens the circuit
+    assert backend.calls == 4
+    assert provider.breaker.state == CircuitBreaker.OPEN
+
+    fast = await provider.chat([])
+    assert "circuit open" in fast.content and backend.calls == 4
+
+    clock.now += 31
+    assert provider.breaker.state == CircuitBreaker.HALF_OPEN
+    assert (await provider.chat([])).content == "back"
+    assert provider.breaker.state == CircuitBreaker.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_stream_is_retried_only_before_text() -> None:
+    backend = ScriptedBackend([_error(502), "Hel", "lo", LLMResponse(content="Hello")])
+    provider, _ = _resilient(backend)
+    chunks = [c async for c in provider.chat_stream([])]
+    assert [c.delta for c in chunks if c.response is None] == ["Hel", "lo"]
+    assert chunks[-1].response.content == "Hello" and backend.calls == 2
+
+    backend = ScriptedBackend(["Hel", _error(502)])
+    provider, _ = _resilient(backend)
+    chunks = [c async for c in provider.chat_stream([])]
+    assert chunks[-1].response.status_code == 502 and backend.calls == 1
+
+
+class SlowBackend(ScriptedBackend):
+    def __init__(self, delay: float):
+        super().__init__([])
+        self.delay = delay
+
+    async def chat(self, messages, tools=None, model=None, max_tokens=4096, temperature=0.7,
+                   reasoning_effort=None) -> LLMResponse:
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return LLMResponse(content="done")
+
+
+@pytest.mark.asyncio
+async def test_deadline_excludes_limiter_queue_time() -> None:
+    limited = RateLimitedProvider(SlowBackend(0.1), AdaptiveLimiter(max_concurrency=1))
+    provider = ResilientProvider(limited, RetryPolicy(deadline_s=0.15), CircuitBreaker(failure_threshold=1))
+
+    # The third call queues ~0.2s behind the others, more than its whole deadline
+    responses = await asyncio.gather(*(provider.chat([]) for _ in range(3)))
+
+    assert [r.content for r in responses] == ["done"] * 3
+    assert provider.breaker.failures == 0
+
+    provider = ResilientProvider(SlowBackend(0.1), RetryPolicy(deadline_s=0.02), CircuitBreaker())
+    response = await provider.chat([])
+    assert "no answer within" in response.content
+    assert provider.breaker.failures == 1  # The endpoint itself was too slow
+
+
+class StallingBackend(ScriptedBackend):
+    async def chat_stream(self, messages, tools=None, model=None, max_tokens=4096, temperature=0.7,
+                          reasoning_effort=None):
+        self.calls += 1
+        yield StreamChunk(delta="Hel")
+        await asyncio.sleep(10)  # Connection goes quiet
+        yield StreamChunk(response=LLMResponse(content="Hello"))
+
+
+@pytest.mark.asyncio
+async def test_stalled_stream_ends_at_the_deadline() -> None:
+    limited = RateLimitedProvider(StallingBackend([]), AdaptiveLimiter(max_concurrency=1))
+    provider = ResilientProvider(limited, RetryPolicy(deadline_s=0.1), CircuitBreaker(failure_threshold=2))
+
+    chunks = await asyncio.wait_for(_collect(provider.chat_stream([])), timeout=2)
+
+    assert [c.delta for c in chunks[:-1]] == ["Hel"]
+    assert "no answer within" in chunks[-1].response.content
+    assert provider.breaker.failures == 1
+    assert limited.limiter.in_flight == 0  # The stalled attempt gave its slot back
+
+
+async def _collect(stream) -> list[StreamChunk]:
+    return [c async for c in stream]
+
+
+@pytest.mark.asyncio
+async def test_codex_certificate_fallback_is_per_call(monkeypatch) -> None:
+    verify_flags: list[bool] = []
+
+    async def fake_stream(url, headers, body, verify):
+        verify_flags.append(verify)
+        if verify:
+            raise RuntimeError("[SSL: CERTIFICATE_VERIFY_FAILED] self-signed certificate")
+        yield StreamChunk(response=LLMResponse(content="hi from codex"))
+
+    monkeypatch.setattr(openai_codex_provider, "_stream_codex", fake_stream)
+    monkeypatch.setattr(
+        openai_codex_provider, "get_codex_token", lambda: SimpleNamespace(account_id="acct", access="tok"),
+    )
+    provider, sleeps = _resilient(OpenAICodexProvider())
+
+    response = await provider.chat([{"role": "user", "content": "hi"}])
+    assert response.content == "hi from codex"
+    assert verify_flags == [True, False] and sleeps == []
+
+    await provider.chat([{"role": "user", "content": "again"}])
+    assert verify_flags == [True, False, True, False]  # Every call tries verification first
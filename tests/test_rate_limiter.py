@@ -0,0 +1,133 @@
+"""Tests for per-backend rate limiting and adaptive concurrency."""
+
+import asyncio
+
+import httpx
+import pytest
+
+from mragent.providers.base import LLMProvider, LLMResponse, error_info
+from mragent.providers.limiter import (
+    AdaptiveLimiter,
+    Priority,
+    RateLimitedProvider,
+    TokenBucket,
+    llm_priority,
+)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _throttled(retry_after: float | None = None) -> LLMResponse:
+    return LLMResponse(content="Error: 429", finish_reason="error", status_code=429, retry_after=retry_after)
+
+
+@pytest.mark.asyncio
+async def test_waiters_are_admitted_by_priority() -> None:
+    limiter = AdaptiveLimiter(max_concurrency=1)
+    await limiter.acquire()
+    order: list[str] = []
+
+    async def request(name: str, priority: Priority) -> None:
+        with llm_priority(priority):
+            await limiter.acquire()
+        order.append(name)
+        limiter.release(LLMResponse(content="ok"))
+
+    waiters = [
+        asyncio.create_task(request("consolidation", Priority.MAINTENANCE)),
+        asyncio.create_task(request("cron", Priority.BACKGROUND)),
+        asyncio.create_task(request("user", Priority.INTERACTIVE)),
+    ]
+    await asyncio.sleep(0.01)
+    assert order == []
+
+    limiter.release(LLMResponse(content="ok"))
+    await asyncio.gather(*waiters)
+
+    assert order == ["user", "cron", "consolidation"]
+
+
+def test_concurrency_halves_on_overload_and_grows_back() -> None:
+    clock = FakeClock()
+    limiter = AdaptiveLimiter(max_concurrency=8, clock=clock)
+    limiter.in_flight = 3
+
+    limiter.release(_throttled(retry_after=5))
+    limiter.release(_throttled())  # Same burst: no second decrease
+    assert limiter.limit == 4
+    assert limiter.paused_until == clock.now + 5
+
+    clock.now += 2
+    limiter.in_flight = 5
+    limiter.release(LLMResponse(content="Error: invalid request", finish_reason="error", status_code=400))
+    assert limiter.limit == 4
+    for _ in range(4):
+        limiter.release(LLMResponse(content="ok"))
+    assert 4.9 < limiter.limit < 5
+
+
+@pytest.mark.asyncio
+async def test_retry_after_pauses_admission() -> None:
+    limiter = AdaptiveLimiter()
+    await limiter.acquire()
+    limiter.release(_throttled(retry_after=0.05))
+
+    started = asyncio.get_running_loop().time()
+    await limiter.acquire()
+
+    assert asyncio.get_running_loop().time() - started >= 0.04
+
+
+def test_token_bucket_delay() -> None:
+    bucket = TokenBucket(per_minute=600, now=0.0)  # 10 per second
+    assert bucket.delay(600, now=0.0) == 0
+    bucket.take(600, now=0.0)
+    assert bucket.delay(5, now=0.0) == pytest.approx(0.5)
+    assert bucket.delay(5, now=0.5) == 0
+    assert bucket.delay(10_000, now=0.5) == pytest.approx(59.5)  # Capped at one minute's worth
+
+
+def test_error_info_reads_status_and_retry_after() -> None:
+    request = httpx.Request("POST", "https://api.example.com/v1/chat")
+    response = httpx.Response(429, headers={"Retry-After": "7"}, request=request)
+    error = httpx.HTTPStatusError("too many requests", request=request, response=response)
+
+    assert error_info(error) == {"status_code": 429, "retry_after": 7.0}
+    assert error_info(RuntimeError("boom")) == {"status_code": None, "retry_after": None}
+
+
+class FlakyProvider(LLMProvider):
+    def __init__(self, responses: list[LLMResponse]):
+        super().__init__()
+        self.responses = responses
+        self.active = self.peak = 0
+
+    async def chat(self, messages, tools=None, model=None, max_tokens=4096, temperature=0.7,
+                   reasoning_effort=None) -> LLMResponse:
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(0.01)
+        self.active -= 1
+        return self.responses.pop(0) if self.responses else LLMResponse(content="ok")
+
+    def get_default_model(self) -> str:
+        return "flaky"
+
+
+@pytest.mark.asyncio
+async def test_rate_limited_provider_backs_off_after_429() -> None:
+    inner = FlakyProvider([_throttled()])
+    provider = RateLimitedProvider(inner, AdaptiveLimiter(max_concurrency=4))
+
+    first = await provider.chat([{"role": "user", "content": "hi"}])
+    await asyncio.gather(*(provider.chat([]) for _ in range(6)))
+
+    assert first.status_code == 429
+    assert inner.peak == 2
+    assert provider.limiter.in_flight == 0
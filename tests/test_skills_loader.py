@@ -0,0 +1,47 @@
+"""Tests for the indexed SkillsLoader."""
+
+from pathlib import Path
+
+from mragent.agent import skills as skills_module
+from mragent.agent.skills import SkillsLoader
+
+
+def _write_skill(root: Path, name: str, body: str) -> Path:
+    path = root / name / "SKILL.md"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(body, encoding="utf-8")
+    return path
+
+
+def test_workspace_skills_shadow_builtin_and_index_tracks_changes(tmp_path: Path) -> None:
+    builtin = tmp_path / "builtin"
+    _write_skill(builtin, "git", "---\ndescription: Builtin git\n---\nbuiltin")
+    _write_skill(builtin, "tmux", "---\ndescription: Tmux\n---\ntmux")
+    ws_skill = _write_skill(tmp_path / "ws" / "skills", "git", "---\ndescription: My git\n---\nmine")
+    loader = SkillsLoader(tmp_path / "ws", builtin_skills_dir=builtin, refresh_interval_s=3600)
+
+    assert [(s["name"], s["source"]) for s in loader.list_skills()] == [
+        ("git", "workspace"), ("tmux", "builtin"),
+    ]
+    assert loader.get_skill_metadata("git") == {"description": "My git"}
+    assert loader.load_skill("missing") is None
+
+    ws_skill.write_text("---\ndescription: Edited git skill\n---\nedited", encoding="utf-8")
+    assert loader.load_skill("git").endswith("mine")  # Index not rescanned yet
+    loader.refresh()
+    assert loader.load_skill("git").endswith("edited")
+    assert "Edited git skill" in loader.build_skills_summary()
+
+
+def test_requirement_checks_are_cached(tmp_path: Path, monkeypatch) -> None:
+    builtin = tmp_path / "builtin"
+    meta = '{"mragent": {"always": true, "requires": {"bins": ["tool-x"]}}}'
+    _write_skill(builtin, "a", f"---\nmetadata: {meta}\n---\nA")
+    _write_skill(builtin, "b", f"---\nmetadata: {meta}\n---\nB")
+    calls: list[str] = []
+    monkeypatch.setattr(skills_module.shutil, "which", lambda b: calls.append(b) or "/bin/" + b)
+    loader = SkillsLoader(tmp_path / "ws", builtin_skills_dir=builtin)
+
+    assert loader.get_always_skills() == ["a", "b"]
+    assert len(loader.list_skills()) == 2
+    assert calls == ["tool-x"]
@@ -125,6 +125,48 @@ class TestDispatch:
         await asyncio.gather(t1, t2)
         assert order == ["start-a", "end-a", "start-b", "end-b"]
 
+    @pytest.mark.asyncio
+    async def test_different_sessions_run_concurrently(self):
+        from mragent.bus.events import InboundMessage, OutboundMessage
+
+        loop, bus = _make_loop()
+        order = []
+
+        async def mock_process(m, **kwargs):
+            order.append(f"start-{m.chat_id}")
+            await asyncio.sleep(0.05)
+            order.append(f"end-{m.chat_id}")
+            return OutboundMessage(channel="test", chat_id=m.chat_id, content=m.content)
+
+        loop._process_message = mock_process
+        msg1 = InboundMessage(channel="test", sender_id="u1", chat_id="c1", content="a")
+        msg2 = InboundMessage(channel="test", sender_id="u2", chat_id="c2", content="b")
+
+        await asyncio.gather(loop._dispatch(msg1), loop._dispatch(msg2))
+        assert order[:2] == ["start-c1", "start-c2"]
+
+    @pytest.mark.asyncio
+    async def test_concurrency_cap_is_fair_across_sessions(self):
+        from mragent.agent.scheduler import SessionScheduler
+
+        scheduler = SessionScheduler(max_concurrent=1)
+        order = []
+
+        async def turn(key: str, label: str):
+            async with scheduler.slot(key):
+                order.append(label)
+                await asyncio.sleep(0.01)
+
+        # A busy group chat queues three turns before a direct message arrives.
+        tasks = [asyncio.create_task(turn("group", f"g{i}")) for i in range(3)]
+        await asyncio.sleep(0)
+        tasks.append(asyncio.create_task(turn("dm", "dm")))
+        await asyncio.gather(*tasks)
+
+        assert order.index("dm") < order.index("g2")
+        assert [x for x in order if x.startswith("g")] == ["g0", "g1", "g2"]
+        assert scheduler.active == 0
+
 
 class TestSubagentCancellation:
     @pytest.mark.asyncio
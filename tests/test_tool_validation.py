@@ -1,3 +1,4 @@
+import asyncio
 from typing import Any
 
 from mragent.agent.tools.base import Tool
@@ -89,6 +90,60 @@ async def test_registry_returns_validation_error() -> None:
     assert "Invalid parameters" in result
 
 
+class _TimedTool(Tool):
+    def __init__(self, name: str, read_only: bool, log: list[str]):
+        self._name, self._read_only, self._log = name, read_only, log
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def description(self) -> str:
+        return "timed tool"
+
+    @property
+    def parameters(self) -> dict[str, Any]:
+        return {"type": "object", "properties": {"tag": {"type": "string"}}}
+
+    @property
+    def read_only(self) -> bool:
+        return self._read_only
+
+    async def execute(self, tag: str = "", **kwargs: Any) -> str:
+        self._log.append(f"start-{tag}")
+        await asyncio.sleep(0.01)
+        self._log.append(f"end-{tag}")
+        return tag
+
+
+async def test_registry_execute_many_runs_read_only_calls_concurrently() -> None:
+    log: list[str] = []
+    reg = ToolRegistry()
+    reg.register(_TimedTool("read", True, log))
+    reg.register(_TimedTool("write", False, log))
+
+    results = await reg.execute_many([
+        ("read", {"tag": "r1"}),
+        ("read", {"tag": "r2"}),
+        ("write", {"tag": "w"}),
+        ("read", {"tag": "r3"}),
+    ])
+
+    assert results == ["r1", "r2", "w", "r3"]
+    assert log[:2] == ["start-r1", "start-r2"]  # overlapping reads
+    assert log.index("end-r2") < log.index("start-w") < log.index("end-w") < log.index("start-r3")
+
+
+async def test_registry_execute_many_respects_concurrency_limit() -> None:
+    log: list[str] = []
+    reg = ToolRegistry()
+    reg.register(_TimedTool("read", True, log))
+
+    await reg.execute_many([("read", {"tag": str(i)}) for i in range(3)], max_concurrency=1)
+    assert log == ["start-0", "end-0", "start-1", "end-1", "start-2", "end-2"]
+
+
 def test_exec_extract_absolute_paths_keeps_full_windows_path() -> None:
     cmd = r"type C:\user\workspace\txt"
     paths = ExecTool._extract_absolute_paths(cmd)
@@ -0,0 +1,103 @@
+"""Tests for token usage normalization and per-session accounting."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from mragent.agent.loop import AgentLoop
+from mragent.bench import BenchConfig, run_bench
+from mragent.bus.queue import MessageBus
+from mragent.providers.base import LLMProvider, LLMResponse, normalize_usage
+from mragent.providers.pool import Backend, PoolProvider
+from mragent.session.manager import SessionManager
+from mragent.session.usage import cache_hit_rate, record_turn, summarize
+
+
+def test_normalize_usage_reads_each_provider_shape() -> None:
+    openai = SimpleNamespace(
+        prompt_tokens=1200, completion_tokens=80, total_tokens=1280,
+        prompt_tokens_details=SimpleNamespace(cached_tokens=1024),
+    )
+    anthropic = {"prompt_tokens": 1500, "completion_tokens": 40, "cache_read_input_tokens": 1400,
+                 "cache_creation_input_tokens": 90}
+    responses = {"input_tokens": 300, "output_tokens": 20, "input_tokens_details": {"cached_tokens": 0}}
+
+    assert normalize_usage(openai) == {
+        "prompt_tokens": 1200, "completion_tokens": 80, "total_tokens": 1280, "cached_tokens": 1024,
+    }
+    assert normalize_usage(anthropic) == {
+        "prompt_tokens": 1500, "completion_tokens": 40, "total_tokens": 1540,
+        "cached_tokens": 1400, "cache_creation_tokens": 90,
+    }
+    assert normalize_usage(responses) == {
+        "prompt_tokens": 300, "completion_tokens": 20, "total_tokens": 320, "cached_tokens": 0,
+    }
+    assert normalize_usage(None) == {}
+
+
+def test_summarize_groups_by_model_and_channel() -> None:
+    telegram, web = {}, {}
+    record_turn(telegram, {"m1": {"prompt_tokens": 100, "cached_tokens": 50, "total_tokens": 110, "requests": 2}})
+    record_turn(telegram, {"m2": {"prompt_tokens": 100, "total_tokens": 120, "requests": 1}})
+    record_turn(web, {"m1": {"prompt_tokens": 200, "cached_tokens": 150, "total_tokens": 210, "requests": 1}})
+    record_turn(web, {"m1": {}})  # Turns without an LLM call are not counted
+
+    summary = summarize([
+        {"key": "telegram:1", "usage": telegram["usage"]},
+        {"key": "web:abc", "usage": web["usage"]},
+        {"key": "cli:direct", "usage": None},
+    ])
+
+    assert summary["total"]["turns"] == 3
+    assert summary["total"]["requests"] == 4
+    assert summary["by_model"]["m1"]["prompt_tokens"] == 300
+    assert summary["by_model"]["m2"]["turns"] == 1
+    assert set(summary["by_channel"]) == {"telegram", "web"}
+    assert cache_hit_rate(summary["by_channel"]["web"]) == 0.75
+    assert cache_hit_rate(summary["by_model"]["m2"]) is None
+    assert web["usage"]["last_turn"]["total_tokens"] == 210
+
+
+def test_reported_zero_cache_hits_give_a_zero_rate() -> None:
+    session: dict = {}
+    usage = normalize_usage({"input_tokens": 900, "output_tokens": 10, "input_tokens_details": {"cached_tokens": 0}})
+    record_turn(session, {"m1": {**usage, "requests": 1}})
+    record_turn(session, {"m1": {**usage, "requests": 1}})
+
+    assert session["usage"]["total"]["cached_tokens"] == 0
+    assert cache_hit_rate(session["usage"]["total"]) == 0.0  # Caching is not working, rather than unknown
+
+
+@pytest.mark.asyncio
+async def test_agent_loop_records_usage_in_session_metadata(tmp_path) -> None:
+    result = await run_bench(BenchConfig(chats=2, turns=2, latency_ms=0), workspace=tmp_path)
+
+    sessions = SessionManager(tmp_path).list_sessions()
+    summary = summarize(sessions)
+
+    assert set(summary["by_session"]) == {"bench:bench-0", "bench:bench-1"}
+    assert summary["total"]["turns"] == result["turns"] == 4
+    assert summary["total"]["requests"] == result["llm_calls"] == 8
+    assert summary["by_model"]["bench/scripted"]["completion_tokens"] == 4 * 500 // 4
+    assert summary["by_channel"]["bench"]["prompt_tokens"] > 0
+
+
+class _UsageBackend(LLMProvider):
+    async def chat(self, messages, tools=None, model=None, max_tokens=4096, temperature=0.7,
+                   reasoning_effort=None) -> LLMResponse:
+        return LLMResponse(content="hi", usage={"prompt_tokens": 10, "completion_tokens": 2, "total_tokens": 12})
+
+    def get_default_model(self) -> str:
+        return "stub"
+
+
+@pytest.mark.asyncio
+async def test_usage_is_credited_to_the_model_that_served_the_call(tmp_path) -> None:
+    pool = PoolProvider([Backend(name="cheap", provider=_UsageBackend(), model="vendor/small-model")])
+    loop = AgentLoop(bus=MessageBus(), provider=pool, workspace=tmp_path, model="vendor/configured-model")
+
+    await loop.process_direct("hello", session_key="cli:usage")
+
+    usage = loop.sessions.get_or_create("cli:usage").metadata["usage"]
+    assert set(usage["models"]) == {"vendor/small-model"}
+    assert usage["total"]["prompt_tokens"] == 10 and usage["total"]["turns"] == 1